@@ -13,6 +13,9 @@ from app.models.user import User
 from app.models.appointment import Appointment
 from app.models.prescription import Prescription
 from app.models.doctor_profile import DoctorProfile
+from app.models.audit_event import AuditEvent
+from app.models.idempotency_key import IdempotencyKey
+from app.models.appointment_reminder import AppointmentReminder
 
 config = context.config
 config.set_main_option('sqlalchemy.url', settings.DATABASE_URL)
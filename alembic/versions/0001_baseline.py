@@ -0,0 +1,88 @@
+"""Baseline schema: users, doctor profiles, appointments, prescriptions
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19 00:00:00
+
+Databases created by ``Base.metadata.create_all`` before migrations existed
+already have these tables; they are left as they are, so ``alembic upgrade
+head`` works on those databases too.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if "users" not in existing:
+        op.create_table(
+            "users",
+            sa.Column("id", sa.Uuid(), primary_key=True),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+            sa.Column("updated_at", sa.DateTime(), nullable=True),
+            sa.Column("email", sa.String(), nullable=False),
+            sa.Column("password_hash", sa.String(), nullable=False),
+            sa.Column("role", sa.Enum("PATIENT", "DOCTOR", "ADMIN", name="userrole"), nullable=False),
+            sa.Column("first_name", sa.String(), nullable=True),
+            sa.Column("last_name", sa.String(), nullable=True),
+        )
+        op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    if "doctor_profiles" not in existing:
+        op.create_table(
+            "doctor_profiles",
+            sa.Column("id", sa.Uuid(), primary_key=True),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+            sa.Column("updated_at", sa.DateTime(), nullable=True),
+            sa.Column("user_id", sa.Uuid(), sa.ForeignKey("users.id"), nullable=False, unique=True),
+            sa.Column("specialization", sa.String(), nullable=False),
+            sa.Column("available_from", sa.Time(), nullable=True),
+            sa.Column("available_to", sa.Time(), nullable=True),
+            sa.Column("location", sa.String(), nullable=True),
+        )
+
+    if "appointments" not in existing:
+        op.create_table(
+            "appointments",
+            sa.Column("id", sa.Uuid(), primary_key=True),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+            sa.Column("updated_at", sa.DateTime(), nullable=True),
+            sa.Column("patient_id", sa.Uuid(), sa.ForeignKey("users.id"), nullable=False),
+            sa.Column("doctor_id", sa.Uuid(), sa.ForeignKey("users.id"), nullable=False),
+            sa.Column("appointment_time", sa.DateTime(), nullable=False),
+            sa.Column(
+                "status", sa.Enum("BOOKED", "COMPLETED", "CANCELLED", name="appointmentstatus"), nullable=True
+            ),
+            sa.Column("notes", sa.String(), nullable=True),
+        )
+
+    if "prescriptions" not in existing:
+        op.create_table(
+            "prescriptions",
+            sa.Column("id", sa.Uuid(), primary_key=True),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+            sa.Column("updated_at", sa.DateTime(), nullable=True),
+            sa.Column("appointment_id", sa.Uuid(), sa.ForeignKey("appointments.id"), nullable=False, unique=True),
+            sa.Column("doctor_id", sa.Uuid(), sa.ForeignKey("users.id"), nullable=False),
+            sa.Column("patient_id", sa.Uuid(), sa.ForeignKey("users.id"), nullable=False),
+            sa.Column("notes", sa.String(), nullable=True),
+            sa.Column("medicines", sa.JSON(), nullable=False),
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("prescriptions")
+    op.drop_table("appointments")
+    op.drop_table("doctor_profiles")
+    op.drop_index("ix_users_email", table_name="users")
+    op.drop_table("users")
+    sa.Enum(name="appointmentstatus").drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name="userrole").drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,42 @@
+"""Audit trail table written by the background audit sink
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # create_all in the app may have created it already
+    if sa.inspect(op.get_bind()).has_table("audit_events"):
+        return
+    op.create_table(
+        "audit_events",
+        sa.Column("id", sa.Uuid(), primary_key=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.Column("user_id", sa.Uuid(), nullable=True),
+        sa.Column("method", sa.String(10), nullable=False),
+        sa.Column("path", sa.String(), nullable=False),
+        sa.Column("status_code", sa.Integer(), nullable=True),
+        sa.Column("client_ip", sa.String(), nullable=True),
+        sa.Column("duration_ms", sa.Float(), nullable=True),
+        sa.Column("occurred_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_audit_events_user_id_occurred_at", "audit_events", ["user_id", "occurred_at"])
+    op.create_index("ix_audit_events_occurred_at", "audit_events", ["occurred_at"])
+    op.create_index("ix_audit_events_path_occurred_at", "audit_events", ["path", "occurred_at"])
+
+
+def downgrade() -> None:
+    op.drop_table("audit_events")
@@ -0,0 +1,34 @@
+"""Optimistic locking: a version counter on every BaseModel table
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 00:00:00
+
+Existing rows start at version 1 through the server default, so the column
+can be NOT NULL from the start.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+TABLES = ("users", "doctor_profiles", "appointments", "prescriptions")
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    for table in TABLES:
+        # Tables create_all made after the column was added to the models already have it
+        if "version" not in {column["name"] for column in inspector.get_columns(table)}:
+            op.add_column(table, sa.Column("version", sa.Integer(), nullable=False, server_default="1"))
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        with op.batch_alter_table(table) as batch:
+            batch.drop_column("version")
@@ -0,0 +1,45 @@
+"""Appointment reminders: the sent-reminder table and the scheduler's scan indexes
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+INDEXES = {
+    "ix_appointments_status_appointment_time": ["status", "appointment_time"],
+    "ix_appointments_updated_at": ["updated_at"],
+}
+
+
+def upgrade() -> None:
+    # create_all in the app may have created them already
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table("appointment_reminders"):
+        op.create_table(
+            "appointment_reminders",
+            sa.Column(
+                "appointment_id", sa.Uuid(), sa.ForeignKey("appointments.id", ondelete="CASCADE"), primary_key=True
+            ),
+            sa.Column("appointment_time", sa.DateTime(), primary_key=True),
+            sa.Column("sent_at", sa.DateTime(), nullable=False),
+        )
+    existing = {index["name"] for index in inspector.get_indexes("appointments")}
+    for name, columns in INDEXES.items():
+        if name not in existing:
+            op.create_index(name, "appointments", columns)
+
+
+def downgrade() -> None:
+    for name in INDEXES:
+        op.drop_index(name, table_name="appointments")
+    op.drop_table("appointment_reminders")
@@ -0,0 +1,29 @@
+"""Doctor schedule: index appointments by doctor and time
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+INDEX = "ix_appointments_doctor_id_appointment_time"
+
+
+def upgrade() -> None:
+    # create_all in the app may have created it already
+    existing = {index["name"] for index in sa.inspect(op.get_bind()).get_indexes("appointments")}
+    if INDEX not in existing:
+        op.create_index(INDEX, "appointments", ["doctor_id", "appointment_time"])
+
+
+def downgrade() -> None:
+    op.drop_index(INDEX, table_name="appointments")
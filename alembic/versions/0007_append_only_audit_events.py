@@ -0,0 +1,36 @@
+"""Append-only audit events: drop the update bookkeeping columns
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19 00:00:00
+
+Audit rows are never updated. 0002 created an updated_at column, and
+databases that create_all built while AuditEvent still derived from
+BaseModel, or that ran 0004 when it still listed audit_events, also have a
+version column.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+COLUMNS = ("updated_at", "version")
+
+
+def upgrade() -> None:
+    existing = {column["name"] for column in sa.inspect(op.get_bind()).get_columns("audit_events")}
+    leftover = [name for name in COLUMNS if name in existing]
+    if leftover:
+        with op.batch_alter_table("audit_events") as batch:
+            for name in leftover:
+                batch.drop_column(name)
+
+
+def downgrade() -> None:
+    # Only updated_at: 0004 no longer adds version to audit_events
+    op.add_column("audit_events", sa.Column("updated_at", sa.DateTime(), nullable=True))
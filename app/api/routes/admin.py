@@ -1,8 +1,21 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import PlainTextResponse
 from sqlalchemy.orm import Session
+from typing import List, Optional
+from uuid import UUID
+from datetime import datetime
+from app.core.audit import audit_sink
+from app.core.cache import entity_cache
 from app.core.database import get_db
 from app.core.dependencies import get_current_admin
+from app.core.profiling import profile_store
+from app.core.reminders import reminder_scheduler
+from app.exceptions.custom_exceptions import NotFoundException
 from app.models.user import User
+from app.schemas.audit_schema import AuditEventResponse, AuditSinkStats
+from app.schemas.cache_schema import CacheStats
+from app.schemas.profile_schema import ProfileSummary, ProfileDetail
+from app.schemas.reminder_schema import ReminderSchedulerStats
 from app.services.admin_service import AdminService
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
@@ -17,3 +30,59 @@ def get_analytics(
     service = AdminService(db)
     analytics = service.get_analytics()
     return analytics
+
+
+@router.get("/audit-events", response_model=List[AuditEventResponse])
+def get_audit_events(
+    user_id: Optional[UUID] = None,
+    path: Optional[str] = Query(None, description="Path prefix, e.g. /appointments"),
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+    current_user: User = Depends(get_current_admin),
+    db: Session = Depends(get_db)
+):
+    """Query the audit trail, newest first (Admin only)"""
+    service = AdminService(db)
+    events = service.get_audit_events(user_id, path, since, until, limit, offset)
+    return events
+
+
+@router.get("/audit-events/stats", response_model=AuditSinkStats)
+def get_audit_stats(current_user: User = Depends(get_current_admin)):
+    """Audit pipeline queue depth and drop counters (Admin only)"""
+    return audit_sink.stats()
+
+
+@router.get("/cache/stats", response_model=CacheStats)
+def get_cache_stats(current_user: User = Depends(get_current_admin)):
+    """Entity cache hit rate, size and invalidations for this worker (Admin only)"""
+    return entity_cache.stats()
+
+
+@router.get("/reminders/stats", response_model=ReminderSchedulerStats)
+def get_reminder_stats(current_user: User = Depends(get_current_admin)):
+    """Reminder scheduler queue and delivery counters for this worker (Admin only)"""
+    return reminder_scheduler.stats()
+
+
+@router.get("/profiles", response_model=List[ProfileSummary])
+def get_profiles(current_user: User = Depends(get_current_admin)):
+    """List captured request profiles, newest first (Admin only)"""
+    return profile_store.list()
+
+
+@router.get("/profiles/{profile_id}", response_model=ProfileDetail)
+def get_profile(
+    profile_id: str,
+    format: str = Query("json", pattern="^(json|folded)$", description="folded: flamegraph input"),
+    current_user: User = Depends(get_current_admin)
+):
+    """Get one captured profile (Admin only)"""
+    profile = profile_store.get(profile_id)
+    if profile is None:
+        raise NotFoundException("Profile not found")
+    if format == "folded":
+        return PlainTextResponse("\n".join(profile["folded"]) + "\n")
+    return profile
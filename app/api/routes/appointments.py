@@ -1,66 +1,88 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Header, Query, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 from app.core.database import get_db
 from app.core.dependencies import get_current_user, get_current_patient
 from app.models.user import User
 from app.schemas.appointment_schema import AppointmentCreate, AppointmentUpdate, AppointmentResponse
 from app.services.appointment_service import AppointmentService
+from app.services.idempotency_service import IdempotencyService
+from app.utils.constants import APPOINTMENT_EXPANSIONS
+from app.utils.validators import parse_expand, parse_if_match
 
 router = APIRouter(prefix="/appointments", tags=["Appointments"])
 
 
-@router.post("/", response_model=AppointmentResponse, status_code=status.HTTP_201_CREATED)
+@router.post("/", response_model=AppointmentResponse, response_model_exclude_unset=True, status_code=status.HTTP_201_CREATED)
 def create_appointment(
     appointment_data: AppointmentCreate,
+    idempotency_key: Optional[str] = Header(None, max_length=255),
     current_user: User = Depends(get_current_patient),
     db: Session = Depends(get_db)
 ):
-    """Book a new appointment (Patient only)"""
+    """Book a new appointment (Patient only).
+
+    Retries sent with the same ``Idempotency-Key`` get the first response back.
+    """
     service = AppointmentService(db)
-    appointment = service.create_appointment(current_user.id, appointment_data)
+    appointment = IdempotencyService(db).run(
+        idempotency_key, current_user.id, "POST /appointments/", appointment_data,
+        AppointmentResponse, status.HTTP_201_CREATED,
+        lambda: service.create_appointment(current_user.id, appointment_data)
+    )
     return appointment
 
 
-@router.get("/", response_model=List[AppointmentResponse])
+@router.get("/", response_model=List[AppointmentResponse], response_model_exclude_unset=True)
 def get_appointments(
+    expand: Optional[str] = Query(None, description="Comma separated relationships to embed: patient, doctor"),
     current_user: User = Depends(get_current_patient),
     db: Session = Depends(get_db)
 ):
     """Get all appointments for the current patient"""
     service = AppointmentService(db)
-    appointments = service.get_patient_appointments(current_user.id)
+    appointments = service.get_patient_appointments(
+        current_user.id, parse_expand(expand, APPOINTMENT_EXPANSIONS)
+    )
     return appointments
 
 
 
-@router.get("/{appointment_id}", response_model=AppointmentResponse)
+@router.get("/{appointment_id}", response_model=AppointmentResponse, response_model_exclude_unset=True)
 def get_appointment(
     appointment_id: UUID,
+    response: Response,
+    expand: Optional[str] = Query(None, description="Comma separated relationships to embed: patient, doctor"),
     current_user: User = Depends(get_current_patient),
     db: Session = Depends(get_db)
 ):
     """Get a specific appointment by ID"""
     service = AppointmentService(db)
-    appointment = service.get_appointment(appointment_id)
+    appointment = service.get_appointment(appointment_id, parse_expand(expand, APPOINTMENT_EXPANSIONS))
+    response.headers["ETag"] = f'"{appointment.version}"'
     return appointment
 
 
-@router.put("/{appointment_id}", response_model=AppointmentResponse)
+@router.put("/{appointment_id}", response_model=AppointmentResponse, response_model_exclude_unset=True)
 def update_appointment(
     appointment_id: UUID,
     update_data: AppointmentUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
     current_user: User = Depends(get_current_patient),
     db: Session = Depends(get_db)
 ):
-    """Update an appointment (reschedule)"""
+    """Update an appointment (reschedule); guarded by ``If-Match`` (see ``parse_if_match``)"""
     service = AppointmentService(db)
-    appointment = service.update_appointment(appointment_id, current_user.id, update_data)
+    appointment = service.update_appointment(
+        appointment_id, current_user.id, update_data, parse_if_match(if_match, update_data.version)
+    )
+    response.headers["ETag"] = f'"{appointment.version}"'
     return appointment
 
 
-@router.delete("/{appointment_id}", response_model=AppointmentResponse)
+@router.delete("/{appointment_id}", response_model=AppointmentResponse, response_model_exclude_unset=True)
 def cancel_appointment(
     appointment_id: UUID,
     current_user: User = Depends(get_current_patient),
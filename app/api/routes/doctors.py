@@ -1,11 +1,17 @@
-from fastapi import APIRouter, Depends, status
+import hashlib
+from datetime import date, datetime, timedelta
+from fastapi import APIRouter, Depends, Header, Query, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from app.core.database import get_db
 from app.core.dependencies import get_current_doctor
 from app.models.user import User
+from app.schemas.appointment_schema import DoctorSchedule
 from app.schemas.doctor_schema import DoctorProfileCreate, DoctorProfileUpdate, DoctorProfileResponse
+from app.services.appointment_service import AppointmentService
 from app.services.doctor_service import DoctorService
+from app.utils.constants import AppointmentStatus
+from app.utils.validators import parse_if_match
 
 router = APIRouter(prefix="/doctors", tags=["Doctors"])
 
@@ -24,27 +30,58 @@ def create_doctor_profile(
 
 @router.get("/profile", response_model=DoctorProfileResponse)
 def get_doctor_profile(
+    response: Response,
     current_user: User = Depends(get_current_doctor),
     db: Session = Depends(get_db)
 ):
     """Get current doctor's profile"""
     service = DoctorService(db)
     profile = service.get_profile(current_user.id)
+    response.headers["ETag"] = f'"{profile.version}"'
     return profile
 
 
 @router.put("/profile", response_model=DoctorProfileResponse)
 def update_doctor_profile(
     update_data: DoctorProfileUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
     current_user: User = Depends(get_current_doctor),
     db: Session = Depends(get_db)
 ):
-    """Update doctor profile"""
+    """Update doctor profile; guarded by ``If-Match`` (see ``parse_if_match``)"""
     service = DoctorService(db)
-    profile = service.update_profile(current_user.id, update_data)
+    profile = service.update_profile(current_user.id, update_data, parse_if_match(if_match, update_data.version))
+    response.headers["ETag"] = f'"{profile.version}"'
     return profile
 
 
+@router.get("/me/schedule", response_model=DoctorSchedule)
+def get_my_schedule(
+    start: Optional[date] = Query(None, alias="from"),
+    end: Optional[date] = Query(None, alias="to"),
+    appointment_status: Optional[AppointmentStatus] = Query(None, alias="status"),
+    if_none_match: Optional[str] = Header(None),
+    current_user: User = Depends(get_current_doctor),
+    db: Session = Depends(get_db)
+):
+    """Current doctor's appointments from ``from`` to ``to`` (inclusive), bucketed by day.
+
+    Defaults to the seven days starting today (UTC). The response carries an ETag;
+    a calendar polling with ``If-None-Match`` gets a bodyless 304 until
+    something in the range changes.
+    """
+    start = start or datetime.utcnow().date()
+    end = end or start + timedelta(days=6)
+    service = AppointmentService(db)
+    schedule = service.get_doctor_schedule(current_user.id, start, end, appointment_status)
+    body = DoctorSchedule.model_validate(schedule).model_dump_json()
+    etag = f'W/"{hashlib.blake2b(body.encode(), digest_size=16).hexdigest()}"'
+    if if_none_match == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+
 @router.get("/", response_model=List[DoctorProfileResponse])
 def get_all_doctors(db: Session = Depends(get_db)):
     """Get all doctors (public endpoint for patients to search)"""
@@ -1,40 +1,53 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Header, Query, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 from app.core.database import get_db
 from app.core.dependencies import get_current_user, get_current_doctor, get_current_patient
 from app.models.user import User
 from app.schemas.prescription_schema import PrescriptionCreate, PrescriptionUpdate, PrescriptionResponse
 from app.services.prescription_service import PrescriptionService
+from app.services.idempotency_service import IdempotencyService
+from app.utils.constants import PRESCRIPTION_EXPANSIONS
+from app.utils.validators import parse_expand, parse_if_match
 
 router = APIRouter(prefix="/prescriptions", tags=["Prescriptions"])
 
 
-@router.post("/", response_model=PrescriptionResponse, status_code=status.HTTP_201_CREATED)
+@router.post("/", response_model=PrescriptionResponse, response_model_exclude_unset=True, status_code=status.HTTP_201_CREATED)
 def create_prescription(
     prescription_data: PrescriptionCreate,
+    idempotency_key: Optional[str] = Header(None, max_length=255),
     current_user: User = Depends(get_current_doctor),
     db: Session = Depends(get_db)
 ):
-    """Create a new prescription (Doctor only)"""
+    """Create a new prescription (Doctor only).
+
+    Retries sent with the same ``Idempotency-Key`` get the first response back.
+    """
     service = PrescriptionService(db)
-    prescription = service.create_prescription(current_user.id, prescription_data)
+    prescription = IdempotencyService(db).run(
+        idempotency_key, current_user.id, "POST /prescriptions/", prescription_data,
+        PrescriptionResponse, status.HTTP_201_CREATED,
+        lambda: service.create_prescription(current_user.id, prescription_data)
+    )
     return prescription
 
 
-@router.get("/", response_model=List[PrescriptionResponse])
+@router.get("/", response_model=List[PrescriptionResponse], response_model_exclude_unset=True)
 def get_prescriptions(
+    expand: Optional[str] = Query(None, description="Comma separated relationships to embed: appointment, patient, doctor"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get prescriptions (patients see their own, doctors see their issued prescriptions)"""
     service = PrescriptionService(db)
+    expand_fields = parse_expand(expand, PRESCRIPTION_EXPANSIONS)
     
     if current_user.role.value == "patient":
-        prescriptions = service.get_patient_prescriptions(current_user.id)
+        prescriptions = service.get_patient_prescriptions(current_user.id, expand_fields)
     elif current_user.role.value == "doctor":
-        prescriptions = service.get_doctor_prescriptions(current_user.id)
+        prescriptions = service.get_doctor_prescriptions(current_user.id, expand_fields)
     else:
         prescriptions = []
     
@@ -42,15 +55,17 @@ def get_prescriptions(
 
 
 
-@router.get("/{prescription_id}", response_model=PrescriptionResponse)
+@router.get("/{prescription_id}", response_model=PrescriptionResponse, response_model_exclude_unset=True)
 def get_prescription(
     prescription_id: UUID,
+    response: Response,
+    expand: Optional[str] = Query(None, description="Comma separated relationships to embed: appointment, patient, doctor"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get a specific prescription by ID"""
     service = PrescriptionService(db)
-    prescription = service.get_prescription(prescription_id)
+    prescription = service.get_prescription(prescription_id, parse_expand(expand, PRESCRIPTION_EXPANSIONS))
     
     # Verify user has access to this prescription
     if current_user.role.value == "patient" and prescription.patient_id != current_user.id:
@@ -60,17 +75,23 @@ def get_prescription(
         from fastapi import HTTPException
         raise HTTPException(status_code=403, detail="Not authorized")
     
+    response.headers["ETag"] = f'"{prescription.version}"'
     return prescription
 
 
-@router.put("/{prescription_id}", response_model=PrescriptionResponse)
+@router.put("/{prescription_id}", response_model=PrescriptionResponse, response_model_exclude_unset=True)
 def update_prescription(
     prescription_id: UUID,
     update_data: PrescriptionUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
     current_user: User = Depends(get_current_doctor),
     db: Session = Depends(get_db)
 ):
-    """Update a prescription (Doctor only)"""
+    """Update a prescription (Doctor only); guarded by ``If-Match`` (see ``parse_if_match``)"""
     service = PrescriptionService(db)
-    prescription = service.update_prescription(prescription_id, current_user.id, update_data)
+    prescription = service.update_prescription(
+        prescription_id, current_user.id, update_data, parse_if_match(if_match, update_data.version)
+    )
+    response.headers["ETag"] = f'"{prescription.version}"'
     return prescription
@@ -0,0 +1,133 @@
+import queue
+import logging
+import threading
+from typing import List, Optional
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.repositories.audit_repository import AuditRepository
+
+logger = logging.getLogger("audit")
+
+_STOP = object()
+
+
+class AuditSink:
+    """Bounded in-memory queue drained by a background thread that batch-inserts audit events.
+
+    ``record`` never blocks the request path: when the queue is full the event is
+    dropped and counted instead (backpressure is surfaced through ``stats``).
+    """
+
+    def __init__(
+        self,
+        max_queue_size: int = settings.AUDIT_QUEUE_SIZE,
+        batch_size: int = settings.AUDIT_BATCH_SIZE,
+        flush_interval: float = settings.AUDIT_FLUSH_INTERVAL_SECONDS,
+        session_factory=SessionLocal,
+    ):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.session_factory = session_factory
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue_size)
+        self._thread: Optional[threading.Thread] = None
+        # Each counter has a single writer (event loop or writer thread), so no lock is needed
+        self.enqueued = 0
+        self.dropped = 0
+        self.written = 0
+        self.failed = 0
+        self.batches = 0
+
+    def record(self, event: dict) -> bool:
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+            if self.dropped == 1 or self.dropped % 1000 == 0:
+                logger.warning("Audit queue full, %d events dropped so far", self.dropped)
+            return False
+        self.enqueued += 1
+        return True
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def flush(self) -> None:
+        """Block until every queued event has been written"""
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.join()
+            return
+        while True:
+            batch = self._take_batch(block=False)
+            if not batch:
+                return
+            self._write(batch)
+
+    def stats(self) -> dict:
+        return {
+            "queued": self._queue.qsize(),
+            "capacity": self._queue.maxsize,
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "batches": self.batches,
+        }
+
+    def _take_batch(self, block: bool) -> List:
+        batch = []
+        try:
+            batch.append(self._queue.get(block=block, timeout=self.flush_interval if block else None))
+        except queue.Empty:
+            return batch
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._take_batch(block=True)
+            stopping = any(item is _STOP for item in batch)
+            if stopping:
+                batch = [item for item in batch if item is not _STOP]
+                self._queue.task_done()
+                # Drain whatever is still queued before exiting
+                while True:
+                    rest = self._take_batch(block=False)
+                    if not rest:
+                        break
+                    batch.extend(rest)
+            if batch:
+                self._write(batch)
+            if stopping:
+                return
+
+    def _write(self, batch: List[dict]) -> None:
+        db = self.session_factory()
+        try:
+            AuditRepository(db).bulk_create(batch)
+            self.written += len(batch)
+            self.batches += 1
+        except Exception:
+            db.rollback()
+            self.failed += len(batch)
+            logger.exception("Failed to persist %d audit events", len(batch))
+        finally:
+            db.close()
+            for _ in batch:
+                self._queue.task_done()
+
+
+audit_sink = AuditSink()
@@ -0,0 +1,280 @@
+import enum
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import date, datetime, time as time_of_day
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple, Type
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+from app.core.config import settings
+
+logger = logging.getLogger("app.cache")
+
+
+class LRUCacheBackend:
+    """In-process LRU with a per-entry TTL; each worker process has its own copy"""
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        # Sync endpoints run in the threadpool, so entries are touched from several threads
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, value: bytes) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, keys: Iterable[str]) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def size(self) -> int:
+        return len(self._entries)
+
+
+class RedisCacheBackend:
+    """Cache shared by every worker and instance, so an invalidation is seen by all of them.
+
+    Needs the optional ``redis`` package.
+    """
+
+    def __init__(self, url: str, ttl: float, prefix: str = "healthcare:"):
+        try:
+            import redis
+        except ImportError as exc:
+            raise RuntimeError("CACHE_BACKEND=redis requires the 'redis' package") from exc
+        self.client = redis.Redis.from_url(url, socket_timeout=0.5)
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.get(self.prefix + key)
+
+    def set(self, key: str, value: bytes) -> None:
+        self.client.set(self.prefix + key, value, px=int(self.ttl * 1000))
+
+    def delete(self, keys: Iterable[str]) -> None:
+        keys = [self.prefix + key for key in keys]
+        if keys:
+            self.client.delete(*keys)
+
+    def clear(self) -> None:
+        for key in self.client.scan_iter(self.prefix + "*"):
+            self.client.delete(key)
+
+    def size(self) -> int:
+        return sum(1 for _ in self.client.scan_iter(self.prefix + "*"))
+
+
+def _to_json(value):
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, (datetime, date, time_of_day)):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    raise TypeError(f"{type(value).__name__} is not cacheable")
+
+
+def _column_converters(model: Type) -> Dict[str, Callable[[Any], Any]]:
+    """Per column attribute, how to turn its JSON value back into the Python value"""
+    converters = {}
+    for attr in inspect(model).column_attrs:
+        try:
+            python_type = attr.columns[0].type.python_type
+        except NotImplementedError:
+            python_type = None
+        if python_type is uuid.UUID:
+            converters[attr.key] = uuid.UUID
+        elif python_type in (datetime, date, time_of_day):
+            converters[attr.key] = python_type.fromisoformat
+        elif isinstance(python_type, type) and issubclass(python_type, enum.Enum):
+            converters[attr.key] = python_type
+        else:
+            converters[attr.key] = lambda value: value
+    return converters
+
+
+class EntityCache:
+    """Read-through cache for single-row lookups by a unique column.
+
+    Values are JSON snapshots of the row's column attributes, never live ORM
+    objects or pickles, so reading from a shared backend never runs code. A hit is rebuilt and merged into the caller's session without a
+    query, so it behaves like a freshly loaded instance: relationships lazy
+    load and changes are flushed on commit. Any flush that changes or deletes
+    a cached model queues its keys; they are invalidated when the transaction
+    commits. Columns registered as excluded (credentials) are left out of the
+    snapshot and load from the database if they are read.
+    """
+
+    def __init__(self, backend=None):
+        self.backend = backend
+        self.lookups: Dict[Type, Tuple[str, ...]] = {}
+        self.excluded: Dict[Type, Tuple[str, ...]] = {}
+        self._converters: Dict[Type, Dict[str, Callable[[Any], Any]]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.errors = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    def register(self, model: Type, *attributes: str, exclude: Tuple[str, ...] = ()) -> None:
+        """Declare the unique attributes ``model`` is looked up by, and columns never to cache"""
+        self.lookups[model] = tuple(dict.fromkeys(self.lookups.get(model, ()) + attributes))
+        self.excluded[model] = tuple(dict.fromkeys(self.excluded.get(model, ()) + tuple(exclude)))
+
+    @staticmethod
+    def key(model: Type, attribute: str, value) -> str:
+        return f"{model.__tablename__}:{attribute}:{value}"
+
+    def get_or_load(self, db: Session, model: Type, attribute: str, value, loader: Callable):
+        # Inside a transaction that has written, only the database has the current state
+        if not self.enabled or db.info.get("entity_cache_pending"):
+            return loader()
+
+        key = self.key(model, attribute, value)
+        data = self._backend_call(self.backend.get, key)
+        if data is not None:
+            self.hits += 1
+            return self._attach(db, model, self._decode(model, data))
+
+        self.misses += 1
+        instance = loader()
+        if instance is not None:
+            self._backend_call(self.backend.set, key, self._encode(instance))
+        return instance
+
+    def clear(self) -> None:
+        if self.enabled:
+            self.backend.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__ if self.enabled else "disabled",
+            "entries": self.backend.size() if self.enabled else 0,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "errors": self.errors,
+        }
+
+    def _backend_call(self, method, *args):
+        # A cache outage degrades to uncached reads instead of failing requests
+        try:
+            return method(*args)
+        except Exception:
+            self.errors += 1
+            logger.warning("Cache backend call failed", exc_info=True)
+            return None
+
+    def _encode(self, instance) -> bytes:
+        state = inspect(instance)
+        excluded = self.excluded.get(type(instance), ())
+        snapshot = {
+            attr.key: getattr(instance, attr.key)
+            for attr in state.mapper.column_attrs
+            if attr.key not in excluded
+        }
+        return json.dumps(snapshot, default=_to_json).encode()
+
+    def _decode(self, model: Type, data: bytes) -> dict:
+        converters = self._converters.get(model)
+        if converters is None:
+            converters = self._converters[model] = _column_converters(model)
+        return {
+            key: value if value is None else converters[key](value)
+            for key, value in json.loads(data).items()
+        }
+
+    @staticmethod
+    def _attach(db: Session, model: Type, snapshot: dict):
+        instance = model(**snapshot)
+        make_transient_to_detached(instance)
+        # load=False: trust the snapshot instead of re-selecting the row
+        return db.merge(instance, load=False)
+
+    def _keys_for(self, instance) -> list:
+        state = inspect(instance)
+        keys = []
+        for attribute in self.lookups.get(type(instance), ()):
+            history = state.attrs[attribute].history
+            # Include the previous value too, when the lookup column itself changed
+            for value in {*history.unchanged, *history.added, *history.deleted}:
+                if value is not None:
+                    keys.append(self.key(type(instance), attribute, value))
+        return keys
+
+    def install(self, session_class=Session) -> None:
+        """Invalidate cached rows written through any session once its transaction commits"""
+        if event.contains(session_class, "after_flush", self._after_flush):
+            return
+        event.listen(session_class, "after_flush", self._after_flush)
+        event.listen(session_class, "after_commit", self._after_commit)
+        event.listen(session_class, "after_rollback", self._after_rollback)
+
+    def _after_flush(self, session: Session, flush_context) -> None:
+        if not self.enabled:
+            return
+        pending = session.info.setdefault("entity_cache_pending", set())
+        for instance in (*session.dirty, *session.deleted):
+            if type(instance) in self.lookups:
+                pending.update(self._keys_for(instance))
+        if not pending:
+            # Still mark the transaction as written so reads bypass the cache until commit
+            pending.add(None)
+
+    def _after_commit(self, session: Session) -> None:
+        pending = session.info.pop("entity_cache_pending", None)
+        if pending:
+            keys = [key for key in pending if key is not None]
+            self.invalidations += len(keys)
+            self._backend_call(self.backend.delete, keys)
+
+    def _after_rollback(self, session: Session) -> None:
+        session.info.pop("entity_cache_pending", None)
+
+
+def create_cache_backend():
+    if settings.CACHE_BACKEND == "memory":
+        if settings.WEB_CONCURRENCY > 1:
+            # Invalidations would only reach the worker that made the change; the
+            # others would serve stale users (roles, deactivation) until the TTL
+            logger.warning("CACHE_BACKEND=memory is per process; entity cache disabled with %d workers, "
+                           "use CACHE_BACKEND=redis", settings.WEB_CONCURRENCY)
+            return None
+        return LRUCacheBackend(settings.CACHE_MAX_ENTRIES, settings.CACHE_TTL_SECONDS)
+    if settings.CACHE_BACKEND == "redis":
+        return RedisCacheBackend(settings.CACHE_URL, settings.CACHE_TTL_SECONDS)
+    return None
+
+
+entity_cache = EntityCache(create_cache_backend())
+entity_cache.install()
@@ -0,0 +1,131 @@
+import zlib
+from typing import Dict, Optional, Tuple
+from app.core.config import settings
+
+try:
+    import brotli
+except ImportError:  # optional: without it only gzip is offered
+    brotli = None
+
+# Types worth compressing; images, archives and already-encoded media are left alone
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "application/x-ndjson",
+    "image/svg+xml",
+    "text/",
+)
+
+
+class GzipEncoder:
+    encoding = "gzip"
+
+    def __init__(self, level: int):
+        # wbits=31: zlib stream with a gzip header and trailer
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        """Emit everything compressed so far without ending the stream"""
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class BrotliEncoder:
+    encoding = "br"
+
+    def __init__(self, level: int):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    """Parse ``"gzip;q=0.8, br"`` into ``{"gzip": 0.8, "br": 1.0}``"""
+    accepted = {}
+    for item in header.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding] = quality
+    return accepted
+
+
+def parse_route_levels(value: str) -> Dict[str, int]:
+    """Parse ``"GET /prescriptions/=9,GET /users/=1"`` into a mapping"""
+    levels = {}
+    for item in value.split(","):
+        if not item.strip():
+            continue
+        endpoint, _, level = item.rpartition("=")
+        levels[endpoint.strip()] = int(level)
+    return levels
+
+
+class CompressionPolicy:
+    """Which responses get compressed, with what encoding and at what level"""
+
+    def __init__(
+        self,
+        minimum_size: int = settings.COMPRESSION_MINIMUM_SIZE,
+        gzip_level: int = settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality: int = settings.COMPRESSION_BROTLI_QUALITY,
+        route_levels: str = settings.COMPRESSION_ROUTE_LEVELS,
+    ):
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.levels: Dict[str, int] = parse_route_levels(route_levels)
+
+    def set_level(self, endpoint: str, level: int) -> None:
+        """Level (1-9) for an endpoint given as ``"METHOD /route/template"``; 0 disables compression.
+
+        The level is used for both gzip and brotli on that route.
+        """
+        self.levels[endpoint] = level
+
+    def choose(self, accept_encoding: str, endpoint: str) -> Optional[Tuple[type, int]]:
+        """Encoder class and level for a response, or None to send it as is"""
+        level = self.levels.get(endpoint)
+        if level == 0:
+            return None
+
+        accepted = parse_accept_encoding(accept_encoding)
+        wildcard = accepted.get("*", 0.0)
+        candidates = []
+        # Listed in server preference order: brotli wins a tie
+        if brotli is not None:
+            candidates.append((accepted.get("br", wildcard), BrotliEncoder, self.brotli_quality))
+        candidates.append((accepted.get("gzip", wildcard), GzipEncoder, self.gzip_level))
+
+        quality, encoder, default_level = max(candidates, key=lambda candidate: candidate[0])
+        if quality <= 0:
+            return None
+        return encoder, level if level is not None else default_level
+
+    @staticmethod
+    def compressible(content_type: str) -> bool:
+        return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+compression_policy = CompressionPolicy()
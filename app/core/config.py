@@ -7,13 +7,89 @@ class Settings(BaseSettings):
     SECRET_KEY: str = "your-secret-key-change-in-production"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # bcrypt work factor for new password hashes (the test suite lowers it)
+    BCRYPT_ROUNDS: int = 12
     
     # Security settings
     CORS_ORIGINS: str = "*"
     RATE_LIMIT_PER_MINUTE: int = 60
     
+    # Serving: worker processes and database connection pool (per worker)
+    WEB_CONCURRENCY: int = 1  # set by gunicorn.conf.py to the number of workers
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # Connections the database allows this API in total, 0 for no limit; split across workers
+    DB_CONNECTION_BUDGET: int = 0
+    
     # Logging
     LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "json"  # "json" or "text"
+    LOG_QUEUE_SIZE: int = 10000
+    # Per-logger sampling of INFO/DEBUG records, e.g. "app.middleware.logging_middleware=0.1"
+    LOG_SAMPLE_RATES: str = ""
+    
+    # Metrics; each gunicorn worker keeps its own registry, so /metrics reports
+    # the worker that answered the scrape
+    METRICS_ENABLED: bool = True
+    
+    # Query monitoring
+    SLOW_QUERY_THRESHOLD_MS: float = 200.0
+    N_PLUS_ONE_THRESHOLD: int = 10  # same statement more than N times in one request
+    QUERY_BUDGET_DEFAULT: int = 0  # max queries per request, 0 disables
+    QUERY_BUDGET_STRICT: bool = False  # raise on budget overruns (test mode)
+    
+    # Distributed tracing (Zipkin v2 JSON); disabled unless an export target is set
+    TRACING_ENABLED: bool = True
+    TRACE_SERVICE_NAME: str = "healthcare-api"
+    TRACE_EXPORT_PATH: str = ""
+    TRACE_COLLECTOR_URL: str = ""
+    TRACE_SAMPLE_RATE: float = 1.0
+    
+    # On-demand profiling; profiles are kept by the worker that captured them
+    PROFILING_ENABLED: bool = False
+    PROFILE_SAMPLE_EVERY_N: int = 0  # also profile every Nth request, 0 disables
+    PROFILE_INTERVAL_MS: float = 5.0
+    PROFILE_BUFFER_SIZE: int = 50
+    PROFILE_MAX_STACKS: int = 200
+    
+    # Audit trail
+    AUDIT_ENABLED: bool = True
+    AUDIT_QUEUE_SIZE: int = 10000
+    AUDIT_BATCH_SIZE: int = 500
+    AUDIT_FLUSH_INTERVAL_SECONDS: float = 1.0
+    
+    # Entity cache for get-by-id lookups
+    CACHE_BACKEND: str = "memory"  # "memory" (single worker only), "redis" (shared) or "none"
+    CACHE_URL: str = "redis://localhost:6379/0"
+    CACHE_TTL_SECONDS: float = 30.0
+    CACHE_MAX_ENTRIES: int = 10000
+    
+    # Response compression (gzip, plus brotli when the brotli package is installed)
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MINIMUM_SIZE: int = 1024  # bytes; smaller responses are sent as is
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    # Per-route levels, e.g. "GET /prescriptions/=9,GET /users/=1"; 0 disables a route
+    COMPRESSION_ROUTE_LEVELS: str = ""
+    
+    # Idempotency-Key support on POST /appointments/ and POST /prescriptions/
+    IDEMPOTENCY_TTL_SECONDS: int = 86400  # how long a stored response is replayed
+    IDEMPOTENCY_WAIT_SECONDS: float = 10.0  # how long a duplicate waits for the first request
+    IDEMPOTENCY_PURGE_INTERVAL_SECONDS: float = 600.0  # how often expired keys are deleted
+    IDEMPOTENCY_PURGE_BATCH_SIZE: int = 1000
+    
+    # Appointment reminders, sent REMINDER_LEAD_HOURS before each BOOKED appointment
+    REMINDERS_ENABLED: bool = False  # run the scheduler in every API worker
+    REMINDER_LEAD_HOURS: float = 24.0
+    REMINDER_SCAN_INTERVAL_SECONDS: float = 30.0
+    REMINDER_HORIZON_SECONDS: float = 300.0  # how far ahead reminders are held in memory
+    REMINDER_CATCHUP_SECONDS: float = 3600.0  # overdue reminders still sent after a restart
+    REMINDER_BATCH_SIZE: int = 500
+    REMINDER_SINK: str = "log"  # "log" or "webhook"
+    REMINDER_WEBHOOK_URL: str = ""
     
     class Config:
         env_file = ".env"
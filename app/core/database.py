@@ -1,9 +1,38 @@
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 from app.core.config import settings
+from app.core.query_monitor import query_monitor
 
-engine = create_engine(settings.DATABASE_URL)
+
+
+def pool_options() -> dict:
+    """Pool arguments for this process, sized from the server-wide connection budget"""
+    if settings.DATABASE_URL.startswith("sqlite"):
+        if settings.DATABASE_URL in ("sqlite://", "sqlite:///:memory:"):
+            # An in-memory database lives and dies with its connection: share one
+            # connection between every session and thread (the test suite's mode)
+            return {"poolclass": StaticPool, "connect_args": {"check_same_thread": False}}
+        return {}
+    pool_size, max_overflow = settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW
+    if settings.DB_CONNECTION_BUDGET:
+        # Each worker process has its own pool, so every worker gets an equal share
+        per_worker = max(settings.DB_CONNECTION_BUDGET // max(settings.WEB_CONCURRENCY, 1), 1)
+        pool_size = min(pool_size, per_worker)
+        max_overflow = per_worker - pool_size
+    return {
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+engine = create_engine(settings.DATABASE_URL, **pool_options())
+# Slow query log, N+1 detection and query budgets
+query_monitor.install(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
@@ -1,4 +1,4 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 from typing import Optional
@@ -6,12 +6,14 @@ from uuid import UUID
 from app.core.database import get_db
 from app.core.security import decode_access_token
 from app.models.user import User
+from app.repositories.user_repository import UserRepository
 from app.utils.constants import UserRole
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 
 def get_current_user(
+    request: Request,
     token: str = Depends(oauth2_scheme),
     db: Session = Depends(get_db)
 ) -> User:
@@ -29,10 +31,12 @@ def get_current_user(
     if user_id is None:
         raise credentials_exception
     
-    user = db.query(User).filter(User.id == UUID(user_id)).first()
+    user = UserRepository(db).get_by_id(UUID(user_id))
     if user is None:
         raise credentials_exception
     
+    # Picked up by AuditMiddleware once the response is sent
+    request.state.user_id = user_id
     return user
 
 
@@ -0,0 +1,71 @@
+import logging
+import threading
+from datetime import datetime
+from typing import Optional
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.repositories.idempotency_repository import IdempotencyRepository
+
+logger = logging.getLogger("idempotency")
+
+
+class IdempotencyPurger:
+    """Deletes expired Idempotency-Key rows every ``interval`` seconds.
+
+    Rows go in batches of ``batch_size``, each its own short transaction, so a
+    large backlog never holds locks on the table for long. Every worker may run
+    one; the deletes do not conflict.
+    """
+
+    def __init__(
+        self,
+        interval: float = settings.IDEMPOTENCY_PURGE_INTERVAL_SECONDS,
+        batch_size: int = settings.IDEMPOTENCY_PURGE_BATCH_SIZE,
+        session_factory=SessionLocal,
+    ):
+        self.interval = interval
+        self.batch_size = batch_size
+        self.session_factory = session_factory
+        self.purged = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="idempotency-purger", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout)
+        self._thread = None
+
+    def purge(self, now: Optional[datetime] = None) -> int:
+        """Delete every row expired at ``now``; returns how many"""
+        now = now or datetime.utcnow()
+        total = 0
+        with self.session_factory() as db:
+            repository = IdempotencyRepository(db)
+            while not self._stop.is_set():
+                deleted = repository.purge_expired(now, limit=self.batch_size)
+                total += deleted
+                if deleted < self.batch_size:
+                    break
+        self.purged += total
+        return total
+
+    def _run(self) -> None:
+        while True:
+            try:
+                self.purge()
+            except Exception:
+                logger.exception("Purging expired idempotency keys failed")
+            if self._stop.wait(self.interval):
+                return
+
+
+idempotency_purger = IdempotencyPurger()
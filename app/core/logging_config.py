@@ -0,0 +1,139 @@
+import copy
+import json
+import queue
+import atexit
+import random
+import logging
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+from app.core.config import settings
+
+_listener: Optional[QueueListener] = None
+
+# Attributes every LogRecord has; anything else was passed through ``extra=``
+_RESERVED_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+_exception_formatter = logging.Formatter()
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, including any ``extra=`` fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "timestamp": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_ATTRS:
+                payload[key] = value
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            payload["exc_info"] = record.exc_text
+        return json.dumps(payload, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """Keep roughly ``rate`` of the records below WARNING; warnings and errors always pass"""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno >= logging.WARNING or random.random() < self.rate
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """QueueHandler that leaves formatting to the listener thread and never blocks.
+
+    ``prepare`` pins ``msg % args`` and the traceback text in the calling thread,
+    while the arguments (ORM instances, lazy attributes) still hold the values
+    they had when logged; the listener thread only lays out the record. When the
+    queue is full the record is dropped and counted.
+    """
+
+    def __init__(self, log_queue: "queue.Queue"):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # A copy: other handlers of the same logger still get the original record
+        record = copy.copy(record)
+        record.msg = record.message = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = record.exc_text or _exception_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def parse_sample_rates(value: str) -> Dict[str, float]:
+    """Parse ``"logger.name=0.1,other=0.5"`` into a mapping"""
+    rates = {}
+    for item in value.split(","):
+        if not item.strip():
+            continue
+        name, _, rate = item.partition("=")
+        rates[name.strip()] = min(max(float(rate), 0.0), 1.0)
+    return rates
+
+
+def configure_logging(
+    level: str = settings.LOG_LEVEL,
+    log_format: str = settings.LOG_FORMAT,
+    queue_size: int = settings.LOG_QUEUE_SIZE,
+    sample_rates: str = settings.LOG_SAMPLE_RATES,
+) -> QueueListener:
+    """Route all logging through an in-memory queue drained by a background listener thread"""
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    stream_handler = logging.StreamHandler()
+    if log_format == "json":
+        stream_handler.setFormatter(JsonFormatter())
+    else:
+        stream_handler.setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
+
+    queue_handler = NonBlockingQueueHandler(queue.Queue(maxsize=queue_size))
+    root = logging.getLogger()
+    root.handlers = [queue_handler]
+    root.setLevel(level)
+
+    for name, rate in parse_sample_rates(sample_rates).items():
+        logging.getLogger(name).addFilter(SamplingFilter(rate))
+
+    _listener = QueueListener(queue_handler.queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+    return _listener
+
+
+def restart_logging_after_fork() -> None:
+    """Give a forked worker its own queue and listener thread; threads do not survive fork"""
+    if _listener is None:
+        return
+    fresh_queue = queue.Queue(maxsize=_listener.queue.maxsize)
+    for handler in logging.getLogger().handlers:
+        if isinstance(handler, QueueHandler):
+            handler.queue = fresh_queue
+    _listener.queue = fresh_queue
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """Stop the listener after it has written everything still queued"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
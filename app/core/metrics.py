@@ -0,0 +1,160 @@
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, Optional, Sequence, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+QUERY_TIME_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+
+class RequestDbStats:
+    """SQL cost of a single request, filled in by the engine event hooks"""
+
+    __slots__ = ("queries", "seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.seconds = 0.0
+
+
+# Set per request by MetricsMiddleware. Sync endpoints run in the threadpool with a
+# copy of the context, which still references the same RequestDbStats object.
+current_db_stats: ContextVar[Optional[RequestDbStats]] = ContextVar("current_db_stats", default=None)
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: Tuple[str, ...], values: Tuple) -> str:
+    return ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values))
+
+
+class MetricsRegistry:
+    """In-process request and database metrics rendered in Prometheus text format.
+
+    All mutation happens on the event loop thread (from MetricsMiddleware and the
+    async /metrics endpoint), so no locks are taken on the request path. With
+    several worker processes each one exposes its own series.
+    """
+
+    REQUEST_LABELS = ("method", "route", "status")
+
+    def __init__(self):
+        self.request_duration: Dict[Tuple, Histogram] = {}
+        self.db_queries: Dict[Tuple, Histogram] = {}
+        self.db_query_seconds: Dict[Tuple, Histogram] = {}
+        self.in_flight: Dict[str, int] = {}
+
+    def request_started(self, method: str) -> None:
+        self.in_flight[method] = self.in_flight.get(method, 0) + 1
+
+    def request_finished(
+        self,
+        method: str,
+        route: str,
+        status: int,
+        duration: float,
+        db_stats: RequestDbStats
+    ) -> None:
+        self.in_flight[method] -= 1
+        key = (method, route, status)
+        histogram = self.request_duration.get(key)
+        if histogram is None:
+            histogram = self.request_duration[key] = Histogram(LATENCY_BUCKETS)
+            self.db_queries[key] = Histogram(QUERY_COUNT_BUCKETS)
+            self.db_query_seconds[key] = Histogram(QUERY_TIME_BUCKETS)
+        histogram.observe(duration)
+        self.db_queries[key].observe(db_stats.queries)
+        self.db_query_seconds[key].observe(db_stats.seconds)
+
+    def render(self, engine: Optional[Engine] = None) -> str:
+        lines = []
+        self._render_histograms(
+            lines, "http_request_duration_seconds", "HTTP request latency by route and status",
+            self.request_duration
+        )
+        self._render_histograms(
+            lines, "db_queries_per_request", "SQL statements executed per request", self.db_queries
+        )
+        self._render_histograms(
+            lines, "db_query_seconds_per_request", "Time spent in SQL per request", self.db_query_seconds
+        )
+
+        lines.append("# HELP http_requests_in_flight Requests currently being processed")
+        lines.append("# TYPE http_requests_in_flight gauge")
+        for method, value in sorted(self.in_flight.items()):
+            lines.append(f'http_requests_in_flight{{method="{_escape(method)}"}} {value}')
+
+        if engine is not None:
+            self._render_pool(lines, engine)
+        return "\n".join(lines) + "\n"
+
+    def _render_histograms(self, lines: list, name: str, help_text: str, series: Dict[Tuple, Histogram]) -> None:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} histogram")
+        for key, histogram in sorted(series.items(), key=lambda item: tuple(map(str, item[0]))):
+            labels = _labels(self.REQUEST_LABELS, key)
+            cumulative = 0
+            for bound, count in zip(histogram.buckets, histogram.counts):
+                cumulative += count
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+            lines.append(f"{name}_sum{{{labels}}} {histogram.sum}")
+            lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+
+    def _render_pool(self, lines: list, engine: Engine) -> None:
+        pool = engine.pool
+        gauges = (
+            ("db_pool_size", "Configured connection pool size", "size"),
+            ("db_pool_checked_out", "Connections currently checked out", "checkedout"),
+            ("db_pool_checked_in", "Idle connections in the pool", "checkedin"),
+            ("db_pool_overflow", "Connections opened beyond the pool size", "overflow"),
+        )
+        for name, help_text, method in gauges:
+            # Not every pool class (e.g. SQLite's SingletonThreadPool) implements all of these
+            if hasattr(pool, method):
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} gauge")
+                lines.append(f"{name} {getattr(pool, method)()}")
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._metrics_start_time = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = current_db_stats.get()
+    if stats is None or context is None:
+        return
+    stats.queries += 1
+    stats.seconds += time.perf_counter() - getattr(context, "_metrics_start_time", time.perf_counter())
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Attribute SQL statement counts and time to the request that issued them"""
+    if not event.contains(engine, "after_cursor_execute", _after_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+metrics_registry = MetricsRegistry()
@@ -0,0 +1,143 @@
+import os
+import sys
+import uuid
+import threading
+from collections import Counter, deque
+from contextvars import Context, ContextVar
+from datetime import datetime
+from typing import List, Optional
+from app.core.config import settings
+
+# Frames at the top of a stack that mean the thread is parked, not working
+_IDLE_FILES = frozenset({"threading.py", "queue.py", "selectors.py", "socket.py"})
+
+# Set by ProfilingMiddleware for the profiled request; copied into the threadpool with the request's context
+active_sampler: ContextVar[Optional["StackSampler"]] = ContextVar("active_sampler", default=None)
+
+
+class StackSampler:
+    """Statistical profiler: a background thread snapshots the profiled request's stacks at a fixed interval.
+
+    Unlike cProfile this sees the threadpool threads that run sync endpoints, and
+    its cost does not depend on how many Python calls the request makes. Only
+    threads working on the profiled request are sampled (see ``_owns``), so
+    requests served at the same time stay out of the profile.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self.sample_count = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        self._thread.join()
+        return self.samples
+
+    def _run(self) -> None:
+        own_ident = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            self.sample_count += 1
+            for ident, frame in sys._current_frames().items():
+                if ident == own_ident or not self._owns(frame):
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                if stack[0].split(":", 1)[0] in _IDLE_FILES:
+                    continue
+                # Folded (flamegraph) format: root first, frames separated by ';'
+                self.samples[";".join(reversed(stack))] += 1
+
+    def _owns(self, frame) -> bool:
+        """Whether the thread whose innermost frame is ``frame`` is working on this sampler's request.
+
+        On the event loop that is while the request's coroutine runs, i.e. the
+        ProfilingMiddleware frame holding this sampler is on the stack. A
+        threadpool worker running a sync endpoint or dependency holds the
+        request's copied context in its ``run`` frame.
+        """
+        while frame is not None:
+            name = frame.f_code.co_name
+            if name == "__call__" and frame.f_locals.get("sampler") is self:
+                return True
+            if name == "run":
+                context = frame.f_locals.get("context")
+                if isinstance(context, Context) and context.get(active_sampler) is self:
+                    return True
+            frame = frame.f_back
+        return False
+
+
+class ProfileStore:
+    """Fixed-size ring buffer of completed request profiles"""
+
+    def __init__(self, capacity: int = settings.PROFILE_BUFFER_SIZE, max_stacks: int = settings.PROFILE_MAX_STACKS):
+        self.max_stacks = max_stacks
+        self._profiles: deque = deque(maxlen=capacity)
+        self._active = threading.Lock()
+
+    def try_begin(self) -> bool:
+        """Only one request is profiled at a time; others run unprofiled"""
+        return self._active.acquire(blocking=False)
+
+    def end(self) -> None:
+        self._active.release()
+
+    def new_id(self) -> str:
+        return str(uuid.uuid4())
+
+    def add(
+        self,
+        profile_id: str,
+        method: str,
+        path: str,
+        status_code: int,
+        duration_ms: float,
+        trigger: str,
+        sampler: StackSampler
+    ) -> dict:
+        stacks = sampler.samples
+        self_counts: Counter = Counter()
+        total_counts: Counter = Counter()
+        for stack, count in stacks.items():
+            frames = stack.split(";")
+            self_counts[frames[-1]] += count
+            for frame in set(frames):
+                total_counts[frame] += count
+
+        profile = {
+            "id": profile_id,
+            "method": method,
+            "path": path,
+            "status_code": status_code,
+            "duration_ms": duration_ms,
+            "trigger": trigger,
+            "captured_at": datetime.utcnow(),
+            "interval_ms": sampler.interval * 1000,
+            "sample_count": sampler.sample_count,
+            "top_self": [{"frame": frame, "samples": count} for frame, count in self_counts.most_common(25)],
+            "top_total": [{"frame": frame, "samples": count} for frame, count in total_counts.most_common(25)],
+            "folded": [f"{stack} {count}" for stack, count in stacks.most_common(self.max_stacks)],
+        }
+        self._profiles.append(profile)
+        return profile
+
+    def list(self) -> List[dict]:
+        return list(reversed(self._profiles))
+
+    def get(self, profile_id: str) -> Optional[dict]:
+        for profile in self._profiles:
+            if profile["id"] == profile_id:
+                return profile
+        return None
+
+
+profile_store = ProfileStore()
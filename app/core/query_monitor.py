@@ -0,0 +1,136 @@
+import re
+import time
+import logging
+from collections import deque
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Dict, List, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.core.config import settings
+
+logger = logging.getLogger("app.db.query_monitor")
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s|\?|(?<!:):\w+")
+_IN_LIST = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=2048)
+def normalize_sql(statement: str) -> str:
+    """Reduce a statement to its shape: literals and bind parameters become ``?``.
+
+    SQLAlchemy reuses the same statement string for the same query, so the cache
+    makes this a dict lookup after the first call.
+    """
+    normalized = _STRING_LITERAL.sub("?", statement)
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    normalized = _PLACEHOLDER.sub("?", normalized)
+    normalized = _IN_LIST.sub("IN (?)", normalized)
+    return _WHITESPACE.sub(" ", normalized).strip()
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised in strict (test) mode when an endpoint runs more queries than its budget"""
+
+
+class RequestQueryLog:
+    """Statements issued while serving one request"""
+
+    __slots__ = ("scope", "statements", "total")
+
+    def __init__(self, scope: Optional[dict] = None):
+        self.scope = scope or {}
+        self.statements: Dict[str, int] = {}
+        self.total = 0
+
+    @property
+    def endpoint(self) -> str:
+        # The route is only known once the router has matched, which happens before
+        # any query the endpoint or its dependencies issue.
+        route = self.scope.get("route")
+        path = getattr(route, "path", None) or self.scope.get("path", "-")
+        return f"{self.scope.get('method', '-')} {path}"
+
+    def add(self, statement: str) -> None:
+        normalized = normalize_sql(statement)
+        self.statements[normalized] = self.statements.get(normalized, 0) + 1
+        self.total += 1
+
+
+current_query_log: ContextVar[Optional[RequestQueryLog]] = ContextVar("current_query_log", default=None)
+
+
+class QueryMonitor:
+    """Slow query log, repeated statement (N+1) detector and per-endpoint query budgets"""
+
+    def __init__(
+        self,
+        slow_query_ms: float = settings.SLOW_QUERY_THRESHOLD_MS,
+        repeat_threshold: int = settings.N_PLUS_ONE_THRESHOLD,
+        default_budget: int = settings.QUERY_BUDGET_DEFAULT,
+        strict: bool = settings.QUERY_BUDGET_STRICT,
+    ):
+        self.slow_query_seconds = slow_query_ms / 1000
+        self.repeat_threshold = repeat_threshold
+        self.default_budget = default_budget
+        self.strict = strict
+        self.budgets: Dict[str, int] = {}
+        self.violations: deque = deque(maxlen=100)
+
+    def install(self, engine: Engine) -> None:
+        if not event.contains(engine, "after_cursor_execute", self._after_cursor_execute):
+            event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+            event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def set_budget(self, endpoint: str, max_queries: int) -> None:
+        """Budget for an endpoint given as ``"METHOD /route/template"``"""
+        self.budgets[endpoint] = max_queries
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._query_monitor_start_time = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        request_log = current_query_log.get()
+        if request_log is not None:
+            request_log.add(statement)
+
+        start_time = getattr(context, "_query_monitor_start_time", None)
+        if start_time is None:
+            return
+        elapsed = time.perf_counter() - start_time
+        if elapsed >= self.slow_query_seconds:
+            logger.warning(
+                "Slow query (%.1f ms) from %s: %s",
+                elapsed * 1000,
+                request_log.endpoint if request_log is not None else "background",
+                normalize_sql(statement),
+                extra={"duration_ms": round(elapsed * 1000, 3)},
+            )
+
+    def finish_request(self, request_log: RequestQueryLog) -> List[str]:
+        """Check a completed request for repeated statements and budget overruns"""
+        problems = []
+        endpoint = request_log.endpoint
+
+        for statement, count in request_log.statements.items():
+            if count > self.repeat_threshold:
+                problems.append(f"Possible N+1 in {endpoint}: statement ran {count} times: {statement}")
+                logger.warning(problems[-1])
+
+        budget = self.budgets.get(endpoint, self.default_budget or None)
+        if budget is not None and request_log.total > budget:
+            message = f"{endpoint} ran {request_log.total} queries, budget is {budget}"
+            problems.append(message)
+            self.violations.append(message)
+            logger.warning(message)
+            if self.strict:
+                raise QueryBudgetExceeded(message)
+
+        return problems
+
+
+query_monitor = QueryMonitor()
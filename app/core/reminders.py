@@ -0,0 +1,261 @@
+import heapq
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set, Tuple
+from uuid import UUID
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.repositories.reminder_repository import ReminderRepository
+from app.utils.constants import AppointmentStatus
+
+logger = logging.getLogger("reminders")
+
+# Overlap between consecutive change scans, for clock skew between API servers
+CHANGE_SCAN_SLACK = timedelta(seconds=60)
+MAX_ATTEMPTS = 5
+# Reminders falling due within this many seconds are claimed together in one batch
+BATCH_WINDOW_SECONDS = 1.0
+
+
+@dataclass(frozen=True)
+class Reminder:
+    appointment_id: UUID
+    patient_id: UUID
+    doctor_id: UUID
+    appointment_time: datetime
+
+
+class LogReminderSink:
+    """Writes reminders to the application log; for development and tests"""
+
+    name = "log"
+
+    def send(self, reminders: List[Reminder]) -> None:
+        for reminder in reminders:
+            logger.info(
+                "Appointment reminder",
+                extra={
+                    "appointment_id": str(reminder.appointment_id),
+                    "patient_id": str(reminder.patient_id),
+                    "appointment_time": reminder.appointment_time.isoformat(),
+                }
+            )
+
+
+class WebhookReminderSink:
+    """POSTs each batch of reminders as JSON to a notification service"""
+
+    name = "webhook"
+
+    def __init__(self, url: str, timeout: float = 10.0):
+        import httpx
+
+        self.url = url
+        self.client = httpx.Client(timeout=timeout)
+
+    def send(self, reminders: List[Reminder]) -> None:
+        response = self.client.post(self.url, json={"reminders": [
+            {
+                "appointment_id": str(reminder.appointment_id),
+                "patient_id": str(reminder.patient_id),
+                "doctor_id": str(reminder.doctor_id),
+                "appointment_time": reminder.appointment_time.isoformat(),
+            }
+            for reminder in reminders
+        ]})
+        response.raise_for_status()
+
+
+def create_reminder_sink():
+    if settings.REMINDER_SINK == "webhook":
+        return WebhookReminderSink(settings.REMINDER_WEBHOOK_URL)
+    return LogReminderSink()
+
+
+class ReminderScheduler:
+    """Sends a reminder ``lead`` before every BOOKED appointment.
+
+    Every ``scan_interval`` the scheduler reads the next slice of upcoming
+    appointments from the (status, appointment_time) index, plus appointments
+    booked or moved since the previous scan, and keeps those whose reminder is
+    due within ``horizon`` in a min-heap. Due reminders are claimed in batches
+    with SELECT ... FOR UPDATE SKIP LOCKED, re-checked against the row (a
+    cancelled or rescheduled appointment is dropped here), handed to the sink and
+    recorded in ``appointment_reminders``. Any number of instances can run side
+    by side; each reminder is sent once unless a sink fails after delivering.
+    """
+
+    def __init__(
+        self,
+        sink=None,
+        lead: timedelta = timedelta(hours=settings.REMINDER_LEAD_HOURS),
+        scan_interval: float = settings.REMINDER_SCAN_INTERVAL_SECONDS,
+        horizon: float = settings.REMINDER_HORIZON_SECONDS,
+        catchup: float = settings.REMINDER_CATCHUP_SECONDS,
+        batch_size: int = settings.REMINDER_BATCH_SIZE,
+        session_factory=SessionLocal,
+    ):
+        self.sink = sink
+        self.lead = lead
+        self.scan_interval = timedelta(seconds=scan_interval)
+        self.horizon = timedelta(seconds=horizon)
+        self.catchup = timedelta(seconds=catchup)
+        self.batch_size = batch_size
+        self.session_factory = session_factory
+        self.retry_delay = timedelta(seconds=min(scan_interval, 5.0))
+        # (due_at, appointment_id, appointment_time, attempt)
+        self._heap: List[Tuple[datetime, UUID, datetime, int]] = []
+        self._scheduled: Set[Tuple[UUID, datetime]] = set()
+        self._scanned_until: Optional[datetime] = None
+        self._changes_since: Optional[datetime] = None
+        self._next_scan: Optional[datetime] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        # Only the scheduler thread writes the counters
+        self.scans = 0
+        self.sent = 0
+        self.dropped = 0
+        self.skipped_locked = 0
+        self.failed = 0
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        if self.sink is None:
+            self.sink = create_reminder_sink()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="reminder-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout)
+        self._thread = None
+
+    def stats(self) -> dict:
+        return {
+            "running": self._thread is not None and self._thread.is_alive(),
+            "pending": len(self._heap),
+            "scanned_until": self._scanned_until,
+            "scans": self.scans,
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "skipped_locked": self.skipped_locked,
+            "failed": self.failed,
+        }
+
+    def run_pending(self, now: datetime) -> float:
+        """Scan if a scan is due, deliver every reminder due at ``now``; returns seconds until the next step"""
+        if self._next_scan is None or now >= self._next_scan:
+            self._scan(now)
+            self._next_scan = now + self.scan_interval
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            due.append(heapq.heappop(self._heap))
+            if len(due) == self.batch_size:
+                self._deliver(due, now)
+                due = []
+        if due:
+            self._deliver(due, now)
+        wake_at = min(self._next_scan, self._heap[0][0]) if self._heap else self._next_scan
+        return max((wake_at - now).total_seconds(), BATCH_WINDOW_SECONDS)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                delay = self.run_pending(datetime.utcnow())
+            except Exception:
+                logger.exception("Reminder scheduler step failed")
+                delay = self.retry_delay.total_seconds()
+            self._stop.wait(delay)
+
+    def _scan(self, now: datetime) -> None:
+        window_end = now + self.lead + self.horizon
+        start = self._scanned_until or now + self.lead - self.catchup
+        with self.session_factory() as db:
+            repository = ReminderRepository(db)
+            found = repository.booked_between(start, window_end)
+            if self._changes_since is not None:
+                # Booked or moved into the part of the timeline already scanned
+                found += [
+                    (appointment_id, appointment_time)
+                    for appointment_id, appointment_time, status in repository.changed_since(self._changes_since)
+                    if status == AppointmentStatus.BOOKED and now <= appointment_time < start
+                ]
+        self._scanned_until = window_end
+        self._changes_since = now - CHANGE_SCAN_SLACK
+        self.scans += 1
+        for appointment_id, appointment_time in found:
+            self._schedule(appointment_id, appointment_time, max(appointment_time - self.lead, now), 0)
+
+    def _schedule(self, appointment_id: UUID, appointment_time: datetime, due_at: datetime, attempt: int) -> None:
+        key = (appointment_id, appointment_time)
+        if attempt == 0 and key in self._scheduled:
+            return
+        self._scheduled.add(key)
+        heapq.heappush(self._heap, (due_at, appointment_id, appointment_time, attempt))
+
+    def _deliver(self, entries: List[Tuple[datetime, UUID, datetime, int]], now: datetime) -> None:
+        for _, appointment_id, appointment_time, _ in entries:
+            self._scheduled.discard((appointment_id, appointment_time))
+        db = self.session_factory()
+        try:
+            repository = ReminderRepository(db)
+            rows = repository.lock([entry[1] for entry in entries])
+            already_sent = repository.sent([(entry[1], entry[2]) for entry in entries])
+            reminders: Dict[Tuple[UUID, datetime], Reminder] = {}
+            retry = []
+            for entry in entries:
+                _, appointment_id, appointment_time, attempt = entry
+                row = rows.get(appointment_id)
+                if row is None:
+                    # Locked by another scheduler or a writer; look again shortly
+                    self.skipped_locked += 1
+                    retry.append(entry)
+                elif (
+                    row.status != AppointmentStatus.BOOKED
+                    or row.appointment_time != appointment_time
+                    or appointment_time <= now
+                    or (appointment_id, appointment_time) in already_sent
+                ):
+                    # Cancelled, moved (the scans pick up the new time) or already sent
+                    self.dropped += 1
+                else:
+                    reminders[(appointment_id, appointment_time)] = Reminder(
+                        appointment_id, row.patient_id, row.doctor_id, appointment_time
+                    )
+            if reminders:
+                self.sink.send(list(reminders.values()))
+                repository.record_sent(list(reminders), now)
+                self.sent += len(reminders)
+            else:
+                db.rollback()
+        except Exception:
+            db.rollback()
+            self.failed += len(entries)
+            logger.exception("Failed to deliver %d reminders", len(entries))
+            retry = [entry for entry in entries if entry[3] + 1 < MAX_ATTEMPTS]
+        finally:
+            db.close()
+        for due_at, appointment_id, appointment_time, attempt in retry:
+            if appointment_time > now:
+                self._schedule(appointment_id, appointment_time, now + self.retry_delay * (attempt + 1), attempt + 1)
+
+
+reminder_scheduler = ReminderScheduler()
+
+
+if __name__ == "__main__":
+    # A dedicated scheduler instance: python -m app.core.reminders
+    from app.core.logging_config import configure_logging
+
+    configure_logging()
+    reminder_scheduler.start()
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        reminder_scheduler.stop()
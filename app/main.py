@@ -1,44 +1,82 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
 from sqlalchemy.exc import SQLAlchemyError
-import logging
+from sqlalchemy.orm.exc import StaleDataError
 from app.core.database import engine, Base
 from app.core.config import settings
+from app.core.audit import audit_sink
+from app.core.idempotency import idempotency_purger
+from app.core.logging_config import configure_logging
+from app.core.metrics import instrument_engine, metrics_registry
+from app.core.reminders import reminder_scheduler
+from app.core.tracing import TracingMiddleware, tracer
 from app.api.routes import appointments, auth, users, prescriptions, doctors, admin
 from app.middleware.logging_middleware import LoggingMiddleware
 from app.middleware.audit_middleware import AuditMiddleware
+from app.middleware.metrics_middleware import MetricsMiddleware
+from app.middleware.query_monitor_middleware import QueryMonitorMiddleware
+from app.middleware.profiling_middleware import ProfilingMiddleware
+from app.middleware.compression_middleware import CompressionMiddleware
 from app.exceptions.exception_handlers import (
     validation_exception_handler,
+    stale_data_exception_handler,
     sqlalchemy_exception_handler,
     general_exception_handler
 )
 
-# Configure logging
-logging.basicConfig(
-    level=settings.LOG_LEVEL,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+# Configure logging (queue-based, written by a background listener thread)
+configure_logging()
+
+tracer.configure(
+    settings.TRACE_SERVICE_NAME,
+    enabled=settings.TRACING_ENABLED,
+    export_path=settings.TRACE_EXPORT_PATH or None,
+    collector_url=settings.TRACE_COLLECTOR_URL or None,
+    sample_rate=settings.TRACE_SAMPLE_RATE
 )
 
 # Create database tables
 Base.metadata.create_all(bind=engine)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    audit_sink.start()
+    idempotency_purger.start()
+    if settings.REMINDERS_ENABLED:
+        reminder_scheduler.start()
+    yield
+    reminder_scheduler.stop()
+    idempotency_purger.stop()
+    # Flush pending audit events before the worker exits
+    audit_sink.stop()
+
+
 app = FastAPI(
     title="Healthcare Appointment & E-Prescription API",
     description="RESTful API for managing healthcare appointments and e-prescriptions",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # Exception handlers
 app.add_exception_handler(RequestValidationError, validation_exception_handler)
+app.add_exception_handler(StaleDataError, stale_data_exception_handler)
 app.add_exception_handler(SQLAlchemyError, sqlalchemy_exception_handler)
 app.add_exception_handler(Exception, general_exception_handler)
 
 # Middleware
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+app.add_middleware(QueryMonitorMiddleware)
 app.add_middleware(LoggingMiddleware)
-app.add_middleware(AuditMiddleware)
+if settings.AUDIT_ENABLED:
+    app.add_middleware(AuditMiddleware)
 
 # CORS middleware
 app.add_middleware(
@@ -49,6 +87,19 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+
+# Outermost, so latency includes the rest of the middleware stack
+if settings.METRICS_ENABLED:
+    instrument_engine(engine)
+    app.add_middleware(MetricsMiddleware)
+
+# Opens the root span, so it wraps everything else
+if tracer.enabled:
+    tracer.instrument_engine(engine)
+    app.add_middleware(TracingMiddleware)
+
 # Include routers
 app.include_router(auth.router)
 app.include_router(users.router)
@@ -73,3 +124,12 @@ def health_check():
         "status": "healthy",
         "version": "1.0.0"
     }
+
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+    # Async on purpose: rendering runs on the event loop thread, the only writer of the registry
+    return PlainTextResponse(
+        metrics_registry.render(engine),
+        media_type="text/plain; version=0.0.4"
+    )
@@ -1,13 +1,18 @@
-import logging
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
+import re
+import time
 from datetime import datetime
+from typing import Iterable, Optional
+from uuid import UUID
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.audit import AuditSink, audit_sink
 
-logger = logging.getLogger("audit")
 
+class AuditMiddleware:
+    """Pure ASGI middleware for auditing sensitive operations in healthcare system.
 
-class AuditMiddleware(BaseHTTPMiddleware):
-    """Middleware for auditing sensitive operations in healthcare system"""
+    Events are handed to the audit sink after the response has started, so the
+    user id set by the auth dependency and the final status code are known.
+    """
     
     SENSITIVE_PATHS = [
         "/prescriptions",
@@ -15,23 +20,54 @@ class AuditMiddleware(BaseHTTPMiddleware):
         "/users/profile",
         "/admin"
     ]
+    AUDITED_METHODS = frozenset({"POST", "PUT", "DELETE"})
     
-    async def dispatch(self, request: Request, call_next):
-        # Check if this is a sensitive operation
-        is_sensitive = any(path in str(request.url.path) for path in self.SENSITIVE_PATHS)
+    def __init__(
+        self,
+        app: ASGIApp,
+        sensitive_paths: Optional[Iterable[str]] = None,
+        sink: AuditSink = audit_sink
+    ):
+        self.app = app
+        self.sink = sink
+        paths = sensitive_paths if sensitive_paths is not None else self.SENSITIVE_PATHS
+        alternatives = "|".join(re.escape(path.rstrip("/")) for path in paths)
+        # Single precompiled prefix match instead of scanning every path per request
+        self.sensitive_path_pattern = re.compile(
+            "^(?:" + alternatives + ")(?:/|$)" if alternatives else "(?!)"
+        )
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if not (
+            scope["type"] == "http"
+            and scope["method"] in self.AUDITED_METHODS
+            and self.sensitive_path_pattern.match(scope["path"])
+        ):
+            await self.app(scope, receive, send)
+            return
         
-        if is_sensitive and request.method in ["POST", "PUT", "DELETE"]:
-            # Extract user info from request state (set by auth dependency)
-            user_id = getattr(request.state, "user_id", "anonymous")
-            
-            # Log audit trail
-            logger.info(
-                f"AUDIT: {datetime.utcnow().isoformat()} | "
-                f"User: {user_id} | "
-                f"Action: {request.method} | "
-                f"Path: {request.url.path} | "
-                f"IP: {request.client.host if request.client else 'unknown'}"
-            )
+        occurred_at = datetime.utcnow()
+        start_time = time.perf_counter()
+        status_code = 500
         
-        response = await call_next(request)
-        return response
+        async def send_wrapper(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # Extract user info from request state (set by auth dependency)
+            user_id = scope.get("state", {}).get("user_id")
+            client = scope.get("client")
+            self.sink.record({
+                "user_id": UUID(user_id) if user_id else None,
+                "method": scope["method"],
+                "path": scope["path"],
+                "status_code": status_code,
+                "client_ip": client[0] if client else None,
+                "duration_ms": (time.perf_counter() - start_time) * 1000,
+                "occurred_at": occurred_at,
+            })
@@ -0,0 +1,101 @@
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.compression import CompressionPolicy, compression_policy
+
+
+class CompressionMiddleware:
+    """Pure ASGI middleware compressing responses with gzip or brotli per ``Accept-Encoding``.
+
+    Bodies are buffered only until ``minimum_size`` bytes have arrived: smaller
+    responses go out unchanged, larger ones are compressed. A streamed response
+    is compressed chunk by chunk and flushed after each one, so the client
+    still receives data as it is produced.
+    """
+
+    def __init__(self, app: ASGIApp, policy: CompressionPolicy = compression_policy):
+        self.app = app
+        self.policy = policy
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = Headers(scope=scope).get("accept-encoding", "")
+        if not accept_encoding:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        buffered = []
+        buffered_size = 0
+        encoder = None
+        passthrough = False
+
+        async def send_wrapper(message: Message):
+            nonlocal start_message, buffered_size, encoder, passthrough
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                if (
+                    "content-encoding" in headers
+                    or not self.policy.compressible(headers.get("content-type", ""))
+                ):
+                    passthrough = True
+                    await send(message)
+                    return
+                start_message = message
+                return
+
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if encoder is None:
+                buffered.append(body)
+                buffered_size += len(body)
+                if more_body and buffered_size < self.policy.minimum_size:
+                    return
+
+                # The route is matched by now, so per-route levels can be looked up
+                route = scope.get("route")
+                endpoint = f"{scope['method']} {getattr(route, 'path', scope['path'])}"
+                choice = self.policy.choose(accept_encoding, endpoint)
+                if choice is None or buffered_size < self.policy.minimum_size:
+                    passthrough = True
+                    await send(start_message)
+                    await send({"type": "http.response.body", "body": b"".join(buffered), "more_body": more_body})
+                    return
+
+                encoder_class, level = choice
+                encoder = encoder_class(level)
+                body = b"".join(buffered)
+                buffered.clear()
+
+                headers = MutableHeaders(scope=start_message)
+                headers["Content-Encoding"] = encoder.encoding
+                headers.add_vary_header("Accept-Encoding")
+                if more_body:
+                    # Final length is unknown until the stream ends
+                    del headers["Content-Length"]
+                else:
+                    compressed = encoder.compress(body) + encoder.finish()
+                    headers["Content-Length"] = str(len(compressed))
+                    await send(start_message)
+                    await send({"type": "http.response.body", "body": compressed})
+                    return
+                await send(start_message)
+
+            if more_body:
+                chunk = encoder.compress(body) + encoder.flush()
+            else:
+                chunk = encoder.compress(body) + encoder.finish()
+            await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+        await self.app(scope, receive, send_wrapper)
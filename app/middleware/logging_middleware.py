@@ -1,32 +1,48 @@
 import time
 import logging
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 logger = logging.getLogger(__name__)
 
 
-class LoggingMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        start_time = time.time()
-        
+class LoggingMiddleware:
+    """Pure ASGI request logging middleware.
+
+    Unlike ``BaseHTTPMiddleware`` this does not wrap the downstream app in an extra
+    task and memory stream, so streaming responses pass through untouched.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        method = scope["method"]
+        path = scope["path"]
+        status_code = 500
+
         # Log request
-        logger.info(f"Request: {request.method} {request.url.path}")
-        
-        # Process request
-        response = await call_next(request)
-        
-        # Calculate processing time
-        process_time = time.time() - start_time
-        
-        # Log response
-        logger.info(
-            f"Response: {request.method} {request.url.path} "
-            f"Status: {response.status_code} "
-            f"Duration: {process_time:.3f}s"
-        )
-        
-        # Add custom header
-        response.headers["X-Process-Time"] = str(process_time)
-        
-        return response
+        logger.info("Request: %s %s", method, path)
+
+        async def send_wrapper(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                # Add custom header
+                headers = MutableHeaders(scope=message)
+                headers.append("X-Process-Time", str(time.perf_counter() - start_time))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # Log response
+            logger.info(
+                "Response: %s %s Status: %s Duration: %.3fs",
+                method, path, status_code, time.perf_counter() - start_time
+            )
@@ -0,0 +1,46 @@
+import time
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.metrics import MetricsRegistry, RequestDbStats, current_db_stats, metrics_registry
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording per-route latency, status and SQL cost"""
+
+    EXCLUDED_PATHS = frozenset({"/metrics"})
+
+    def __init__(self, app: ASGIApp, registry: MetricsRegistry = metrics_registry):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["path"] in self.EXCLUDED_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        db_stats = RequestDbStats()
+        token = current_db_stats.set(db_stats)
+        self.registry.request_started(method)
+        start_time = time.perf_counter()
+
+        async def send_wrapper(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # The router stores the matched route in the scope; label by its template
+            # rather than the raw path to keep the number of series bounded.
+            route = scope.get("route")
+            self.registry.request_finished(
+                method,
+                getattr(route, "path", "unmatched"),
+                status_code,
+                time.perf_counter() - start_time,
+                db_stats
+            )
+            current_db_stats.reset(token)
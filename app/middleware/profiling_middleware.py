@@ -0,0 +1,103 @@
+import time
+from typing import Optional
+from urllib.parse import parse_qsl
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.config import settings
+from app.core.profiling import ProfileStore, StackSampler, active_sampler, profile_store
+from app.core.security import decode_access_token
+from app.utils.constants import UserRole
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_QUERY_PARAM = "profile"
+
+
+class ProfilingMiddleware:
+    """Runs selected requests under a stack sampler and keeps the result in a ring buffer.
+
+    A request is profiled when an admin sends ``X-Profile: 1`` or ``?profile=1``,
+    or when it is the Nth request and ``PROFILE_SAMPLE_EVERY_N`` is set. Any other
+    request pays for a counter increment and a header scan only.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        store: ProfileStore = profile_store,
+        sample_every_n: int = settings.PROFILE_SAMPLE_EVERY_N,
+        interval_ms: float = settings.PROFILE_INTERVAL_MS
+    ):
+        self.app = app
+        self.store = store
+        self.sample_every_n = sample_every_n
+        self.interval = interval_ms / 1000
+        self._request_count = 0
+
+    def _trigger(self, scope: Scope) -> Optional[str]:
+        self._request_count += 1
+        if self.sample_every_n and self._request_count % self.sample_every_n == 0:
+            return "sampled"
+
+        query_string = scope.get("query_string", b"")
+        requested = (
+            b"profile" in query_string
+            and (PROFILE_QUERY_PARAM, "1") in parse_qsl(query_string.decode("latin-1"))
+        )
+        authorization = None
+        for name, value in scope["headers"]:
+            if name == PROFILE_HEADER and value == b"1":
+                requested = True
+            elif name == b"authorization":
+                authorization = value
+        if not requested or authorization is None:
+            return None
+
+        # Only admins may profile on demand
+        scheme, _, token = authorization.decode("latin-1").partition(" ")
+        payload = decode_access_token(token) if scheme.lower() == "bearer" else None
+        if payload is None or payload.get("role") != UserRole.ADMIN.value:
+            return None
+        return "requested"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        trigger = self._trigger(scope)
+        if trigger is None or not self.store.try_begin():
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        sampler = StackSampler(self.interval)
+        profile_id = None
+
+        async def send_wrapper(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if trigger == "requested":
+                    # Id is assigned up front so the caller can fetch the profile
+                    MutableHeaders(scope=message).append("X-Profile-Id", profile_id)
+            await send(message)
+
+        profile_id = self.store.new_id()
+        start_time = time.perf_counter()
+        token = active_sampler.set(sampler)
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            sampler.stop()
+            active_sampler.reset(token)
+            self.store.end()
+            self.store.add(
+                profile_id,
+                scope["method"],
+                scope["path"],
+                status_code,
+                (time.perf_counter() - start_time) * 1000,
+                trigger,
+                sampler
+            )
@@ -0,0 +1,27 @@
+from starlette.types import ASGIApp, Receive, Scope, Send
+from app.core.query_monitor import QueryMonitor, RequestQueryLog, current_query_log, query_monitor
+
+
+class QueryMonitorMiddleware:
+    """Pure ASGI middleware collecting the statements each request runs.
+
+    After the request completes the monitor flags repeated statements (N+1 patterns)
+    and, in strict mode, raises when the endpoint exceeds its query budget.
+    """
+
+    def __init__(self, app: ASGIApp, monitor: QueryMonitor = query_monitor):
+        self.app = app
+        self.monitor = monitor
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_log = RequestQueryLog(scope)
+        token = current_query_log.set(request_log)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_query_log.reset(token)
+        self.monitor.finish_request(request_log)
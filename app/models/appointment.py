@@ -1,6 +1,6 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, Enum as SQLEnum
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, DateTime, ForeignKey, Index, Enum as SQLEnum
 from sqlalchemy.orm import relationship
+from app.models.types import GUID
 from app.models.base import BaseModel
 from app.utils.constants import AppointmentStatus
 
@@ -8,11 +8,20 @@ from app.utils.constants import AppointmentStatus
 class Appointment(BaseModel):
     __tablename__ = "appointments"
     
-    patient_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
-    doctor_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    patient_id = Column(GUID(), ForeignKey("users.id"), nullable=False)
+    doctor_id = Column(GUID(), ForeignKey("users.id"), nullable=False)
     appointment_time = Column(DateTime, nullable=False)
     status = Column(SQLEnum(AppointmentStatus), default=AppointmentStatus.BOOKED)
     notes = Column(String, nullable=True)
     
     patient = relationship("User", foreign_keys=[patient_id])
     doctor = relationship("User", foreign_keys=[doctor_id])
+    
+    __table_args__ = (
+        # Doctor schedule: one range scan per doctor and period
+        Index("ix_appointments_doctor_id_appointment_time", "doctor_id", "appointment_time"),
+        # Reminder scheduler: range scans of upcoming BOOKED appointments, and of
+        # rows changed since its last scan (new bookings, reschedules)
+        Index("ix_appointments_status_appointment_time", "status", "appointment_time"),
+        Index("ix_appointments_updated_at", "updated_at"),
+    )
@@ -0,0 +1,17 @@
+from sqlalchemy import Column, DateTime, ForeignKey
+from datetime import datetime
+from app.core.database import Base
+from app.models.types import GUID
+
+
+class AppointmentReminder(Base):
+    """A reminder that was delivered for an appointment at a given time.
+
+    Keyed by the appointment time as well as the appointment, so moving an
+    appointment earns it a new reminder for the new time.
+    """
+    __tablename__ = "appointment_reminders"
+    
+    appointment_id = Column(GUID(), ForeignKey("appointments.id", ondelete="CASCADE"), primary_key=True)
+    appointment_time = Column(DateTime, primary_key=True)
+    sent_at = Column(DateTime, default=datetime.utcnow, nullable=False)
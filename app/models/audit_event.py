@@ -0,0 +1,29 @@
+from sqlalchemy import Column, String, Integer, Float, DateTime, Index
+from datetime import datetime
+from app.core.database import Base
+from app.models.types import GUID
+from app.utils.ids import uuid7
+
+
+class AuditEvent(Base):
+    """One audited request. Append-only, so unlike ``BaseModel`` tables it has no
+    ``updated_at`` and no version counter."""
+    __tablename__ = "audit_events"
+    
+    id = Column(GUID(), primary_key=True, default=uuid7)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    # No FK to users: audit rows must outlive the accounts they describe and
+    # batch inserts should not pay for constraint checks.
+    user_id = Column(GUID(), nullable=True)
+    method = Column(String(10), nullable=False)
+    path = Column(String, nullable=False)
+    status_code = Column(Integer, nullable=True)
+    client_ip = Column(String, nullable=True)
+    duration_ms = Column(Float, nullable=True)
+    occurred_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    
+    __table_args__ = (
+        Index("ix_audit_events_user_id_occurred_at", "user_id", "occurred_at"),
+        Index("ix_audit_events_occurred_at", "occurred_at"),
+        Index("ix_audit_events_path_occurred_at", "path", "occurred_at"),
+    )
@@ -1,13 +1,23 @@
-import uuid
-from sqlalchemy import Column, DateTime
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, DateTime, Integer
+from sqlalchemy.orm import declared_attr
 from datetime import datetime
 from app.core.database import Base
+from app.models.types import GUID
+from app.utils.ids import uuid7
 
 
 class BaseModel(Base):
     __abstract__ = True
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    # Time-ordered, so inserts append to the primary key index instead of splitting
+    # pages all over it. Rows created with uuid4 ids before the switch stay valid.
+    id = Column(GUID(), primary_key=True, default=uuid7)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Optimistic locking: every UPDATE/DELETE checks and bumps the version, and raises
+    # StaleDataError when another transaction changed the row first
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    
+    @declared_attr
+    def __mapper_args__(cls):
+        return {"version_id_col": cls.version}
@@ -0,0 +1,25 @@
+from sqlalchemy import Column, String, Integer, Text, DateTime, Index
+from datetime import datetime
+from app.core.database import Base
+from app.models.types import GUID
+
+
+class IdempotencyKey(Base):
+    """A client's Idempotency-Key and the response its first request produced.
+
+    Keys are scoped per user. ``status_code`` stays NULL while the first request is
+    still running. Rows are disposable once ``expires_at`` has passed.
+    """
+    __tablename__ = "idempotency_keys"
+    
+    user_id = Column(GUID(), primary_key=True)
+    key = Column(String(255), primary_key=True)
+    request_hash = Column(String(64), nullable=False)
+    status_code = Column(Integer, nullable=True)
+    response_body = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+    
+    __table_args__ = (
+        Index("ix_idempotency_keys_expires_at", "expires_at"),
+    )
@@ -1,15 +1,15 @@
 from sqlalchemy import Column, String, ForeignKey, JSON
-from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
+from app.models.types import GUID
 from app.models.base import BaseModel
 
 
 class Prescription(BaseModel):
     __tablename__ = "prescriptions"
     
-    appointment_id = Column(UUID(as_uuid=True), ForeignKey("appointments.id"), nullable=False, unique=True)
-    doctor_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
-    patient_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    appointment_id = Column(GUID(), ForeignKey("appointments.id"), nullable=False, unique=True)
+    doctor_id = Column(GUID(), ForeignKey("users.id"), nullable=False)
+    patient_id = Column(GUID(), ForeignKey("users.id"), nullable=False)
     notes = Column(String, nullable=True)
     medicines = Column(JSON, nullable=False)
     
@@ -0,0 +1,13 @@
+from sqlalchemy import Uuid
+
+
+class GUID(Uuid):
+    """UUID column that works on every database the app runs on.
+
+    PostgreSQL stores it in its native ``uuid`` type, SQLite (the test suite) as
+    32 hex digits in a CHAR(32). Python values are ``uuid.UUID`` either way.
+    """
+    cache_ok = True
+
+    def __init__(self):
+        super().__init__(as_uuid=True)
@@ -1,10 +1,16 @@
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from sqlalchemy import case, func, select
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session, Query, joinedload, selectinload
+from typing import List, Optional, Sequence
 from uuid import UUID
+from app.core.cache import entity_cache
 from app.models.appointment import Appointment
+from app.models.user import User
 from app.utils.constants import AppointmentStatus
 from datetime import datetime
 
+entity_cache.register(Appointment, "id")
+
 
 class AppointmentRepository:
     def __init__(self, db: Session):
@@ -16,15 +22,72 @@ class AppointmentRepository:
         self.db.refresh(appointment)
         return appointment
     
-    def get_by_id(self, appointment_id: UUID) -> Optional[Appointment]:
-        return self.db.query(Appointment).filter(Appointment.id == appointment_id).first()
+    def _query(self, expand: Sequence[str] = (), loader=selectinload) -> Query:
+        query = self.db.query(Appointment)
+        for name in expand:
+            query = query.options(loader(getattr(Appointment, name)))
+        return query
+    
+    def get_by_id(self, appointment_id: UUID, expand: Sequence[str] = (), cached: bool = True) -> Optional[Appointment]:
+        query = self._query(expand, joinedload).filter(Appointment.id == appointment_id)
+        if not cached:
+            return query.populate_existing().first()
+        if expand:
+            return query.first()
+        return entity_cache.get_or_load(self.db, Appointment, "id", appointment_id, query.first)
     
-    def get_by_patient(self, patient_id: UUID) -> List[Appointment]:
-        return self.db.query(Appointment).filter(Appointment.patient_id == patient_id).all()
+    def get_by_patient(self, patient_id: UUID, expand: Sequence[str] = ()) -> List[Appointment]:
+        return self._query(expand).filter(Appointment.patient_id == patient_id).all()
     
     def get_by_doctor(self, doctor_id: UUID) -> List[Appointment]:
         return self.db.query(Appointment).filter(Appointment.doctor_id == doctor_id).all()
     
+    def get_doctor_schedule(
+        self,
+        doctor_id: UUID,
+        start: datetime,
+        end: datetime,
+        status: Optional[AppointmentStatus] = None
+    ) -> List[Row]:
+        """A doctor's appointments in [start, end) with patient names and per-day counts.
+
+        One statement: a range scan of the (doctor_id, appointment_time) index
+        joined to the patients, with the day totals computed as window functions.
+        Rows carry plain columns, so nothing is lazy loaded afterwards.
+        """
+        day = func.date(Appointment.appointment_time)
+
+        def per_day(value=None):
+            counted = 1 if value is None else case((Appointment.status == value, 1), else_=0)
+            return func.sum(counted).over(partition_by=day)
+
+        query = (
+            select(
+                Appointment.id,
+                Appointment.patient_id,
+                Appointment.appointment_time,
+                Appointment.status,
+                Appointment.notes,
+                Appointment.version,
+                User.first_name.label("patient_first_name"),
+                User.last_name.label("patient_last_name"),
+                per_day().label("day_total"),
+                per_day(AppointmentStatus.BOOKED).label("day_booked"),
+                per_day(AppointmentStatus.COMPLETED).label("day_completed"),
+                per_day(AppointmentStatus.CANCELLED).label("day_cancelled"),
+            )
+            .join(User, User.id == Appointment.patient_id)
+            .where(
+                Appointment.doctor_id == doctor_id,
+                Appointment.appointment_time >= start,
+                Appointment.appointment_time < end
+            )
+            .order_by(Appointment.appointment_time)
+        )
+        if status is not None:
+            query = query.where(Appointment.status == status)
+        return self.db.execute(query).all()
+    
     def update(self, appointment: Appointment) -> Appointment:
         self.db.commit()
         self.db.refresh(appointment)
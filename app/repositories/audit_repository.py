@@ -0,0 +1,36 @@
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from uuid import UUID
+from datetime import datetime
+from app.models.audit_event import AuditEvent
+
+
+class AuditRepository:
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def bulk_create(self, events: List[dict]) -> None:
+        # Single executemany INSERT for the whole batch, no ORM identity map overhead
+        self.db.execute(insert(AuditEvent), events)
+        self.db.commit()
+    
+    def search(
+        self,
+        user_id: Optional[UUID] = None,
+        path: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: int = 100,
+        offset: int = 0
+    ) -> List[AuditEvent]:
+        query = self.db.query(AuditEvent)
+        if user_id is not None:
+            query = query.filter(AuditEvent.user_id == user_id)
+        if path is not None:
+            query = query.filter(AuditEvent.path.startswith(path, autoescape=True))
+        if since is not None:
+            query = query.filter(AuditEvent.occurred_at >= since)
+        if until is not None:
+            query = query.filter(AuditEvent.occurred_at < until)
+        return query.order_by(AuditEvent.occurred_at.desc()).offset(offset).limit(limit).all()
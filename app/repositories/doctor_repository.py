@@ -1,8 +1,11 @@
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from uuid import UUID
+from app.core.cache import entity_cache
 from app.models.doctor_profile import DoctorProfile
 
+entity_cache.register(DoctorProfile, "user_id")
+
 
 class DoctorRepository:
     def __init__(self, db: Session):
@@ -14,8 +17,14 @@ class DoctorRepository:
         self.db.refresh(profile)
         return profile
     
-    def get_by_user_id(self, user_id: UUID) -> Optional[DoctorProfile]:
-        return self.db.query(DoctorProfile).filter(DoctorProfile.user_id == user_id).first()
+    def get_by_user_id(self, user_id: UUID, cached: bool = True) -> Optional[DoctorProfile]:
+        if not cached:
+            query = self.db.query(DoctorProfile).filter(DoctorProfile.user_id == user_id)
+            return query.populate_existing().first()
+        return entity_cache.get_or_load(
+            self.db, DoctorProfile, "user_id", user_id,
+            lambda: self.db.query(DoctorProfile).filter(DoctorProfile.user_id == user_id).first()
+        )
     
     def get_all(self) -> List[DoctorProfile]:
         return self.db.query(DoctorProfile).all()
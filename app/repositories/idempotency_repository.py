@@ -0,0 +1,51 @@
+from sqlalchemy import delete, select, tuple_
+from sqlalchemy.orm import Session
+from typing import Optional
+from uuid import UUID
+from datetime import datetime
+from app.models.idempotency_key import IdempotencyKey
+
+
+class IdempotencyRepository:
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def get(self, user_id: UUID, key: str) -> Optional[IdempotencyKey]:
+        # populate_existing: re-read the row when polling for a concurrent request to finish
+        return (
+            self.db.query(IdempotencyKey)
+            .filter(IdempotencyKey.user_id == user_id, IdempotencyKey.key == key)
+            .populate_existing()
+            .first()
+        )
+    
+    def claim(self, record: IdempotencyKey) -> None:
+        """Insert without committing; the row lock is held until the caller's transaction ends"""
+        self.db.add(record)
+        self.db.flush()
+    
+    def complete(self, record: IdempotencyKey) -> None:
+        self.db.commit()
+    
+    def delete(self, user_id: UUID, key: str) -> None:
+        self.db.execute(
+            delete(IdempotencyKey).where(IdempotencyKey.user_id == user_id, IdempotencyKey.key == key)
+        )
+        self.db.commit()
+    
+    def purge_expired(self, now: Optional[datetime] = None, limit: Optional[int] = None) -> int:
+        """Delete expired keys, at most ``limit`` of them (oldest first) when given"""
+        expired = IdempotencyKey.expires_at <= (now or datetime.utcnow())
+        if limit is None:
+            statement = delete(IdempotencyKey).where(expired)
+        else:
+            batch = (
+                select(IdempotencyKey.user_id, IdempotencyKey.key)
+                .where(expired)
+                .order_by(IdempotencyKey.expires_at)
+                .limit(limit)
+            )
+            statement = delete(IdempotencyKey).where(tuple_(IdempotencyKey.user_id, IdempotencyKey.key).in_(batch))
+        result = self.db.execute(statement)
+        self.db.commit()
+        return result.rowcount
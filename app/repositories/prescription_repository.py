@@ -1,8 +1,11 @@
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from sqlalchemy.orm import Session, Query, joinedload, selectinload
+from typing import List, Optional, Sequence
 from uuid import UUID
+from app.core.cache import entity_cache
 from app.models.prescription import Prescription
 
+entity_cache.register(Prescription, "id")
+
 
 class PrescriptionRepository:
     def __init__(self, db: Session):
@@ -14,17 +17,28 @@ class PrescriptionRepository:
         self.db.refresh(prescription)
         return prescription
     
-    def get_by_id(self, prescription_id: UUID) -> Optional[Prescription]:
-        return self.db.query(Prescription).filter(Prescription.id == prescription_id).first()
+    def _query(self, expand: Sequence[str] = (), loader=selectinload) -> Query:
+        query = self.db.query(Prescription)
+        for name in expand:
+            query = query.options(loader(getattr(Prescription, name)))
+        return query
+    
+    def get_by_id(self, prescription_id: UUID, expand: Sequence[str] = (), cached: bool = True) -> Optional[Prescription]:
+        query = self._query(expand, joinedload).filter(Prescription.id == prescription_id)
+        if not cached:
+            return query.populate_existing().first()
+        if expand:
+            return query.first()
+        return entity_cache.get_or_load(self.db, Prescription, "id", prescription_id, query.first)
     
     def get_by_appointment(self, appointment_id: UUID) -> Optional[Prescription]:
         return self.db.query(Prescription).filter(Prescription.appointment_id == appointment_id).first()
     
-    def get_by_patient(self, patient_id: UUID) -> List[Prescription]:
-        return self.db.query(Prescription).filter(Prescription.patient_id == patient_id).all()
+    def get_by_patient(self, patient_id: UUID, expand: Sequence[str] = ()) -> List[Prescription]:
+        return self._query(expand).filter(Prescription.patient_id == patient_id).all()
     
-    def get_by_doctor(self, doctor_id: UUID) -> List[Prescription]:
-        return self.db.query(Prescription).filter(Prescription.doctor_id == doctor_id).all()
+    def get_by_doctor(self, doctor_id: UUID, expand: Sequence[str] = ()) -> List[Prescription]:
+        return self._query(expand).filter(Prescription.doctor_id == doctor_id).all()
     
     def update(self, prescription: Prescription) -> Prescription:
         self.db.commit()
@@ -0,0 +1,71 @@
+from sqlalchemy import insert, select, tuple_
+from sqlalchemy.orm import Session
+from typing import Dict, List, Sequence, Set, Tuple
+from uuid import UUID
+from datetime import datetime
+from app.models.appointment import Appointment
+from app.models.appointment_reminder import AppointmentReminder
+from app.utils.constants import AppointmentStatus
+
+
+class ReminderRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def booked_between(self, start: datetime, end: datetime) -> List[Tuple[UUID, datetime]]:
+        """(id, appointment_time) of BOOKED appointments in [start, end); a range scan of the status/time index"""
+        return self.db.execute(
+            select(Appointment.id, Appointment.appointment_time)
+            .where(
+                Appointment.status == AppointmentStatus.BOOKED,
+                Appointment.appointment_time >= start,
+                Appointment.appointment_time < end
+            )
+            .order_by(Appointment.appointment_time)
+        ).all()
+
+    def changed_since(self, since: datetime) -> List[Tuple[UUID, datetime, AppointmentStatus]]:
+        """(id, appointment_time, status) of appointments created or updated since ``since``.
+
+        Filtered on updated_at alone so the planner cannot prefer the status/time
+        index, whose matching range is the whole lead period.
+        """
+        return self.db.execute(
+            select(Appointment.id, Appointment.appointment_time, Appointment.status)
+            .where(Appointment.updated_at >= since)
+        ).all()
+
+    def lock(self, appointment_ids: Sequence[UUID]) -> Dict[UUID, Appointment]:
+        """Lock the given appointments until the transaction ends.
+
+        Rows another transaction holds are skipped (SKIP LOCKED), so several
+        scheduler instances can claim from the same batch without waiting on
+        each other. A missing id means "locked elsewhere" (or deleted).
+        """
+        rows = self.db.execute(
+            select(
+                Appointment.id,
+                Appointment.patient_id,
+                Appointment.doctor_id,
+                Appointment.appointment_time,
+                Appointment.status
+            )
+            .where(Appointment.id.in_(appointment_ids))
+            .with_for_update(skip_locked=True)
+        ).all()
+        return {row.id: row for row in rows}
+
+    def sent(self, keys: Sequence[Tuple[UUID, datetime]]) -> Set[Tuple[UUID, datetime]]:
+        """Which of the (appointment_id, appointment_time) pairs already had a reminder"""
+        rows = self.db.execute(
+            select(AppointmentReminder.appointment_id, AppointmentReminder.appointment_time)
+            .where(tuple_(AppointmentReminder.appointment_id, AppointmentReminder.appointment_time).in_(keys))
+        ).all()
+        return {(row.appointment_id, row.appointment_time) for row in rows}
+
+    def record_sent(self, keys: Sequence[Tuple[UUID, datetime]], sent_at: datetime) -> None:
+        self.db.execute(insert(AppointmentReminder), [
+            {"appointment_id": appointment_id, "appointment_time": appointment_time, "sent_at": sent_at}
+            for appointment_id, appointment_time in keys
+        ])
+        self.db.commit()
@@ -1,8 +1,12 @@
 from sqlalchemy.orm import Session
 from typing import Optional
 from uuid import UUID
+from app.core.cache import entity_cache
 from app.models.user import User
 
+# Password hashes stay out of the cache, which may be a shared Redis
+entity_cache.register(User, "id", exclude=("password_hash",))
+
 
 class UserRepository:
     def __init__(self, db: Session):
@@ -14,10 +18,17 @@ class UserRepository:
         self.db.refresh(user)
         return user
     
-    def get_by_id(self, user_id: UUID) -> Optional[User]:
-        return self.db.query(User).filter(User.id == user_id).first()
+    def get_by_id(self, user_id: UUID, cached: bool = True) -> Optional[User]:
+        if not cached:
+            # populate_existing: also refresh an instance the session already holds
+            return self.db.query(User).filter(User.id == user_id).populate_existing().first()
+        return entity_cache.get_or_load(
+            self.db, User, "id", user_id,
+            lambda: self.db.query(User).filter(User.id == user_id).first()
+        )
     
     def get_by_email(self, email: str) -> Optional[User]:
+        # Not cached: login reads the password hash, which the cache never holds
         return self.db.query(User).filter(User.email == email).first()
     
     def update(self, user: User) -> User:
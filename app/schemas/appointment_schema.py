@@ -1,11 +1,14 @@
-from pydantic import BaseModel, UUID4
-from datetime import datetime
-from typing import Optional
+from pydantic import BaseModel
+from uuid import UUID
+from datetime import date, datetime
+from typing import List, Optional
+from app.schemas.common_schema import ExpandableResponse
+from app.schemas.user_schema import UserSummary
 from app.utils.constants import AppointmentStatus
 
 
 class AppointmentCreate(BaseModel):
-    doctor_id: UUID4
+    doctor_id: UUID
     appointment_time: datetime
     notes: Optional[str] = None
 
@@ -13,16 +16,44 @@ class AppointmentCreate(BaseModel):
 class AppointmentUpdate(BaseModel):
     appointment_time: Optional[datetime] = None
     notes: Optional[str] = None
+    version: Optional[int] = None  # alternative to If-Match
 
 
-class AppointmentResponse(BaseModel):
-    id: UUID4
-    patient_id: UUID4
-    doctor_id: UUID4
+class AppointmentResponse(ExpandableResponse):
+    id: UUID
+    patient_id: UUID
+    doctor_id: UUID
     appointment_time: datetime
     status: AppointmentStatus
     notes: Optional[str] = None
     created_at: datetime
-    
-    class Config:
-        from_attributes = True
+    version: int
+    patient: Optional[UserSummary] = None
+    doctor: Optional[UserSummary] = None
+
+
+class ScheduleAppointment(BaseModel):
+    id: UUID
+    patient_id: UUID
+    patient_first_name: Optional[str] = None
+    patient_last_name: Optional[str] = None
+    appointment_time: datetime
+    status: AppointmentStatus
+    notes: Optional[str] = None
+    version: int
+
+
+class ScheduleDay(BaseModel):
+    day: date
+    total: int = 0
+    booked: int = 0
+    completed: int = 0
+    cancelled: int = 0
+    appointments: List[ScheduleAppointment] = []
+
+
+class DoctorSchedule(BaseModel):
+    doctor_id: UUID
+    start_date: date
+    end_date: date
+    days: List[ScheduleDay]
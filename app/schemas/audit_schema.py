@@ -0,0 +1,28 @@
+from pydantic import BaseModel
+from uuid import UUID
+from datetime import datetime
+from typing import Optional
+
+
+class AuditEventResponse(BaseModel):
+    id: UUID
+    user_id: Optional[UUID] = None
+    method: str
+    path: str
+    status_code: Optional[int] = None
+    client_ip: Optional[str] = None
+    duration_ms: Optional[float] = None
+    occurred_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+
+class AuditSinkStats(BaseModel):
+    queued: int
+    capacity: int
+    enqueued: int
+    written: int
+    dropped: int
+    failed: int
+    batches: int
@@ -0,0 +1,11 @@
+from pydantic import BaseModel
+
+
+class CacheStats(BaseModel):
+    backend: str
+    entries: int
+    hits: int
+    misses: int
+    hit_rate: float
+    invalidations: int
+    errors: int
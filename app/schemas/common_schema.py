@@ -0,0 +1,28 @@
+from pydantic import BaseModel, model_validator
+from sqlalchemy import inspect
+
+
+class ExpandableResponse(BaseModel):
+    """Response schema whose relationship fields are only filled when eager loaded.
+
+    Relationships that were not requested via ``?expand=`` are left unset instead of
+    being lazy loaded (one query per row) during serialization.
+    """
+
+    @model_validator(mode="before")
+    @classmethod
+    def skip_unloaded_relationships(cls, data):
+        state = inspect(data, raiseerr=False)
+        if state is None or not hasattr(state, "mapper"):
+            return data
+
+        unloaded = state.unloaded
+        relationships = state.mapper.relationships.keys()
+        return {
+            name: getattr(data, name)
+            for name in cls.model_fields
+            if hasattr(data, name) and not (name in relationships and name in unloaded)
+        }
+
+    class Config:
+        from_attributes = True
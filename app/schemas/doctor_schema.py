@@ -1,4 +1,5 @@
-from pydantic import BaseModel, UUID4
+from pydantic import BaseModel
+from uuid import UUID
 from typing import Optional
 from datetime import time
 
@@ -15,15 +16,17 @@ class DoctorProfileUpdate(BaseModel):
     available_from: Optional[time] = None
     available_to: Optional[time] = None
     location: Optional[str] = None
+    version: Optional[int] = None  # alternative to If-Match
 
 
 class DoctorProfileResponse(BaseModel):
-    id: UUID4
-    user_id: UUID4
+    id: UUID
+    user_id: UUID
     specialization: str
     available_from: Optional[time] = None
     available_to: Optional[time] = None
     location: Optional[str] = None
+    version: int
     
     class Config:
         from_attributes = True
@@ -1,6 +1,10 @@
-from pydantic import BaseModel, UUID4
+from pydantic import BaseModel
+from uuid import UUID
 from typing import List, Optional
 from datetime import datetime
+from app.schemas.appointment_schema import AppointmentResponse
+from app.schemas.common_schema import ExpandableResponse
+from app.schemas.user_schema import UserSummary
 
 
 class Medicine(BaseModel):
@@ -11,7 +15,7 @@ class Medicine(BaseModel):
 
 
 class PrescriptionCreate(BaseModel):
-    appointment_id: UUID4
+    appointment_id: UUID
     notes: Optional[str] = None
     medicines: List[Medicine]
 
@@ -19,16 +23,18 @@ class PrescriptionCreate(BaseModel):
 class PrescriptionUpdate(BaseModel):
     notes: Optional[str] = None
     medicines: Optional[List[Medicine]] = None
+    version: Optional[int] = None  # alternative to If-Match
 
 
-class PrescriptionResponse(BaseModel):
-    id: UUID4
-    appointment_id: UUID4
-    doctor_id: UUID4
-    patient_id: UUID4
+class PrescriptionResponse(ExpandableResponse):
+    id: UUID
+    appointment_id: UUID
+    doctor_id: UUID
+    patient_id: UUID
     notes: Optional[str] = None
     medicines: List[dict]
     created_at: datetime
-    
-    class Config:
-        from_attributes = True
+    version: int
+    appointment: Optional[AppointmentResponse] = None
+    doctor: Optional[UserSummary] = None
+    patient: Optional[UserSummary] = None
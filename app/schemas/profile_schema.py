@@ -0,0 +1,26 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import List
+
+
+class FrameSamples(BaseModel):
+    frame: str
+    samples: int
+
+
+class ProfileSummary(BaseModel):
+    id: str
+    method: str
+    path: str
+    status_code: int
+    duration_ms: float
+    trigger: str
+    captured_at: datetime
+    sample_count: int
+
+
+class ProfileDetail(ProfileSummary):
+    interval_ms: float
+    top_self: List[FrameSamples]
+    top_total: List[FrameSamples]
+    folded: List[str]
@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+
+
+class ReminderSchedulerStats(BaseModel):
+    running: bool
+    pending: int
+    scanned_until: Optional[datetime] = None
+    scans: int
+    sent: int
+    dropped: int
+    skipped_locked: int
+    failed: int
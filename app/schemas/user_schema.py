@@ -1,11 +1,12 @@
-from pydantic import BaseModel, EmailStr, UUID4
+from pydantic import BaseModel, EmailStr
+from uuid import UUID
 from typing import Optional
 from datetime import datetime
 from app.utils.constants import UserRole
 
 
 class UserResponse(BaseModel):
-    id: UUID4
+    id: UUID
     email: EmailStr
     role: UserRole
     first_name: str
@@ -16,6 +17,16 @@ class UserResponse(BaseModel):
         from_attributes = True
 
 
+class UserSummary(BaseModel):
+    id: UUID
+    role: UserRole
+    first_name: str
+    last_name: str
+    
+    class Config:
+        from_attributes = True
+
+
 class UserUpdate(BaseModel):
     first_name: Optional[str] = None
     last_name: Optional[str] = None
@@ -1,14 +1,20 @@
 from sqlalchemy.orm import Session
 from sqlalchemy import func
+from typing import List, Optional
+from uuid import UUID
+from datetime import datetime
 from app.models.user import User
 from app.models.appointment import Appointment
 from app.models.prescription import Prescription
+from app.models.audit_event import AuditEvent
+from app.repositories.audit_repository import AuditRepository
 from app.utils.constants import UserRole, AppointmentStatus
 
 
 class AdminService:
     def __init__(self, db: Session):
         self.db = db
+        self.audit_repository = AuditRepository(db)
     
     def get_analytics(self) -> dict:
         # Count users by role
@@ -48,3 +54,14 @@ class AdminService:
                 "total_prescriptions": total_prescriptions
             }
         }
+    
+    def get_audit_events(
+        self,
+        user_id: Optional[UUID] = None,
+        path: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: int = 100,
+        offset: int = 0
+    ) -> List[AuditEvent]:
+        return self.audit_repository.search(user_id, path, since, until, limit, offset)
@@ -1,13 +1,17 @@
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional, Sequence
 from uuid import UUID
-from datetime import datetime
+from datetime import date, datetime, time, timedelta
 from app.models.appointment import Appointment
 from app.repositories.appointment_repository import AppointmentRepository
 from app.schemas.appointment_schema import AppointmentCreate, AppointmentUpdate
 from app.utils.constants import AppointmentStatus
+from app.utils.validators import check_version
 from fastapi import HTTPException, status
 
+# Longest range GET /doctors/me/schedule serves: a six-week month view
+MAX_SCHEDULE_DAYS = 42
+
 
 class AppointmentService:
     def __init__(self, db: Session):
@@ -23,8 +27,8 @@ class AppointmentService:
         )
         return self.repository.create(appointment)
     
-    def get_appointment(self, appointment_id: UUID) -> Appointment:
-        appointment = self.repository.get_by_id(appointment_id)
+    def get_appointment(self, appointment_id: UUID, expand: Sequence[str] = (), cached: bool = True) -> Appointment:
+        appointment = self.repository.get_by_id(appointment_id, expand, cached)
         if not appointment:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -32,17 +36,65 @@ class AppointmentService:
             )
         return appointment
     
-    def get_patient_appointments(self, patient_id: UUID) -> List[Appointment]:
-        return self.repository.get_by_patient(patient_id)
+    def get_patient_appointments(self, patient_id: UUID, expand: Sequence[str] = ()) -> List[Appointment]:
+        return self.repository.get_by_patient(patient_id, expand)
+    
+    def get_doctor_schedule(
+        self,
+        doctor_id: UUID,
+        start_date: date,
+        end_date: date,
+        appointment_status: Optional[AppointmentStatus] = None
+    ) -> dict:
+        """Appointments from ``start_date`` to ``end_date`` (inclusive, UTC days), one bucket per day"""
+        day_count = (end_date - start_date).days + 1
+        if day_count < 1 or day_count > MAX_SCHEDULE_DAYS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"The schedule range must cover 1 to {MAX_SCHEDULE_DAYS} days"
+            )
+        rows = self.repository.get_doctor_schedule(
+            doctor_id,
+            datetime.combine(start_date, time()),
+            datetime.combine(end_date + timedelta(days=1), time()),
+            appointment_status
+        )
+        days = {
+            start_date + timedelta(days=offset): {"day": start_date + timedelta(days=offset), "appointments": []}
+            for offset in range(day_count)
+        }
+        for row in rows:
+            bucket = days[row.appointment_time.date()]
+            if not bucket["appointments"]:
+                bucket.update(
+                    total=row.day_total,
+                    booked=row.day_booked,
+                    completed=row.day_completed,
+                    cancelled=row.day_cancelled
+                )
+            bucket["appointments"].append(dict(row._mapping))
+        return {
+            "doctor_id": doctor_id,
+            "start_date": start_date,
+            "end_date": end_date,
+            "days": list(days.values())
+        }
     
-    def update_appointment(self, appointment_id: UUID, patient_id: UUID, update_data: AppointmentUpdate) -> Appointment:
-        appointment = self.get_appointment(appointment_id)
+    def update_appointment(
+        self,
+        appointment_id: UUID,
+        patient_id: UUID,
+        update_data: AppointmentUpdate,
+        expected_version: Optional[int] = None
+    ) -> Appointment:
+        appointment = self.get_appointment(appointment_id, cached=False)
         
         if appointment.patient_id != patient_id:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Not authorized to update this appointment"
             )
+        check_version(appointment.version, expected_version)
         
         if update_data.appointment_time:
             appointment.appointment_time = update_data.appointment_time
@@ -52,7 +104,7 @@ class AppointmentService:
         return self.repository.update(appointment)
     
     def cancel_appointment(self, appointment_id: UUID, patient_id: UUID) -> Appointment:
-        appointment = self.get_appointment(appointment_id)
+        appointment = self.get_appointment(appointment_id, cached=False)
         
         if appointment.patient_id != patient_id:
             raise HTTPException(
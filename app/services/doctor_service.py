@@ -1,10 +1,11 @@
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 from fastapi import HTTPException, status
 from app.models.doctor_profile import DoctorProfile
 from app.repositories.doctor_repository import DoctorRepository
 from app.schemas.doctor_schema import DoctorProfileCreate, DoctorProfileUpdate
+from app.utils.validators import check_version
 
 
 class DoctorService:
@@ -30,8 +31,8 @@ class DoctorService:
         
         return self.repository.create(profile)
     
-    def get_profile(self, user_id: UUID) -> DoctorProfile:
-        profile = self.repository.get_by_user_id(user_id)
+    def get_profile(self, user_id: UUID, cached: bool = True) -> DoctorProfile:
+        profile = self.repository.get_by_user_id(user_id, cached)
         if not profile:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -42,8 +43,14 @@ class DoctorService:
     def get_all_doctors(self) -> List[DoctorProfile]:
         return self.repository.get_all()
     
-    def update_profile(self, user_id: UUID, update_data: DoctorProfileUpdate) -> DoctorProfile:
-        profile = self.get_profile(user_id)
+    def update_profile(
+        self,
+        user_id: UUID,
+        update_data: DoctorProfileUpdate,
+        expected_version: Optional[int] = None
+    ) -> DoctorProfile:
+        profile = self.get_profile(user_id, cached=False)
+        check_version(profile.version, expected_version)
         
         if update_data.specialization is not None:
             profile.specialization = update_data.specialization
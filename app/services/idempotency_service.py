@@ -0,0 +1,124 @@
+import hashlib
+import json
+import time
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from typing import Any, Callable, Optional, Type, Union
+from uuid import UUID
+from datetime import datetime, timedelta
+from fastapi import HTTPException, Response, status
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+from app.core.config import settings
+from app.models.idempotency_key import IdempotencyKey
+from app.repositories.idempotency_repository import IdempotencyRepository
+
+REPLAY_HEADER = "Idempotent-Replayed"
+
+
+class IdempotencyService:
+    """Runs a create at most once per ``Idempotency-Key`` and replays its response to retries.
+
+    The key row is inserted in the same transaction as the create, so a concurrent
+    duplicate blocks on the key's unique index until the first request commits or
+    rolls back. A duplicate that arrives after the row is committed but before the
+    response is stored waits up to ``IDEMPOTENCY_WAIT_SECONDS`` for it.
+
+    A failed create frees its key only if nothing was committed. Once the create
+    has committed, the key stays claimed even if storing the response fails, so
+    a retry gets a 409 instead of repeating the create.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        ttl_seconds: float = settings.IDEMPOTENCY_TTL_SECONDS,
+        wait_seconds: float = settings.IDEMPOTENCY_WAIT_SECONDS
+    ):
+        self.db = db
+        self.repository = IdempotencyRepository(db)
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self.wait_seconds = wait_seconds
+
+    def run(
+        self,
+        key: Optional[str],
+        user_id: UUID,
+        endpoint: str,
+        payload: BaseModel,
+        response_model: Type[BaseModel],
+        status_code: int,
+        create: Callable[[], Any]
+    ):
+        """Return ``create()``'s result, or a stored response when ``key`` was already used"""
+        if key is None:
+            return create()
+
+        request_hash = hashlib.sha256(f"{endpoint}\n{payload.model_dump_json()}".encode()).hexdigest()
+        record = self._claim(user_id, key, request_hash)
+        if isinstance(record, Response):
+            return record
+
+        try:
+            result = create()
+            record.status_code = status_code
+            # Same body the route's response_model produces; replays return it verbatim
+            record.response_body = json.dumps(
+                jsonable_encoder(response_model.model_validate(result), exclude_unset=True),
+                separators=(",", ":")
+            )
+            self.repository.complete(record)
+        except Exception:
+            # Undoes the key's uncommitted insert, which frees it for a retry. A key that
+            # create() already committed along with its row is kept: deleting it would let
+            # the retry create a second row
+            self.db.rollback()
+            raise
+        return result
+
+    def _claim(self, user_id: UUID, key: str, request_hash: str) -> Union[IdempotencyKey, Response]:
+        """Insert the key's row, or return the stored response for a completed request"""
+        deadline = time.monotonic() + self.wait_seconds
+        while True:
+            record = self.repository.get(user_id, key)
+            if record is not None and record.expires_at <= datetime.utcnow():
+                self.repository.delete(user_id, key)
+                record = None
+
+            if record is None:
+                now = datetime.utcnow()
+                try:
+                    record = IdempotencyKey(
+                        user_id=user_id,
+                        key=key,
+                        request_hash=request_hash,
+                        created_at=now,
+                        expires_at=now + self.ttl
+                    )
+                    self.repository.claim(record)
+                    return record
+                except IntegrityError:
+                    # A concurrent request claimed the key first; look again
+                    self.db.rollback()
+                    continue
+
+            if record.request_hash != request_hash:
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail="Idempotency-Key was already used for a different request"
+                )
+            if record.status_code is not None:
+                return Response(
+                    content=record.response_body,
+                    status_code=record.status_code,
+                    media_type="application/json",
+                    headers={REPLAY_HEADER: "true"}
+                )
+            if time.monotonic() >= deadline:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="A request with this Idempotency-Key is still in progress"
+                )
+            # End the read transaction so the next look sees the other request's commit
+            self.db.rollback()
+            time.sleep(0.05)
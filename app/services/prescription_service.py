@@ -1,5 +1,5 @@
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional, Sequence
 from uuid import UUID
 from fastapi import HTTPException, status
 from app.models.prescription import Prescription
@@ -8,6 +8,7 @@ from app.repositories.prescription_repository import PrescriptionRepository
 from app.repositories.appointment_repository import AppointmentRepository
 from app.schemas.prescription_schema import PrescriptionCreate, PrescriptionUpdate
 from app.utils.constants import AppointmentStatus
+from app.utils.validators import check_version
 
 
 class PrescriptionService:
@@ -17,7 +18,8 @@ class PrescriptionService:
     
     def create_prescription(self, doctor_id: UUID, prescription_data: PrescriptionCreate) -> Prescription:
         # Verify appointment exists and belongs to the doctor
-        appointment = self.appointment_repository.get_by_id(prescription_data.appointment_id)
+        # Uncached: the appointment is updated below, which checks its version
+        appointment = self.appointment_repository.get_by_id(prescription_data.appointment_id, cached=False)
         if not appointment:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -30,6 +32,12 @@ class PrescriptionService:
                 detail="Not authorized to create prescription for this appointment"
             )
         
+        if appointment.status == AppointmentStatus.CANCELLED:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cannot prescribe for a cancelled appointment"
+            )
+        
         # Check if prescription already exists
         existing = self.repository.get_by_appointment(prescription_data.appointment_id)
         if existing:
@@ -55,8 +63,8 @@ class PrescriptionService:
         
         return self.repository.create(prescription)
     
-    def get_prescription(self, prescription_id: UUID) -> Prescription:
-        prescription = self.repository.get_by_id(prescription_id)
+    def get_prescription(self, prescription_id: UUID, expand: Sequence[str] = (), cached: bool = True) -> Prescription:
+        prescription = self.repository.get_by_id(prescription_id, expand, cached)
         if not prescription:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -64,20 +72,27 @@ class PrescriptionService:
             )
         return prescription
     
-    def get_patient_prescriptions(self, patient_id: UUID) -> List[Prescription]:
-        return self.repository.get_by_patient(patient_id)
+    def get_patient_prescriptions(self, patient_id: UUID, expand: Sequence[str] = ()) -> List[Prescription]:
+        return self.repository.get_by_patient(patient_id, expand)
     
-    def get_doctor_prescriptions(self, doctor_id: UUID) -> List[Prescription]:
-        return self.repository.get_by_doctor(doctor_id)
+    def get_doctor_prescriptions(self, doctor_id: UUID, expand: Sequence[str] = ()) -> List[Prescription]:
+        return self.repository.get_by_doctor(doctor_id, expand)
     
-    def update_prescription(self, prescription_id: UUID, doctor_id: UUID, update_data: PrescriptionUpdate) -> Prescription:
-        prescription = self.get_prescription(prescription_id)
+    def update_prescription(
+        self,
+        prescription_id: UUID,
+        doctor_id: UUID,
+        update_data: PrescriptionUpdate,
+        expected_version: Optional[int] = None
+    ) -> Prescription:
+        prescription = self.get_prescription(prescription_id, cached=False)
         
         if prescription.doctor_id != doctor_id:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Not authorized to update this prescription"
             )
+        check_version(prescription.version, expected_version)
         
         if update_data.notes is not None:
             prescription.notes = update_data.notes
@@ -10,8 +10,8 @@ class UserService:
     def __init__(self, db: Session):
         self.repository = UserRepository(db)
     
-    def get_user_profile(self, user_id: UUID) -> User:
-        user = self.repository.get_by_id(user_id)
+    def get_user_profile(self, user_id: UUID, cached: bool = True) -> User:
+        user = self.repository.get_by_id(user_id, cached)
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -20,7 +20,8 @@ class UserService:
         return user
     
     def update_user_profile(self, user_id: UUID, update_data: UserUpdate) -> User:
-        user = self.get_user_profile(user_id)
+        # Uncached, so the version the UPDATE checks is the stored one
+        user = self.get_user_profile(user_id, cached=False)
         
         if update_data.first_name is not None:
             user.first_name = update_data.first_name
@@ -11,3 +11,8 @@ class AppointmentStatus(str, Enum):
     BOOKED = "booked"
     COMPLETED = "completed"
     CANCELLED = "cancelled"
+
+
+# Relationships that may be eager loaded through the ?expand= query parameter
+APPOINTMENT_EXPANSIONS = ("patient", "doctor")
+PRESCRIPTION_EXPANSIONS = ("appointment", "patient", "doctor")
@@ -0,0 +1,39 @@
+import os
+import threading
+import time
+import uuid
+
+_lock = threading.Lock()
+_last_ms = 0
+_counter = 0
+
+
+def uuid7() -> uuid.UUID:
+    """Time-ordered UUID (RFC 9562 version 7), increasing within this process.
+
+    Layout: 48-bit Unix time in milliseconds, version, a 12-bit counter, variant
+    and 62 random bits. The counter starts at a random value below 2048 each
+    millisecond and is incremented for every further id in that millisecond; when
+    it runs out, or the clock steps back, the timestamp is carried forward instead.
+    New rows therefore land at the right-hand edge of the primary key index.
+    """
+    global _last_ms, _counter
+    random_bits = int.from_bytes(os.urandom(10), "big")
+    now_ms = time.time_ns() // 1_000_000
+    with _lock:
+        if now_ms > _last_ms:
+            _last_ms = now_ms
+            _counter = random_bits >> 69  # 11 bits
+        else:
+            _counter += 1
+            if _counter > 0xFFF:
+                _last_ms += 1
+                _counter = random_bits >> 69
+        timestamp, counter = _last_ms, _counter
+    return uuid.UUID(int=(
+        timestamp << 80
+        | 0x7 << 76
+        | counter << 64
+        | 0b10 << 62
+        | random_bits & 0x3FFF_FFFF_FFFF_FFFF
+    ))
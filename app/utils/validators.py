@@ -1,5 +1,5 @@
 import re
-from typing import Optional
+from typing import Iterable, Optional, Tuple
 from fastapi import HTTPException, status
 
 
@@ -61,3 +61,53 @@ def sanitize_input(text: Optional[str]) -> Optional[str]:
             )
     
     return text.strip()
+
+
+def parse_expand(expand: Optional[str], allowed: Iterable[str]) -> Tuple[str, ...]:
+    """Parse a comma separated ?expand= value against the allowed relationship names"""
+    if not expand:
+        return ()
+    
+    requested = tuple(dict.fromkeys(name.strip() for name in expand.split(",") if name.strip()))
+    invalid = [name for name in requested if name not in allowed]
+    if invalid:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid expand value(s): {', '.join(invalid)}. Allowed: {', '.join(allowed)}"
+        )
+    
+    return requested
+
+
+def parse_if_match(if_match: Optional[str], fallback: Optional[int] = None) -> Optional[int]:
+    """Entity version from an ``If-Match`` header (``"3"`` or ``W/"3"``).
+
+    Update endpoints take the version from the client's last read, as ``If-Match``
+    or as ``version`` in the body, and answer 409 instead of overwriting a change
+    made since. Without the header, ``fallback`` (the body's version) is used;
+    ``*`` matches any version.
+    """
+    if not if_match:
+        return fallback
+    if if_match.strip() == "*":
+        return None
+    
+    tag = if_match.split(",")[0].strip()
+    if tag.startswith("W/"):
+        tag = tag[2:]
+    try:
+        return int(tag.strip('"'))
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="If-Match must be an entity version, e.g. \"3\""
+        )
+
+
+def check_version(current: int, expected: Optional[int]) -> None:
+    """Reject an update made against a version other than the current one"""
+    if expected is not None and expected != current:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Resource has been modified (current version {current}); reload and retry"
+        )
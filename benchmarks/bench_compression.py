@@ -0,0 +1,135 @@
+"""CPU cost vs bytes saved for response compression on realistic API payloads.
+
+Payloads are serialized the way FastAPI's JSONResponse does. Each is compressed
+with the encoders CompressionMiddleware uses, at several levels, one-shot and
+streamed (flushed after every ``--chunk-size`` bytes, as for StreamingResponse):
+
+* ``prescriptions``  GET /prescriptions/ with expanded doctor/patient and nested medicines
+* ``users``          GET /users/ as an admin sees it
+* ``export``         a CSV export, streamed
+
+Brotli rows appear only when the brotli package is installed.
+
+    python -m benchmarks.bench_compression --rows 500
+"""
+import argparse
+import json
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from app.core.compression import BrotliEncoder, GzipEncoder, brotli
+
+MEDICINES = [
+    ("Amoxicillin", "500mg", "7 days"), ("Ibuprofen", "400mg", "5 days"), ("Metformin", "850mg", "90 days"),
+    ("Lisinopril", "10mg", "30 days"), ("Atorvastatin", "20mg", "90 days"), ("Omeprazole", "20mg", "14 days"),
+    ("Salbutamol", "100mcg", "as needed"), ("Cetirizine", "10mg", "10 days"),
+]
+FIRST_NAMES = ["Ana", "Ben", "Chen", "Dara", "Eli", "Fatima", "Goran", "Hana", "Ivan", "Jun", "Kofi", "Lena"]
+LAST_NAMES = ["Silva", "Okafor", "Nguyen", "Schmidt", "Haddad", "Kowalski", "Tanaka", "Moreau", "Rossi"]
+
+
+def user(role: str) -> dict:
+    first, last = random.choice(FIRST_NAMES), random.choice(LAST_NAMES)
+    return {
+        "id": str(uuid.uuid4()),
+        "email": f"{first}.{last}.{uuid.uuid4().hex[:6]}@example.com".lower(),
+        "role": role,
+        "first_name": first,
+        "last_name": last,
+        "created_at": (datetime(2024, 1, 1) + timedelta(minutes=random.randint(0, 500000))).isoformat(),
+    }
+
+
+def prescriptions(rows: int) -> list:
+    doctors = [user("doctor") for _ in range(20)]
+    result = []
+    for _ in range(rows):
+        doctor, patient = random.choice(doctors), user("patient")
+        result.append({
+            "id": str(uuid.uuid4()),
+            "appointment_id": str(uuid.uuid4()),
+            "doctor_id": doctor["id"],
+            "patient_id": patient["id"],
+            "notes": random.choice([None, "Take with food", "Review in two weeks", "Avoid alcohol"]),
+            "medicines": [
+                {"name": name, "dosage": dosage, "duration": duration}
+                for name, dosage, duration in random.sample(MEDICINES, random.randint(1, 4))
+            ],
+            "created_at": patient["created_at"],
+            "doctor": {key: doctor[key] for key in ("id", "role", "first_name", "last_name")},
+            "patient": {key: patient[key] for key in ("id", "role", "first_name", "last_name")},
+        })
+    return result
+
+
+def export_csv(rows: int) -> bytes:
+    lines = ["id,patient,doctor,appointment_time,status"]
+    for _ in range(rows):
+        patient, doctor = user("patient"), user("doctor")
+        lines.append(
+            f"{uuid.uuid4()},{patient['first_name']} {patient['last_name']},"
+            f"Dr {doctor['last_name']},{patient['created_at']},{random.choice(['booked', 'completed', 'cancelled'])}"
+        )
+    return ("\n".join(lines) + "\n").encode()
+
+
+def render(content) -> bytes:
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode()
+
+
+def compress(encoder_class, level: int, payload: bytes, chunk_size: int) -> bytes:
+    encoder = encoder_class(level)
+    if not chunk_size:
+        return encoder.compress(payload) + encoder.finish()
+    parts = []
+    for offset in range(0, len(payload), chunk_size):
+        parts.append(encoder.compress(payload[offset:offset + chunk_size]) + encoder.flush())
+    parts.append(encoder.finish())
+    return b"".join(parts)
+
+
+def measure(encoder_class, level: int, payload: bytes, chunk_size: int, min_seconds: float):
+    iterations = 0
+    start = time.process_time()
+    while True:
+        compressed = compress(encoder_class, level, payload, chunk_size)
+        iterations += 1
+        elapsed = time.process_time() - start
+        if elapsed >= min_seconds:
+            return len(compressed), elapsed / iterations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=500, help="Rows per payload")
+    parser.add_argument("--chunk-size", type=int, default=4096, help="Bytes per streamed chunk")
+    parser.add_argument("--min-seconds", type=float, default=0.5, help="CPU time spent per measurement")
+    args = parser.parse_args()
+
+    random.seed(42)
+    payloads = {
+        "prescriptions": (render(prescriptions(args.rows)), 0),
+        "users": (render([user(random.choice(["patient", "doctor"])) for _ in range(args.rows)]), 0),
+        "export": (export_csv(args.rows), args.chunk_size),
+    }
+    encoders = [(GzipEncoder, level) for level in (1, 6, 9)]
+    if brotli is not None:
+        encoders += [(BrotliEncoder, level) for level in (1, 4, 9, 11)]
+
+    print(f"{'payload':<18} {'encoding':<10} {'raw KB':>8} {'out KB':>8} {'ratio':>6} {'saved %':>8} {'CPU ms':>8} {'MB/s':>8}")
+    for name, (payload, chunk_size) in payloads.items():
+        for streamed in sorted({0, chunk_size}):
+            label = name + (" (streamed)" if streamed else "")
+            for encoder_class, level in encoders:
+                size, seconds = measure(encoder_class, level, payload, streamed, args.min_seconds)
+                print(
+                    f"{label:<18} {encoder_class.encoding + '-' + str(level):<10} {len(payload) / 1024:>8.1f} "
+                    f"{size / 1024:>8.1f} {len(payload) / size:>6.1f} {100 - size * 100 / len(payload):>8.1f} "
+                    f"{seconds * 1000:>8.3f} {len(payload) / seconds / 1e6:>8.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""End-to-end latency of building the dashboard: sequential client calls vs the gateway.
+
+The frontend used to build the patient dashboard with three calls in a row:
+validate the token with auth-service, then GET /appointments, then
+GET /prescriptions. Each backend call re-validates the token with auth-service.
+The gateway authenticates once and fetches both lists concurrently:
+
+* ``sequential``       the three client calls one after another
+* ``gateway``          GET /dashboard with ``Cache-Control: no-cache`` (always fans out)
+* ``gateway (cached)`` GET /dashboard, served from the gateway's short-lived cache
+
+Runs against the compose stack (or local instances on other ports):
+
+    docker-compose -f docker-compose.microservices.yml up -d --build
+    python -m benchmarks.bench_gateway --iterations 300 --appointments 20
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta
+
+import httpx
+
+PASSWORD = "BenchPass123"
+
+
+async def register_and_login(client: httpx.AsyncClient, auth_url: str, role: str) -> dict:
+    email = f"bench-{role}-{uuid.uuid4().hex[:12]}@example.com"
+    await client.post(f"{auth_url}/auth/register", json={
+        "email": email, "password": PASSWORD, "role": role, "first_name": "Bench", "last_name": role.title()
+    })
+    response = await client.post(f"{auth_url}/auth/login", json={"email": email, "password": PASSWORD})
+    response.raise_for_status()
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    validated = await client.post(f"{auth_url}/auth/validate-token", headers=headers)
+    return {"user_id": validated.json()["user_id"], "headers": headers}
+
+
+async def seed(client: httpx.AsyncClient, args) -> dict:
+    doctor = await register_and_login(client, args.auth_url, "doctor")
+    patient = await register_and_login(client, args.auth_url, "patient")
+    for day in range(args.appointments):
+        booked = await client.post(f"{args.appointment_url}/appointments", json={
+            "doctor_id": doctor["user_id"],
+            "appointment_time": (datetime.utcnow() + timedelta(days=day - args.appointments // 2)).isoformat(),
+        }, headers=patient["headers"])
+        booked.raise_for_status()
+        if day % 2 == 0:
+            await client.post(f"{args.prescription_url}/prescriptions", json={
+                "appointment_id": booked.json()["id"],
+                "medicines": [{"name": "Amoxicillin", "dosage": "500mg", "duration": "7 days"}],
+            }, headers=doctor["headers"])
+    return patient
+
+
+async def measure(name: str, build, iterations: int, concurrency: int) -> None:
+    latencies = []
+    remaining = iterations
+
+    async def worker():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            start = time.perf_counter()
+            await build()
+            latencies.append(time.perf_counter() - start)
+
+    await build()  # warm up connections (and the gateway cache)
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    print(
+        f"{name:<18} {statistics.median(latencies) * 1000:>8.2f} {latencies[int(len(latencies) * 0.95) - 1] * 1000:>8.2f} "
+        f"{statistics.mean(latencies) * 1000:>8.2f} {len(latencies) / elapsed:>9.1f}"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--auth-url", default="http://localhost:8001")
+    parser.add_argument("--appointment-url", default="http://localhost:8002")
+    parser.add_argument("--prescription-url", default="http://localhost:8003")
+    parser.add_argument("--gateway-url", default="http://localhost:8000")
+    parser.add_argument("--iterations", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=1, help="Dashboards built at the same time")
+    parser.add_argument("--appointments", type=int, default=20, help="Appointments seeded for the patient")
+    args = parser.parse_args()
+
+    limits = httpx.Limits(max_connections=max(args.concurrency * 3, 10))
+    async with httpx.AsyncClient(timeout=30, limits=limits) as client:
+        patient = await seed(client, args)
+        headers = patient["headers"]
+
+        async def sequential():
+            (await client.post(f"{args.auth_url}/auth/validate-token", headers=headers)).raise_for_status()
+            (await client.get(f"{args.appointment_url}/appointments", headers=headers)).raise_for_status()
+            (await client.get(f"{args.prescription_url}/prescriptions", headers=headers)).raise_for_status()
+
+        async def gateway_fresh():
+            response = await client.get(
+                f"{args.gateway_url}/dashboard", headers={**headers, "Cache-Control": "no-cache"}
+            )
+            assert not response.json()["partial"], response.json()["errors"]
+
+        async def gateway_cached():
+            (await client.get(f"{args.gateway_url}/dashboard", headers=headers)).raise_for_status()
+
+        print(f"{args.iterations} dashboards, concurrency {args.concurrency}, {args.appointments} appointments")
+        print(f"{'mode':<18} {'p50 ms':>8} {'p95 ms':>8} {'mean ms':>8} {'dash/s':>9}")
+        await measure("sequential", sequential, args.iterations, args.concurrency)
+        await measure("gateway", gateway_fresh, args.iterations, args.concurrency)
+        await measure("gateway (cached)", gateway_cached, args.iterations, args.concurrency)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
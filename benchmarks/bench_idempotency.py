@@ -0,0 +1,99 @@
+"""Cost of client retries on POST /appointments/ with and without Idempotency-Key.
+
+A patient books ``--bookings`` appointments, and every booking is sent
+``--retries`` extra times, as a flaky mobile connection would. Each mode
+reports requests/second, the statements run per request, and how many
+appointment rows were created:
+
+* ``no key``          every retry books again (duplicates)
+* ``idempotency key`` retries replay the stored response without touching the appointment tables
+* ``concurrent``      the copies of a booking are sent at the same time from ``--threads`` threads
+
+Runs in-process against the app's configured DATABASE_URL (use a scratch database).
+
+    python -m benchmarks.bench_idempotency --bookings 200 --retries 3
+"""
+import argparse
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.core.database import engine
+from app.main import app
+
+client = TestClient(app)
+
+
+def register_and_login(role: str) -> tuple:
+    email = f"bench-{role}-{uuid.uuid4().hex[:12]}@example.com"
+    response = client.post("/auth/register", json={
+        "email": email, "password": "BenchPass123", "role": role, "first_name": "Bench", "last_name": role.title()
+    })
+    token = client.post("/auth/login", json={"email": email, "password": "BenchPass123"}).json()["access_token"]
+    return response.json()["id"], {"Authorization": f"Bearer {token}"}
+
+
+class StatementCounter:
+    def __init__(self):
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._count)
+
+    def _count(self, *args):
+        self.count += 1
+
+
+def run(mode: str, args, doctor_id: str, counter: StatementCounter) -> None:
+    _, headers = register_and_login("patient")
+    requests = []
+    for booking in range(args.bookings):
+        body = {
+            "doctor_id": doctor_id,
+            "appointment_time": (datetime.utcnow() + timedelta(days=1, minutes=booking)).isoformat(),
+        }
+        key_headers = headers if mode == "no key" else {**headers, "Idempotency-Key": str(uuid.uuid4())}
+        requests.append([(key_headers, body)] * (args.retries + 1))
+
+    def send(request: tuple):
+        return client.post("/appointments/", headers=request[0], json=request[1])
+
+    statements = counter.count
+    start = time.perf_counter()
+    if mode == "concurrent":
+        with ThreadPoolExecutor(args.threads) as pool:
+            for copies in requests:
+                assert all(response.status_code in (201, 409) for response in pool.map(send, copies))
+    else:
+        for copies in requests:
+            for request in copies:
+                assert send(request).status_code == 201
+    elapsed = time.perf_counter() - start
+
+    total = args.bookings * (args.retries + 1)
+    created = len(client.get("/appointments/", headers=headers).json())
+    print(
+        f"{mode:<16} {total / elapsed:>9.1f} {(counter.count - statements) / total:>10.1f} "
+        f"{created:>9} {args.bookings:>9}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bookings", type=int, default=200)
+    parser.add_argument("--retries", type=int, default=3, help="Extra copies sent per booking")
+    parser.add_argument("--threads", type=int, default=4)
+    args = parser.parse_args()
+
+    doctor_id, _ = register_and_login("doctor")
+    counter = StatementCounter()
+    print(f"{args.bookings} bookings, each sent {args.retries + 1} times")
+    print(f"{'mode':<16} {'req/s':>9} {'stmts/req':>10} {'created':>9} {'intended':>9}")
+    for mode in ("no key", "idempotency key", "concurrent"):
+        run(mode, args, doctor_id, counter)
+
+
+if __name__ == "__main__":
+    main()
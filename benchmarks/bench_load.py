@@ -0,0 +1,314 @@
+"""Mixed-workload load test with per-route latency percentiles and a regression gate.
+
+Seeds doctors (with profiles), patients with bookings and prescriptions, and an
+admin. Then ``--concurrency`` virtual users run a weighted mix of register, login,
+book, list, get, prescribe and analytics calls for ``--duration`` seconds. The
+app runs in-process through httpx's ASGI transport (lifespan included), unless
+``--url`` points at a running server.
+
+Results are written as JSON (``--output``): per route, requests, errors,
+req/s and p50/p95/p99/mean latency in ms. With ``--baseline``, each route is
+compared to the stored run, and the script exits with status 1 when p95 grew,
+or throughput dropped, by more than ``--threshold`` (a fraction).
+``--update-baseline`` writes this run as the new baseline.
+
+Uses the app's DATABASE_URL, so point it at a scratch database.
+
+    python -m benchmarks.bench_load --duration 30 --baseline benchmarks/baselines/load.json
+    python -m benchmarks.bench_load --duration 30 --baseline benchmarks/baselines/load.json --update-baseline
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import sys
+import time
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+import httpx
+
+PASSWORD = "BenchPass123"
+MEDICINES = [
+    {"name": "Amoxicillin", "dosage": "500mg", "duration": "7 days"},
+    {"name": "Ibuprofen", "dosage": "400mg", "duration": "5 days", "instructions": "After meals"},
+    {"name": "Metformin", "dosage": "850mg", "duration": "90 days"},
+]
+
+# Weight of each operation in the mix, roughly the production read/write split
+MIX = {
+    "register": 2,
+    "login": 5,
+    "book": 12,
+    "list_appointments": 25,
+    "get_appointment": 15,
+    "list_prescriptions": 15,
+    "prescribe": 8,
+    "list_doctors": 13,
+    "analytics": 5,
+}
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+
+    def record(self, route: str, seconds: float, ok: bool) -> None:
+        self.latencies.setdefault(route, []).append(seconds)
+        self.errors.setdefault(route, 0)
+        if not ok:
+            self.errors[route] += 1
+
+    def summary(self, elapsed: float) -> dict:
+        routes = {
+            route: summarize(latencies, self.errors[route], elapsed)
+            for route, latencies in sorted(self.latencies.items())
+        }
+        everything = [latency for latencies in self.latencies.values() for latency in latencies]
+        return {"routes": routes, "total": summarize(everything, sum(self.errors.values()), elapsed)}
+
+
+def percentile(ordered: List[float], fraction: float) -> float:
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> dict:
+    ordered = sorted(latencies)
+    return {
+        "requests": len(ordered),
+        "errors": errors,
+        "rps": round(len(ordered) / elapsed, 2),
+        "p50_ms": round(percentile(ordered, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(ordered, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(ordered, 0.99) * 1000, 2),
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 2),
+    }
+
+
+class World:
+    """Seeded users and ids the virtual users pick from"""
+
+    def __init__(self):
+        self.doctors: List[dict] = []
+        self.patients: List[dict] = []
+        self.admin: Optional[dict] = None
+        self.unprescribed: List[tuple] = []  # (doctor, appointment_id)
+
+
+async def register(client: httpx.AsyncClient, role: str) -> httpx.Response:
+    return await client.post("/auth/register", json={
+        "email": f"load-{role}-{uuid.uuid4().hex[:12]}@example.com",
+        "password": PASSWORD,
+        "role": role,
+        "first_name": random.choice(["Ana", "Ben", "Chen", "Dara", "Eli", "Fatima"]),
+        "last_name": random.choice(["Silva", "Okafor", "Nguyen", "Schmidt", "Haddad"]),
+    })
+
+
+async def create_user(client: httpx.AsyncClient, role: str) -> dict:
+    response = await register(client, role)
+    response.raise_for_status()
+    email = response.json()["email"]
+    login = await client.post("/auth/login", json={"email": email, "password": PASSWORD})
+    login.raise_for_status()
+    return {
+        "id": response.json()["id"],
+        "email": email,
+        "headers": {"Authorization": f"Bearer {login.json()['access_token']}"},
+        "appointments": [],
+    }
+
+
+async def book(client: httpx.AsyncClient, world: World, patient: dict) -> httpx.Response:
+    doctor = random.choice(world.doctors)
+    response = await client.post("/appointments/", headers=patient["headers"], json={
+        "doctor_id": doctor["id"],
+        "appointment_time": (
+            datetime.utcnow() + timedelta(days=random.randint(1, 60), minutes=random.randint(0, 1440))
+        ).isoformat(),
+        "notes": random.choice([None, "Follow-up", "First visit", "Recurring headaches"]),
+    })
+    if response.status_code == 201:
+        patient["appointments"].append(response.json()["id"])
+        world.unprescribed.append((doctor, response.json()["id"]))
+    return response
+
+
+async def prescribe(client: httpx.AsyncClient, world: World) -> Optional[httpx.Response]:
+    if not world.unprescribed:
+        return None
+    doctor, appointment_id = world.unprescribed.pop(random.randrange(len(world.unprescribed)))
+    return await client.post("/prescriptions/", headers=doctor["headers"], json={
+        "appointment_id": appointment_id,
+        "notes": "Take with food",
+        "medicines": random.sample(MEDICINES, random.randint(1, len(MEDICINES))),
+    })
+
+
+async def seed(client: httpx.AsyncClient, args) -> World:
+    world = World()
+    world.admin = await create_user(client, "admin")
+    for _ in range(args.doctors):
+        doctor = await create_user(client, "doctor")
+        await client.post("/doctors/profile", headers=doctor["headers"], json={
+            "specialization": random.choice(["Cardiology", "Dermatology", "General Practice", "Pediatrics"]),
+            "location": random.choice(["Room 101", "Room 204", "Clinic B"]),
+        })
+        world.doctors.append(doctor)
+    for _ in range(args.patients):
+        patient = await create_user(client, "patient")
+        world.patients.append(patient)
+        for _ in range(args.appointments):
+            (await book(client, world, patient)).raise_for_status()
+    # Prescribe about half of the seeded bookings
+    for _ in range(len(world.unprescribed) // 2):
+        (await prescribe(client, world)).raise_for_status()
+    return world
+
+
+async def run_operation(name: str, client: httpx.AsyncClient, world: World, recorder: Recorder) -> None:
+    patient = random.choice(world.patients)
+    if name == "register":
+        route, call = "POST /auth/register", register(client, random.choice(["patient", "doctor"]))
+    elif name == "login":
+        route, call = "POST /auth/login", client.post("/auth/login", json={"email": patient["email"], "password": PASSWORD})
+    elif name == "book":
+        route, call = "POST /appointments/", book(client, world, patient)
+    elif name == "list_appointments":
+        route, call = "GET /appointments/", client.get("/appointments/", headers=patient["headers"])
+    elif name == "get_appointment" and patient["appointments"]:
+        appointment_id = random.choice(patient["appointments"])
+        route, call = "GET /appointments/{id}", client.get(f"/appointments/{appointment_id}", headers=patient["headers"])
+    elif name == "list_prescriptions":
+        user = random.choice([patient, random.choice(world.doctors)])
+        route, call = "GET /prescriptions/", client.get("/prescriptions/?expand=appointment", headers=user["headers"])
+    elif name == "prescribe" and world.unprescribed:
+        route, call = "POST /prescriptions/", prescribe(client, world)
+    elif name == "list_doctors":
+        route, call = "GET /doctors/", client.get("/doctors/")
+    elif name == "analytics":
+        route, call = "GET /admin/analytics", client.get("/admin/analytics", headers=world.admin["headers"])
+    else:
+        return
+
+    start = time.perf_counter()
+    try:
+        response = await call
+        ok = response is not None and response.status_code < 400
+    except httpx.HTTPError:
+        ok = False
+    recorder.record(route, time.perf_counter() - start, ok)
+
+
+async def drive(client: httpx.AsyncClient, world: World, args) -> dict:
+    recorder = Recorder()
+    names, weights = list(MIX), list(MIX.values())
+    deadline = time.perf_counter() + args.duration
+
+    async def virtual_user():
+        while time.perf_counter() < deadline:
+            await run_operation(random.choices(names, weights)[0], client, world, recorder)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(virtual_user() for _ in range(args.concurrency)))
+    return recorder.summary(time.perf_counter() - started)
+
+
+def compare(result: dict, baseline: dict, threshold: float) -> List[str]:
+    """Routes whose p95 latency or throughput regressed beyond ``threshold``"""
+    regressions = []
+    for route, before in baseline["routes"].items():
+        after = result["routes"].get(route)
+        if after is None:
+            continue
+        if after["p95_ms"] > before["p95_ms"] * (1 + threshold):
+            regressions.append(f"{route}: p95 {before['p95_ms']:.1f} -> {after['p95_ms']:.1f} ms")
+        if after["rps"] < before["rps"] * (1 - threshold):
+            regressions.append(f"{route}: throughput {before['rps']:.1f} -> {after['rps']:.1f} req/s")
+    return regressions
+
+
+@asynccontextmanager
+async def open_client(args):
+    if args.url:
+        async with httpx.AsyncClient(base_url=args.url, timeout=60) as client:
+            yield client
+        return
+
+    from app.main import app
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=60) as client:
+            yield client
+
+
+def print_table(result: dict) -> None:
+    print(f"{'route':<24} {'requests':>8} {'errors':>6} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for route, stats in [*result["routes"].items(), ("total", result["total"])]:
+        print(
+            f"{route:<24} {stats['requests']:>8} {stats['errors']:>6} {stats['rps']:>8.1f} "
+            f"{stats['p50_ms']:>8.1f} {stats['p95_ms']:>8.1f} {stats['p99_ms']:>8.1f}"
+        )
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Base URL of a running server (default: the app in-process)")
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--concurrency", type=int, default=20, help="Virtual users")
+    parser.add_argument("--doctors", type=int, default=10)
+    parser.add_argument("--patients", type=int, default=40)
+    parser.add_argument("--appointments", type=int, default=5, help="Seeded bookings per patient")
+    parser.add_argument("--seed", type=int, default=1234, help="Random seed for the dataset and the mix")
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    parser.add_argument("--baseline", help="Baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed regression, as a fraction")
+    parser.add_argument("--update-baseline", action="store_true", help="Store this run as the baseline")
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    async with open_client(args) as client:
+        world = await seed(client, args)
+        result = await drive(client, world, args)
+    result["meta"] = {
+        "target": args.url or "in-process",
+        "duration": args.duration,
+        "concurrency": args.concurrency,
+        "dataset": {"doctors": args.doctors, "patients": args.patients, "appointments": args.appointments},
+        "python": platform.python_version(),
+        "cpus": os.cpu_count(),
+        "recorded_at": datetime.utcnow().isoformat(timespec="seconds"),
+    }
+
+    print_table(result)
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(result, output, indent=2)
+
+    if args.baseline and args.update_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, "w") as baseline_file:
+            json.dump(result, baseline_file, indent=2)
+        print(f"baseline written to {args.baseline}")
+    elif args.baseline:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+        if baseline["meta"]["concurrency"] != args.concurrency or baseline["meta"]["target"] != result["meta"]["target"]:
+            print("warning: baseline was recorded with a different target or concurrency", file=sys.stderr)
+        regressions = compare(result, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print(f"\nno regressions beyond {args.threshold:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
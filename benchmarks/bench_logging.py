@@ -0,0 +1,125 @@
+"""Logging cost paid on the request path per request.
+
+Emits the two INFO lines ``LoggingMiddleware`` writes per request and measures the
+time spent in the calling thread for:
+
+* synchronous ``StreamHandler`` (the previous ``basicConfig`` setup)
+* ``NonBlockingQueueHandler`` + ``QueueListener`` writing JSON to the same sink
+* the queue setup with the request logger sampled at ``--sample-rate``
+
+Writes to a local file mostly land in the page cache, which hides the cost of a
+slow stdout pipe or a stalled disk. ``--io-latency-us`` adds a sleep per write to
+simulate that; the queued variants should be unaffected by it on the caller side.
+
+    python -m benchmarks.bench_logging --requests 20000 --io-latency-us 50
+"""
+import argparse
+import logging
+import os
+import queue
+import statistics
+import tempfile
+import time
+from logging.handlers import QueueListener
+
+from app.core.logging_config import JsonFormatter, NonBlockingQueueHandler, SamplingFilter
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+
+class SlowStream:
+    """File stream that sleeps before every write, like a congested pipe or disk"""
+
+    def __init__(self, path: str, latency: float):
+        self.file = open(path, "a")
+        self.latency = latency
+
+    def write(self, data: str) -> None:
+        if self.latency:
+            time.sleep(self.latency)
+        self.file.write(data)
+
+    def flush(self) -> None:
+        self.file.flush()
+
+    def close(self) -> None:
+        self.file.close()
+
+
+def emit(logger: logging.Logger, requests: int) -> list:
+    timings = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        logger.info("Request: %s %s", "GET", "/appointments/")
+        logger.info("Response: %s %s Status: %s Duration: %.3fs", "GET", "/appointments/", 200, 0.0042)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def make_logger(name: str, handler: logging.Handler) -> logging.Logger:
+    logger = logging.getLogger(name)
+    logger.setLevel(logging.INFO)
+    logger.handlers = [handler]
+    logger.propagate = False
+    return logger
+
+
+def run_sync(path: str, requests: int, latency: float) -> tuple:
+    stream = SlowStream(path, latency)
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+    try:
+        return emit(make_logger("bench.sync", handler), requests), 0.0
+    finally:
+        stream.close()
+
+
+def run_queued(path: str, requests: int, latency: float, sample_rate: float = 1.0) -> tuple:
+    stream = SlowStream(path, latency)
+    stream_handler = logging.StreamHandler(stream)
+    stream_handler.setFormatter(JsonFormatter())
+    queue_handler = NonBlockingQueueHandler(queue.Queue(maxsize=requests * 2 + 1))
+    listener = QueueListener(queue_handler.queue, stream_handler)
+    logger = make_logger(f"bench.queued.{sample_rate}", queue_handler)
+    if sample_rate < 1.0:
+        logger.addFilter(SamplingFilter(sample_rate))
+
+    listener.start()
+    timings = emit(logger, requests)
+    drain_start = time.perf_counter()
+    listener.stop()
+    stream.close()
+    return timings, time.perf_counter() - drain_start
+
+
+def summarize(name: str, timings: list, drain: float) -> str:
+    ordered = sorted(timings)
+    p99 = ordered[int(len(ordered) * 0.99) - 1]
+    return f"{name:<26}{statistics.fmean(timings) * 1e6:>12.2f}{p99 * 1e6:>12.2f}{drain:>14.2f}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--sample-rate", type=float, default=0.1)
+    parser.add_argument("--io-latency-us", type=float, default=0.0, help="Simulated delay per write")
+    args = parser.parse_args()
+    latency = args.io_latency_us / 1e6
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = [
+            ("sync StreamHandler", *run_sync(os.path.join(tmp, "sync.log"), args.requests, latency)),
+            ("queue + JSON", *run_queued(os.path.join(tmp, "queued.log"), args.requests, latency)),
+            (
+                f"queue + JSON @ {args.sample_rate:g}",
+                *run_queued(os.path.join(tmp, "sampled.log"), args.requests, latency, args.sample_rate),
+            ),
+        ]
+
+    print(f"{'setup':<26}{'mean us':>12}{'p99 us':>12}{'drain s':>14}")
+    for name, timings, drain in results:
+        print(summarize(name, timings, drain))
+
+
+if __name__ == "__main__":
+    main()
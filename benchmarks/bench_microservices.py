@@ -0,0 +1,135 @@
+"""Throughput of one instance of each microservice at increasing concurrency.
+
+Runs against the services started by ``docker-compose.microservices.yml`` (or any
+other deployment reachable over HTTP). A doctor and a patient are registered and
+logged in once; then, for each concurrency level, that many clients loop on the
+scenario for ``--duration`` seconds and the achieved requests/second and latency
+percentiles are printed.
+
+Scenarios:
+
+* ``list``      GET /appointments as the patient (auth-service call + one query)
+* ``book``      POST /appointments as the patient (auth-service call + one insert)
+* ``prescribe`` POST /prescriptions as the doctor for freshly booked appointments
+                (auth-service call + batched appointment lookup + insert)
+* ``login``     POST /auth/login (bcrypt in the threadpool)
+
+    docker-compose -f docker-compose.microservices.yml up -d --build
+    python -m benchmarks.bench_microservices --scenario list --concurrency 10 50 200 500
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta
+
+import httpx
+
+PASSWORD = "BenchPass123"
+
+
+async def register_and_login(client: httpx.AsyncClient, auth_url: str, role: str) -> dict:
+    email = f"bench-{role}-{uuid.uuid4().hex[:12]}@example.com"
+    await client.post(f"{auth_url}/auth/register", json={
+        "email": email, "password": PASSWORD, "role": role, "first_name": "Bench", "last_name": role.title()
+    })
+    response = await client.post(f"{auth_url}/auth/login", json={"email": email, "password": PASSWORD})
+    response.raise_for_status()
+    token = response.json()["access_token"]
+    validated = await client.post(
+        f"{auth_url}/auth/validate-token", headers={"Authorization": f"Bearer {token}"}
+    )
+    return {"email": email, "user_id": validated.json()["user_id"], "headers": {"Authorization": f"Bearer {token}"}}
+
+
+def make_scenario(name: str, args, doctor: dict, patient: dict):
+    def appointment_body() -> dict:
+        when = datetime.utcnow() + timedelta(days=1, minutes=int(time.perf_counter_ns() % 100000))
+        return {"doctor_id": doctor["user_id"], "appointment_time": when.isoformat(), "notes": "bench"}
+
+    async def list_appointments(client):
+        return await client.get(f"{args.appointment_url}/appointments", headers=patient["headers"])
+
+    async def book(client):
+        return await client.post(
+            f"{args.appointment_url}/appointments", json=appointment_body(), headers=patient["headers"]
+        )
+
+    async def prescribe(client):
+        booked = await book(client)
+        booked.raise_for_status()
+        return await client.post(f"{args.prescription_url}/prescriptions", json={
+            "appointment_id": booked.json()["id"],
+            "medicines": [{"name": "Ibuprofen", "dosage": "200mg", "duration": "5 days"}],
+        }, headers=doctor["headers"])
+
+    async def login(client):
+        return await client.post(
+            f"{args.auth_url}/auth/login", json={"email": patient["email"], "password": PASSWORD}
+        )
+
+    return {"list": list_appointments, "book": book, "prescribe": prescribe, "login": login}[name]
+
+
+async def run_level(scenario, concurrency: int, duration: float) -> dict:
+    latencies = []
+    errors = 0
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=30) as client:
+        deadline = time.perf_counter() + duration
+
+        async def worker():
+            nonlocal errors
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                try:
+                    response = await scenario(client)
+                    if response.status_code >= 400:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append(time.perf_counter() - start)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "rps": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "errors": errors,
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--auth-url", default="http://localhost:8001")
+    parser.add_argument("--appointment-url", default="http://localhost:8002")
+    parser.add_argument("--prescription-url", default="http://localhost:8003")
+    parser.add_argument("--scenario", choices=("list", "book", "prescribe", "login"), default="list")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[10, 50, 200])
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per concurrency level")
+    args = parser.parse_args()
+
+    async with httpx.AsyncClient(timeout=30) as client:
+        doctor = await register_and_login(client, args.auth_url, "doctor")
+        patient = await register_and_login(client, args.auth_url, "patient")
+    scenario = make_scenario(args.scenario, args, doctor, patient)
+
+    print(f"scenario: {args.scenario}, {args.duration:.0f}s per level")
+    print(f"{'concurrency':>11} {'requests':>9} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'errors':>7}")
+    for concurrency in args.concurrency:
+        result = await run_level(scenario, concurrency, args.duration)
+        print(
+            f"{result['concurrency']:>11} {result['requests']:>9} {result['rps']:>9.1f} "
+            f"{result['p50_ms']:>9.1f} {result['p99_ms']:>9.1f} {result['errors']:>7}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,131 @@
+"""Per-request overhead of the logging and audit middleware stack.
+
+Compares the previous ``BaseHTTPMiddleware`` implementations against the pure ASGI
+ones by driving a trivial Starlette endpoint directly through the ASGI interface
+(no HTTP client or socket in the loop), so the difference is the middleware layer.
+
+    python -m benchmarks.bench_middleware --requests 20000
+"""
+import argparse
+import asyncio
+import logging
+import time
+
+from starlette.applications import Starlette
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from app.middleware.audit_middleware import AuditMiddleware
+from app.middleware.logging_middleware import LoggingMiddleware
+
+
+class LegacyLoggingMiddleware(BaseHTTPMiddleware):
+    """The BaseHTTPMiddleware version this module replaced, kept as the baseline"""
+
+    async def dispatch(self, request, call_next):
+        start_time = time.time()
+        logging.getLogger("bench.logging").info(f"Request: {request.method} {request.url.path}")
+        response = await call_next(request)
+        process_time = time.time() - start_time
+        logging.getLogger("bench.logging").info(
+            f"Response: {request.method} {request.url.path} "
+            f"Status: {response.status_code} "
+            f"Duration: {process_time:.3f}s"
+        )
+        response.headers["X-Process-Time"] = str(process_time)
+        return response
+
+
+class LegacyAuditMiddleware(BaseHTTPMiddleware):
+    SENSITIVE_PATHS = ["/prescriptions", "/appointments", "/users/profile", "/admin"]
+
+    async def dispatch(self, request, call_next):
+        is_sensitive = any(path in str(request.url.path) for path in self.SENSITIVE_PATHS)
+        if is_sensitive and request.method in ["POST", "PUT", "DELETE"]:
+            user_id = getattr(request.state, "user_id", "anonymous")
+            logging.getLogger("bench.audit").info(f"AUDIT: {user_id} {request.method} {request.url.path}")
+        return await call_next(request)
+
+
+async def endpoint(request):
+    return PlainTextResponse("ok")
+
+
+def build_app(middleware=()):
+    app = Starlette(routes=[Route("/appointments/", endpoint, methods=["GET", "POST"])])
+    for cls in middleware:
+        app.add_middleware(cls)
+    return app
+
+
+async def drive(app, requests: int, method: str) -> float:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": "/appointments/",
+        "raw_path": b"/appointments/",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+
+    async def one_request():
+        # Behave like a server: deliver the body once, then report the disconnect
+        # only after the response has been fully sent.
+        body_sent = False
+        response_complete = asyncio.Event()
+
+        async def receive():
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            await response_complete.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                response_complete.set()
+
+        await app(dict(scope), receive, send)
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        await one_request()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--method", default="POST", help="POST exercises the audit branch")
+    args = parser.parse_args()
+
+    # Measure the middleware machinery, not the log handler
+    logging.disable(logging.CRITICAL)
+
+    variants = {
+        "no middleware": build_app(),
+        "BaseHTTPMiddleware": build_app([LegacyLoggingMiddleware, LegacyAuditMiddleware]),
+        "pure ASGI": build_app([LoggingMiddleware, AuditMiddleware]),
+    }
+
+    results = {}
+    for name, app in variants.items():
+        asyncio.run(drive(app, 500, args.method))  # warm up
+        results[name] = asyncio.run(drive(app, args.requests, args.method)) / args.requests * 1e6
+
+    baseline = results["no middleware"]
+    print(f"{'variant':<20}{'us/request':>12}{'overhead us':>14}")
+    for name, per_request in results.items():
+        print(f"{name:<20}{per_request:>12.1f}{per_request - baseline:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
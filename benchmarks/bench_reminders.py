@@ -0,0 +1,128 @@
+"""Reminder scheduler throughput at a given booking rate.
+
+Inserts ``--per-hour`` BOOKED appointments for every hour of ``--hours``,
+starting one reminder lead from now. It then adds ``--background`` times as
+many appointments outside the reminder window: past, cancelled and far
+future. The scheduler is driven on a simulated clock through the whole period
+with a sink that only counts. The script reports reminders sent, the wall time
+spent (reminders/second of scheduler work) and the statements run per scan.
+With the indexes in place the time does not grow with ``--background``.
+
+Runs against the app's configured DATABASE_URL, or ``--database-url``; use a
+scratch database.
+
+    python -m benchmarks.bench_reminders --per-hour 100000 --hours 1 --background 10
+"""
+import argparse
+import os
+import random
+import time
+from datetime import datetime, timedelta
+
+
+class CountingSink:
+    def __init__(self):
+        self.sent = 0
+        self.batches = 0
+
+    def send(self, reminders):
+        self.sent += len(reminders)
+        self.batches += 1
+
+
+def seed(engine, per_hour: int, hours: int, background: int, lead: timedelta, now: datetime) -> None:
+    from sqlalchemy import insert
+    from app.models.appointment import Appointment
+    from app.models.user import User
+    from app.utils.constants import AppointmentStatus, UserRole
+    from app.utils.ids import uuid7
+
+    rng = random.Random(7)
+    users = [
+        {"id": uuid7(), "email": f"bench-reminders-{index}-{uuid7().hex}@example.com", "password_hash": "x",
+         "role": UserRole.PATIENT if index % 10 else UserRole.DOCTOR, "created_at": now, "updated_at": now}
+        for index in range(200)
+    ]
+    patients = [user["id"] for user in users if user["role"] == UserRole.PATIENT]
+    doctors = [user["id"] for user in users if user["role"] == UserRole.DOCTOR]
+    window = hours * 3600
+    old = now - timedelta(days=1)
+
+    def appointment(appointment_time, status):
+        return {
+            "id": uuid7(), "patient_id": rng.choice(patients), "doctor_id": rng.choice(doctors),
+            "appointment_time": appointment_time, "status": status, "created_at": old, "updated_at": old,
+        }
+
+    with engine.begin() as connection:
+        connection.execute(insert(User), users)
+        batch = []
+        for index in range(per_hour * hours * (1 + background)):
+            if index % (1 + background) == 0:
+                # In the window: reminders due during the simulated period
+                batch.append(appointment(now + lead + timedelta(seconds=rng.uniform(0, window)), AppointmentStatus.BOOKED))
+            else:
+                kind = rng.random()
+                if kind < 0.6:
+                    batch.append(appointment(now - timedelta(days=rng.uniform(1, 700)), AppointmentStatus.COMPLETED))
+                elif kind < 0.8:
+                    batch.append(appointment(now + timedelta(days=rng.uniform(0, 60)), AppointmentStatus.CANCELLED))
+                else:
+                    batch.append(appointment(now + lead + timedelta(days=rng.uniform(1, 60)), AppointmentStatus.BOOKED))
+            if len(batch) == 10000:
+                connection.execute(insert(Appointment), batch)
+                batch = []
+        if batch:
+            connection.execute(insert(Appointment), batch)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--per-hour", type=int, default=100_000, help="Reminders due per simulated hour")
+    parser.add_argument("--hours", type=int, default=1)
+    parser.add_argument("--background", type=int, default=10, help="Appointments outside the window per reminder")
+    parser.add_argument("--scan-interval", type=float, default=30.0)
+    parser.add_argument("--database-url", default=None, help="Defaults to the app's DATABASE_URL")
+    args = parser.parse_args()
+
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    from sqlalchemy import event
+    from app.core.database import Base, engine
+    from app.core.reminders import ReminderScheduler
+    from app.models.user import User  # noqa: F401  (appointments reference users)
+
+    Base.metadata.create_all(bind=engine)
+    lead = timedelta(hours=24)
+    now = datetime.utcnow().replace(microsecond=0)
+    started = time.perf_counter()
+    seed(engine, args.per_hour, args.hours, args.background, lead, now)
+    total = args.per_hour * args.hours * (1 + args.background)
+    print(f"seeded {total:,} appointments in {time.perf_counter() - started:.1f}s")
+
+    scan_statements = []
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def count(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and "appointment_reminders" not in statement:
+            scan_statements.append(statement)
+
+    sink = CountingSink()
+    scheduler = ReminderScheduler(sink=sink, lead=lead, scan_interval=args.scan_interval, catchup=0)
+    clock = now
+    end = now + timedelta(hours=args.hours, minutes=1)
+    started = time.perf_counter()
+    while clock < end:
+        clock += timedelta(seconds=scheduler.run_pending(clock))
+    elapsed = time.perf_counter() - started
+
+    stats = scheduler.stats()
+    print(f"simulated {args.hours}h: {sink.sent:,} reminders in {sink.batches:,} batches, "
+          f"{stats['scans']} scans, {stats['dropped']} dropped, {stats['failed']} failed")
+    print(f"scheduler time {elapsed:.1f}s: {sink.sent / elapsed:,.0f} reminders/s "
+          f"({sink.sent / elapsed * 3600:,.0f}/hour of wall time)")
+    print(f"{len(scan_statements) / stats['scans']:.1f} SELECTs on appointments per scan, claims included")
+
+
+if __name__ == "__main__":
+    main()
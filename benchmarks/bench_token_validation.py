@@ -0,0 +1,97 @@
+"""Token validations per second per core in auth-service.
+
+Everything runs in this process on one core, with no network in between:
+
+* ``decode``         ``jose.jwt.decode`` (HMAC check + claim parsing) per token
+* ``cache hit``      ``verify_token`` on a token already in the verified-token cache
+* ``/validate-token``  one ASGI request per token, cache off / on
+* ``/validate-tokens`` batches of ``--batch-size`` tokens per request, cache off / on
+
+Needs the auth-service requirements installed. The validate routes never touch the
+database; DATABASE_URL defaults to in-memory SQLite only so the module imports.
+
+    python -m benchmarks.bench_token_validation --tokens 2000 --batch-size 100
+"""
+import argparse
+import asyncio
+import importlib.util
+import os
+import sys
+import time
+import uuid
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_auth_service():
+    os.environ.setdefault("DATABASE_URL", "sqlite://")
+    sys.path.insert(0, os.path.join(ROOT, "microservices"))
+    spec = importlib.util.spec_from_file_location(
+        "auth_service_main", os.path.join(ROOT, "microservices", "auth-service", "main.py")
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def rate(count: int, seconds: float) -> str:
+    return f"{count / seconds:>12,.0f} /s"
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tokens", type=int, default=2000, help="Distinct tokens validated per run")
+    parser.add_argument("--batch-size", type=int, default=100)
+    args = parser.parse_args()
+
+    import httpx
+    auth = load_auth_service()
+    tokens = [
+        auth.create_access_token({"sub": str(uuid.uuid4()), "role": "patient"}) for _ in range(args.tokens)
+    ]
+
+    def set_cache(enabled: bool) -> None:
+        auth.token_cache._entries.clear()
+        auth.token_cache.max_entries = args.tokens if enabled else 0
+
+    print(f"{args.tokens} distinct tokens, one core")
+
+    start = time.perf_counter()
+    for token in tokens:
+        auth.jwt.decode(token, auth.SECRET_KEY, algorithms=[auth.ALGORITHM])
+    print(f"{'decode':<34}{rate(len(tokens), time.perf_counter() - start)}")
+
+    set_cache(True)
+    for token in tokens:
+        auth.verify_token(token)
+    start = time.perf_counter()
+    for token in tokens:
+        auth.verify_token(token)
+    print(f"{'cache hit':<34}{rate(len(tokens), time.perf_counter() - start)}")
+
+    transport = httpx.ASGITransport(app=auth.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://auth") as client:
+        for cached in (False, True):
+            set_cache(cached)
+            if cached:
+                await client.post("/auth/validate-tokens", json={"tokens": tokens})
+            label = "cache on" if cached else "cache off"
+
+            start = time.perf_counter()
+            for token in tokens:
+                response = await client.post("/auth/validate-token", headers={"Authorization": f"Bearer {token}"})
+                assert response.status_code == 200
+            print(f"{'/validate-token, ' + label:<34}{rate(len(tokens), time.perf_counter() - start)}")
+
+            start = time.perf_counter()
+            for offset in range(0, len(tokens), args.batch_size):
+                response = await client.post(
+                    "/auth/validate-tokens", json={"tokens": tokens[offset:offset + args.batch_size]}
+                )
+                assert all(result["valid"] for result in response.json())
+            label = f"/validate-tokens x{args.batch_size}, {label}"
+            print(f"{label:<34}{rate(len(tokens), time.perf_counter() - start)}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
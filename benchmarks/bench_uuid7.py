@@ -0,0 +1,108 @@
+"""Insert throughput and index size with uuid4 vs UUIDv7 primary keys.
+
+Each id kind gets its own scratch table shaped like ``prescriptions``: a GUID
+primary key and an indexed GUID column that points at a row created moments
+earlier (``appointment_id``). ``--rows`` rows are inserted in batches of
+``--batch``. The script reports rows/second for the whole load and for its
+last tenth, when the index no longer fits in cache, and the on-disk size of both
+indexes.
+
+Runs against the app's configured DATABASE_URL, or ``--database-url``. Use a
+scratch database: the tables are dropped and recreated. The effect shows best
+on PostgreSQL with more rows than fit in shared_buffers.
+
+    python -m benchmarks.bench_uuid7 --rows 2000000
+    python -m benchmarks.bench_uuid7 --database-url sqlite:////tmp/uuid.db --rows 500000
+"""
+import argparse
+import os
+import time
+import uuid
+
+from app.utils.ids import uuid7
+
+
+def index_sizes(engine, table: str) -> dict:
+    """On-disk bytes of every index on ``table``"""
+    from sqlalchemy import text
+
+    with engine.connect() as connection:
+        if engine.dialect.name == "postgresql":
+            rows = connection.execute(text(
+                "SELECT indexrelid::regclass::text, pg_relation_size(indexrelid) "
+                "FROM pg_index WHERE indrelid = CAST(:table AS regclass)"
+            ), {"table": table})
+        elif engine.dialect.name == "sqlite":
+            rows = connection.execute(text(
+                "SELECT dbstat.name, SUM(pgsize) FROM dbstat JOIN sqlite_master ON sqlite_master.name = dbstat.name "
+                "WHERE sqlite_master.type = 'index' AND sqlite_master.tbl_name = :table GROUP BY dbstat.name"
+            ), {"table": table})
+        else:
+            return {}
+        return {name: size for name, size in rows}
+
+
+def run(engine, kind: str, generate, rows: int, batch: int) -> None:
+    from sqlalchemy import Column, Index, MetaData, String, Table, insert
+    from app.models.types import GUID
+
+    name = f"bench_ids_{kind}"
+    metadata = MetaData()
+    table = Table(
+        name, metadata,
+        Column("id", GUID(), primary_key=True),
+        Column("parent_id", GUID(), nullable=False),
+        Column("notes", String, nullable=True),
+        Index(f"ix_{name}_parent_id", "parent_id"),
+    )
+    metadata.drop_all(engine)
+    metadata.create_all(engine)
+
+    tail_start = rows - rows // 10
+    tail_elapsed = 0.0
+    parent = generate()
+    started = time.perf_counter()
+    for offset in range(0, rows, batch):
+        batch_started = time.perf_counter()
+        records = []
+        for _ in range(min(batch, rows - offset)):
+            record_id = generate()
+            records.append({"id": record_id, "parent_id": parent, "notes": "Take with food"})
+            parent = record_id
+        with engine.begin() as connection:
+            connection.execute(insert(table), records)
+        if offset >= tail_start:
+            tail_elapsed += time.perf_counter() - batch_started
+    elapsed = time.perf_counter() - started
+
+    sizes = index_sizes(engine, name)
+    primary = sum(size for index, size in sizes.items() if "parent_id" not in index)
+    secondary = sum(size for index, size in sizes.items() if "parent_id" in index)
+    tail_rows = rows - tail_start
+    print(
+        f"{kind:<6} {rows / elapsed:>11,.0f} {tail_rows / tail_elapsed if tail_elapsed else 0:>13,.0f} "
+        f"{primary / 2**20:>9.1f} {secondary / 2**20:>12.1f}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--batch", type=int, default=1000)
+    parser.add_argument("--database-url", default=None, help="Defaults to the app's DATABASE_URL")
+    args = parser.parse_args()
+
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    from sqlalchemy import create_engine
+    from app.core.config import settings
+
+    engine = create_engine(settings.DATABASE_URL)
+    print(f"{args.rows:,} rows in batches of {args.batch} on {engine.dialect.name}")
+    print(f"{'ids':<6} {'rows/s':>11} {'last 10% r/s':>13} {'pk MB':>9} {'parent ix MB':>12}")
+    for kind, generate in (("uuid4", uuid.uuid4), ("uuid7", uuid7)):
+        run(engine, kind, generate, args.rows, args.batch)
+
+
+if __name__ == "__main__":
+    main()
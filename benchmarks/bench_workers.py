@@ -0,0 +1,155 @@
+"""Throughput of the monolith under gunicorn as the worker count grows.
+
+For each worker count, ``gunicorn -c gunicorn.conf.py app.main:app`` is started
+with ``WEB_CONCURRENCY`` set to that count. Clients then loop on the scenario
+for ``--duration`` seconds, and the server is stopped again. The speedup
+column is relative to the first worker count given.
+
+* ``login``    POST /auth/login (bcrypt, CPU-bound)
+* ``profile``  GET /users/profile (token decode + cached user lookup)
+* ``list``     GET /appointments/ for a patient with ``--appointments`` bookings
+
+Uses the DATABASE_URL from the environment or .env. Run it against PostgreSQL:
+SQLite serializes writers and does not show how the pool behaves.
+
+    python -m benchmarks.bench_workers --workers 1 2 4 --scenario login --concurrency 32
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PASSWORD = "BenchPass123"
+
+
+def start_server(workers: int, port: int) -> subprocess.Popen:
+    env = {**os.environ, "WEB_CONCURRENCY": str(workers), "PORT": str(port), "LOG_LEVEL": "WARNING"}
+    return subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "app.main:app"],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+
+
+async def wait_until_ready(base_url: str, workers: int, timeout: float = 60) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get("/health")).status_code == 200:
+                    # Give the remaining workers time to finish booting too
+                    await asyncio.sleep(0.5 * workers)
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"gunicorn did not start on {base_url}")
+
+
+async def register_and_login(client: httpx.AsyncClient, role: str) -> dict:
+    email = f"bench-{role}-{uuid.uuid4().hex[:12]}@example.com"
+    response = await client.post("/auth/register", json={
+        "email": email, "password": PASSWORD, "role": role, "first_name": "Bench", "last_name": role.title()
+    })
+    response.raise_for_status()
+    token = (await client.post("/auth/login", json={"email": email, "password": PASSWORD})).json()["access_token"]
+    return {"id": response.json()["id"], "email": email, "headers": {"Authorization": f"Bearer {token}"}}
+
+
+async def seed(client: httpx.AsyncClient, appointments: int) -> dict:
+    patient = await register_and_login(client, "patient")
+    for day in range(appointments):
+        doctor = await register_and_login(client, "doctor")
+        (await client.post("/appointments/", headers=patient["headers"], json={
+            "doctor_id": doctor["id"],
+            "appointment_time": (datetime.utcnow() + timedelta(days=day + 1)).isoformat(),
+        })).raise_for_status()
+    return patient
+
+
+def make_scenario(name: str, patient: dict):
+    async def login(client):
+        return await client.post("/auth/login", json={"email": patient["email"], "password": PASSWORD})
+
+    async def profile(client):
+        return await client.get("/users/profile", headers=patient["headers"])
+
+    async def list_appointments(client):
+        return await client.get("/appointments/", headers=patient["headers"])
+
+    return {"login": login, "profile": profile, "list": list_appointments}[name]
+
+
+async def run_load(base_url: str, scenario, concurrency: int, duration: float) -> dict:
+    latencies = []
+    errors = 0
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        deadline = time.perf_counter() + duration
+
+        async def worker():
+            nonlocal errors
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                try:
+                    if (await scenario(client)).status_code >= 400:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append(time.perf_counter() - start)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "rps": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "errors": errors,
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, os.cpu_count() or 1])
+    parser.add_argument("--scenario", choices=("login", "profile", "list"), default="login")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=15.0, help="Seconds of load per worker count")
+    parser.add_argument("--appointments", type=int, default=20)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    base_url = f"http://127.0.0.1:{args.port}"
+    print(f"scenario: {args.scenario}, concurrency {args.concurrency}, {args.duration:.0f}s per run, "
+          f"{os.cpu_count()} cores")
+    print(f"{'workers':>7} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'errors':>7} {'speedup':>8}")
+
+    baseline = None
+    for workers in args.workers:
+        server = start_server(workers, args.port)
+        try:
+            await wait_until_ready(base_url, workers)
+            async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+                patient = await seed(client, args.appointments if args.scenario == "list" else 0)
+            result = await run_load(base_url, make_scenario(args.scenario, patient), args.concurrency, args.duration)
+        finally:
+            server.terminate()
+            server.wait(timeout=60)
+        baseline = baseline or result["rps"]
+        print(
+            f"{workers:>7} {result['rps']:>9.1f} {result['p50_ms']:>9.1f} {result['p99_ms']:>9.1f} "
+            f"{result['errors']:>7} {result['rps'] / baseline:>7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,51 @@
+"""Response schemas: ORM object -> Pydantic model (validation) and model -> JSON (serialization).
+
+``*_list`` variants handle 100 rows, as a list endpoint does.
+"""
+from fastapi.encoders import jsonable_encoder
+from app.schemas.appointment_schema import AppointmentResponse
+from app.schemas.prescription_schema import PrescriptionResponse
+from app.schemas.user_schema import UserResponse
+
+
+def bench_user_response_validate(benchmark, user):
+    benchmark(UserResponse.model_validate, user)
+
+
+def bench_user_response_serialize(benchmark, user):
+    model = UserResponse.model_validate(user)
+    benchmark(model.model_dump_json)
+
+
+def bench_appointment_response_validate(benchmark, appointment):
+    benchmark(AppointmentResponse.model_validate, appointment)
+
+
+def bench_appointment_response_serialize(benchmark, appointment):
+    model = AppointmentResponse.model_validate(appointment)
+    benchmark(model.model_dump_json, exclude_unset=True)
+
+
+def bench_appointment_response_list(benchmark, appointments):
+    def render():
+        return jsonable_encoder(
+            [AppointmentResponse.model_validate(row) for row in appointments], exclude_unset=True
+        )
+    assert len(benchmark(render)) == 100
+
+
+def bench_prescription_response_validate(benchmark, prescription):
+    benchmark(PrescriptionResponse.model_validate, prescription)
+
+
+def bench_prescription_response_serialize(benchmark, prescription):
+    model = PrescriptionResponse.model_validate(prescription)
+    benchmark(model.model_dump_json, exclude_unset=True)
+
+
+def bench_prescription_response_list(benchmark, prescriptions):
+    def render():
+        return jsonable_encoder(
+            [PrescriptionResponse.model_validate(row) for row in prescriptions], exclude_unset=True
+        )
+    assert len(benchmark(render)) == 100
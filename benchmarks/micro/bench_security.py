@@ -0,0 +1,15 @@
+"""JWT helpers run on every authenticated request (decode) and every login (create)"""
+from app.core.security import create_access_token, decode_access_token
+
+
+def bench_create_access_token(benchmark):
+    benchmark(create_access_token, {"sub": "00000000-0000-0000-0000-000000000001", "role": "patient"})
+
+
+def bench_decode_access_token(benchmark, access_token):
+    assert benchmark(decode_access_token, access_token) is not None
+
+
+def bench_decode_invalid_token(benchmark, access_token):
+    tampered = access_token[:-4] + "AAAA"
+    assert benchmark(decode_access_token, tampered) is None
@@ -0,0 +1,20 @@
+"""Input validators run on registration and on free-text fields of every write"""
+from app.utils.validators import parse_expand, sanitize_input, validate_password_strength
+
+NOTES = "Patient reports mild headaches in the evening, worse after screen use. Review in two weeks."
+
+
+def bench_validate_password_strength(benchmark):
+    assert benchmark(validate_password_strength, "CorrectHorse42Battery")
+
+
+def bench_sanitize_input_plain(benchmark):
+    assert benchmark(sanitize_input, NOTES) == NOTES
+
+
+def bench_sanitize_input_with_markup(benchmark):
+    benchmark(sanitize_input, "<b>Follow-up</b> on <i>blood pressure</i> readings")
+
+
+def bench_parse_expand(benchmark):
+    assert benchmark(parse_expand, "appointment, patient,doctor", ("appointment", "patient", "doctor"))
@@ -0,0 +1,79 @@
+"""Fixtures for the microbenchmarks: fixed objects, so every run measures the same work.
+
+The ORM instances are transient (never added to a session), so schema benchmarks
+measure Pydantic and attribute access only, with no database involved.
+"""
+import os
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+# The models import the engine module; nothing here connects to a database
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from app.core.security import create_access_token  # noqa: E402
+from app.models.appointment import Appointment  # noqa: E402
+from app.models.prescription import Prescription  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.utils.constants import AppointmentStatus, UserRole  # noqa: E402
+
+CREATED_AT = datetime(2024, 3, 1, 9, 30)
+
+
+def make_id(index: int) -> uuid.UUID:
+    return uuid.UUID(int=index, version=4)
+
+
+@pytest.fixture(scope="session")
+def access_token() -> str:
+    return create_access_token({"sub": str(make_id(1)), "role": "patient"}, timedelta(days=3650))
+
+
+@pytest.fixture(scope="session")
+def user() -> User:
+    return User(
+        id=make_id(1), email="ana.silva@example.com", password_hash="x", role=UserRole.PATIENT,
+        first_name="Ana", last_name="Silva", created_at=CREATED_AT, version=1
+    )
+
+
+def make_appointment(index: int) -> Appointment:
+    return Appointment(
+        id=make_id(1000 + index), patient_id=make_id(1), doctor_id=make_id(2),
+        appointment_time=CREATED_AT + timedelta(days=index), status=AppointmentStatus.BOOKED,
+        notes="Follow-up on blood pressure", created_at=CREATED_AT, version=1
+    )
+
+
+def make_prescription(index: int) -> Prescription:
+    return Prescription(
+        id=make_id(2000 + index), appointment_id=make_id(1000 + index), doctor_id=make_id(2), patient_id=make_id(1),
+        notes="Take with food",
+        medicines=[
+            {"name": "Amoxicillin", "dosage": "500mg", "duration": "7 days", "instructions": None},
+            {"name": "Ibuprofen", "dosage": "400mg", "duration": "5 days", "instructions": "After meals"},
+            {"name": "Omeprazole", "dosage": "20mg", "duration": "14 days", "instructions": None},
+        ],
+        created_at=CREATED_AT, version=1
+    )
+
+
+@pytest.fixture(scope="session")
+def appointment() -> Appointment:
+    return make_appointment(0)
+
+
+@pytest.fixture(scope="session")
+def appointments() -> list:
+    return [make_appointment(index) for index in range(100)]
+
+
+@pytest.fixture(scope="session")
+def prescription() -> Prescription:
+    return make_prescription(0)
+
+
+@pytest.fixture(scope="session")
+def prescriptions() -> list:
+    return [make_prescription(index) for index in range(100)]
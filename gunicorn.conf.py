@@ -0,0 +1,60 @@
+"""Gunicorn settings for running the API with several uvicorn worker processes.
+
+    gunicorn -c gunicorn.conf.py app.main:app
+
+The app is imported once in the master (``preload_app``) so tables are created
+once and workers fork with the code already loaded. Nothing that holds a socket
+or a thread is shared across the fork: ``post_fork`` drops the inherited
+database connections and restarts the logging and span exporter threads in each
+worker.
+"""
+import multiprocessing
+import os
+
+# Worker count defaults to one per core: the workers are async, and the CPU-heavy
+# work (bcrypt, JSON rendering) needs a core each, not extra processes per core.
+# With several workers the memory entity cache switches itself off, and /metrics
+# and /admin/profiles answer for the worker that served the request (see README,
+# Production Serving). WEB_CONCURRENCY=1 keeps everything in one process.
+workers = int(os.getenv("WEB_CONCURRENCY") or multiprocessing.cpu_count())
+# Read by app.core.config when the app is preloaded below, to size each worker's pool
+os.environ["WEB_CONCURRENCY"] = str(workers)
+
+worker_class = "uvicorn.workers.UvicornWorker"
+bind = os.getenv("BIND", f"0.0.0.0:{os.getenv('PORT', '8000')}")
+preload_app = True
+
+# Recycle workers after a number of requests (jittered so they do not restart together)
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "10000"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "1000"))
+# Time a recycled or stopping worker gets to finish in-flight requests and flush audit events
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+
+accesslog = None  # LoggingMiddleware already logs every request
+
+
+def when_ready(server):
+    from app.core.database import engine
+
+    # The master never queries again; close what create_all opened before forking
+    engine.dispose()
+
+
+def post_fork(server, worker):
+    from app.core.database import engine
+    from app.core.logging_config import restart_logging_after_fork
+    from app.core.tracing import tracer
+
+    # Any connection inherited from the master belongs to it; close=False leaves
+    # its sockets alone instead of closing them from the child
+    engine.dispose(close=False)
+    restart_logging_after_fork()
+    tracer.exporter.after_fork()
+
+
+def worker_exit(server, worker):
+    from app.core.logging_config import shutdown_logging
+
+    shutdown_logging()
@@ -1,22 +1,41 @@
 from fastapi import FastAPI, Depends, HTTPException, status, Header
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy import create_engine, Column, String, DateTime
+from sqlalchemy import Column, String, DateTime, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.dialects.postgresql import UUID
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+from contextlib import asynccontextmanager
 from datetime import datetime
+from typing import List, Optional
+import hmac
 import uuid
 import os
-import requests
+import httpx
+from shared.database import create_engine_from_env, session_dependency
+from shared.events import (
+    EventConsumer, OutboxRelay, consumer_offsets_table, create_event_bus_from_env, dead_letters_table,
+    outbox_table, record_event, worker_settings
+)
+from shared.http_client import create_http_client
+from shared.tracing import TracingMiddleware, tracer
 
 # Configuration
 DATABASE_URL = os.getenv("DATABASE_URL", "postgresql://user:password@db:5432/healthcare")
 AUTH_SERVICE_URL = os.getenv("AUTH_SERVICE_URL", "http://auth-service:8001")
+SERVICE_TOKEN = os.getenv("SERVICE_TOKEN")
+if not SERVICE_TOKEN:
+    raise RuntimeError("SERVICE_TOKEN must be set; it authenticates internal calls between services")
+MAX_LOOKUP_BATCH = 500
+
+# Tracing
+tracer.configure_from_env("appointment-service")
 
 # Database setup
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+engine = create_engine_from_env(DATABASE_URL)
+if tracer.enabled:
+    tracer.instrument_engine(engine.sync_engine)
+SessionLocal = async_sessionmaker(engine, expire_on_commit=False)
 Base = declarative_base()
 
 # Models
@@ -29,13 +48,42 @@ class Appointment(Base):
     status = Column(String, default="booked")
     notes = Column(String)
 
-Base.metadata.create_all(bind=engine)
+appointment_outbox = outbox_table(Base.metadata, "appointment_outbox")
+consumer_offsets = consumer_offsets_table(Base.metadata)
+event_dead_letters = dead_letters_table(Base.metadata)
+
+# Events
+def appointment_payload(appointment: Appointment) -> dict:
+    return {
+        "id": str(appointment.id),
+        "patient_id": str(appointment.patient_id),
+        "doctor_id": str(appointment.doctor_id),
+        "appointment_time": appointment.appointment_time.isoformat(),
+        "status": appointment.status,
+    }
+
+async def on_prescription_created(db: AsyncSession, event: dict):
+    """A prescribed appointment is completed, as in the monolith; replays are no-ops"""
+    appointment = await db.get(Appointment, uuid.UUID(event["payload"]["appointment_id"]), with_for_update=True)
+    if appointment is None or appointment.status != "booked":
+        return
+    appointment.status = "completed"
+    await record_event(db, appointment_outbox, "appointment.completed", appointment.id, appointment_payload(appointment))
+
+event_bus = create_event_bus_from_env(DATABASE_URL)
+outbox_relay = OutboxRelay(appointment_outbox, SessionLocal, event_bus, **worker_settings())
+event_consumer = EventConsumer(
+    "appointment-service", event_bus, SessionLocal, consumer_offsets, event_dead_letters,
+    {"prescription.created": on_prescription_created}, **worker_settings()
+)
+# Completions recorded by the consumer go out without waiting for the next poll
+event_consumer.on_commit.append(outbox_relay.notify)
 
 # Schemas
 class AppointmentCreate(BaseModel):
     doctor_id: str
     appointment_time: datetime
-    notes: str = None
+    notes: Optional[str] = None
 
 class AppointmentResponse(BaseModel):
     id: str
@@ -43,13 +91,36 @@ class AppointmentResponse(BaseModel):
     doctor_id: str
     appointment_time: datetime
     status: str
-    notes: str = None
+    notes: Optional[str] = None
     
     class Config:
         from_attributes = True
 
+class AppointmentLookupRequest(BaseModel):
+    ids: List[str] = Field(..., max_length=MAX_LOOKUP_BATCH)
+
+class AppointmentOwnership(BaseModel):
+    id: str
+    patient_id: str
+    doctor_id: str
+    status: str
+
 # FastAPI app
-app = FastAPI(title="Appointment Service", version="1.0.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    await event_bus.setup()
+    app.state.http = create_http_client()
+    outbox_relay.start()
+    event_consumer.start()
+    yield
+    await event_consumer.stop()
+    await outbox_relay.stop()
+    await app.state.http.aclose()
+    await engine.dispose()
+
+app = FastAPI(title="Appointment Service", version="1.0.0", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -59,37 +130,44 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if tracer.enabled:
+    app.add_middleware(TracingMiddleware)
+
 # Database dependency
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+get_db = session_dependency(SessionLocal)
 
 # Auth validation
-def validate_token(authorization: str = Header(None)):
+async def validate_token(authorization: str = Header(None)):
+    # Callers, the gateway included, send the user's own bearer token; identity is never taken from headers
     if not authorization or not authorization.startswith("Bearer "):
         raise HTTPException(status_code=401, detail="Missing or invalid token")
     
     token = authorization.split(" ")[1]
     try:
-        response = requests.post(
-            f"{AUTH_SERVICE_URL}/auth/validate-token",
-            headers={"Authorization": f"Bearer {token}"}
-        )
-        if response.status_code != 200:
-            raise HTTPException(status_code=401, detail="Invalid token")
-        return response.json()
-    except Exception:
+        with tracer.span("POST auth-service /auth/validate-token", kind="CLIENT") as span:
+            response = await app.state.http.post(
+                f"{AUTH_SERVICE_URL}/auth/validate-token",
+                headers=tracer.inject({"Authorization": f"Bearer {token}"})
+            )
+            if span is not None:
+                span.set_tag("http.status_code", response.status_code)
+    except httpx.HTTPError:
         raise HTTPException(status_code=401, detail="Auth service unavailable")
+    if response.status_code != 200:
+        raise HTTPException(status_code=401, detail="Invalid token")
+    return response.json()
+
+# Service-to-service authentication for internal endpoints
+async def validate_service_token(x_service_token: str = Header(None)):
+    if not x_service_token or not hmac.compare_digest(x_service_token, SERVICE_TOKEN):
+        raise HTTPException(status_code=401, detail="Invalid service token")
 
 
 # Endpoints
 @app.post("/appointments", response_model=AppointmentResponse, status_code=status.HTTP_201_CREATED)
-def create_appointment(
+async def create_appointment(
     appointment_data: AppointmentCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     user_data: dict = Depends(validate_token)
 ):
     if user_data.get("role") != "patient":
@@ -103,8 +181,10 @@ def create_appointment(
         status="booked"
     )
     db.add(appointment)
-    db.commit()
-    db.refresh(appointment)
+    await db.flush()
+    await record_event(db, appointment_outbox, "appointment.booked", appointment.id, appointment_payload(appointment))
+    await db.commit()
+    outbox_relay.notify()
     
     return AppointmentResponse(
         id=str(appointment.id),
@@ -116,18 +196,18 @@ def create_appointment(
     )
 
 @app.get("/appointments")
-def get_appointments(
-    db: Session = Depends(get_db),
+async def get_appointments(
+    db: AsyncSession = Depends(get_db),
     user_data: dict = Depends(validate_token)
 ):
     if user_data.get("role") == "patient":
-        appointments = db.query(Appointment).filter(
+        appointments = (await db.scalars(select(Appointment).where(
             Appointment.patient_id == uuid.UUID(user_data["user_id"])
-        ).all()
+        ))).all()
     elif user_data.get("role") == "doctor":
-        appointments = db.query(Appointment).filter(
+        appointments = (await db.scalars(select(Appointment).where(
             Appointment.doctor_id == uuid.UUID(user_data["user_id"])
-        ).all()
+        ))).all()
     else:
         appointments = []
     
@@ -142,6 +222,36 @@ def get_appointments(
         ) for a in appointments
     ]
 
+@app.post("/appointments/lookup", response_model=List[AppointmentOwnership])
+async def lookup_appointments(
+    lookup: AppointmentLookupRequest,
+    db: AsyncSession = Depends(get_db),
+    _: None = Depends(validate_service_token)
+):
+    """Ownership and status of many appointments in one query, for other services.
+
+    Unknown ids are left out of the response.
+    """
+    try:
+        ids = {uuid.UUID(appointment_id) for appointment_id in lookup.ids}
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid appointment id")
+    if not ids:
+        return []
+
+    rows = (await db.execute(select(
+        Appointment.id, Appointment.patient_id, Appointment.doctor_id, Appointment.status
+    ).where(Appointment.id.in_(ids)))).all()
+
+    return [
+        AppointmentOwnership(
+            id=str(row.id),
+            patient_id=str(row.patient_id),
+            doctor_id=str(row.doctor_id),
+            status=row.status
+        ) for row in rows
+    ]
+
 @app.get("/health")
-def health():
+async def health():
     return {"status": "healthy", "service": "appointment"}
@@ -1,26 +1,41 @@
 from fastapi import FastAPI, Depends, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from sqlalchemy import create_engine, Column, String
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import Column, String, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.dialects.postgresql import UUID
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 from passlib.context import CryptContext
-from jose import JWTError, jwt
+from jose import ExpiredSignatureError, JWTError, jwt
+from collections import OrderedDict
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
+from typing import List, Optional
+import time
 import uuid
 import os
+from shared.database import create_engine_from_env, session_dependency
+from shared.tracing import TracingMiddleware, tracer
 
 # Configuration
 DATABASE_URL = os.getenv("DATABASE_URL", "postgresql://user:password@db:5432/healthcare")
 SECRET_KEY = os.getenv("SECRET_KEY", "dev-secret-key")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+TOKEN_CACHE_TTL_SECONDS = float(os.getenv("TOKEN_CACHE_TTL_SECONDS", "60"))
+MAX_TOKEN_BATCH = 1000
+
+# Tracing
+tracer.configure_from_env("auth-service")
 
 # Database setup
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+engine = create_engine_from_env(DATABASE_URL)
+if tracer.enabled:
+    tracer.instrument_engine(engine.sync_engine)
+SessionLocal = async_sessionmaker(engine, expire_on_commit=False)
 Base = declarative_base()
 
 # Password hashing
@@ -37,8 +52,6 @@ class User(Base):
     first_name = Column(String)
     last_name = Column(String)
 
-Base.metadata.create_all(bind=engine)
-
 # Schemas
 class UserRegister(BaseModel):
     email: EmailStr
@@ -55,9 +68,25 @@ class Token(BaseModel):
     access_token: str
     token_type: str
 
+class TokenBatch(BaseModel):
+    tokens: List[str] = Field(..., max_length=MAX_TOKEN_BATCH)
+
+class TokenValidation(BaseModel):
+    valid: bool
+    user_id: Optional[str] = None
+    role: Optional[str] = None
+    error: Optional[str] = None
+
 
 # FastAPI app
-app = FastAPI(title="Auth Service", version="1.0.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield
+    await engine.dispose()
+
+app = FastAPI(title="Auth Service", version="1.0.0", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -67,20 +96,69 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if tracer.enabled:
+    app.add_middleware(TracingMiddleware)
+
 # Database dependency
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+get_db = session_dependency(SessionLocal)
 
 # Helper functions
-def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
-
-def get_password_hash(password):
-    return pwd_context.hash(password)
+# bcrypt is CPU bound by design; run it in the threadpool so it does not stall the event loop
+def _verify_password(plain_password, hashed_password):
+    with tracer.span("bcrypt.verify"):
+        return pwd_context.verify(plain_password, hashed_password)
+
+def _get_password_hash(password):
+    with tracer.span("bcrypt.hash"):
+        return pwd_context.hash(password)
+
+async def verify_password(plain_password, hashed_password):
+    return await run_in_threadpool(_verify_password, plain_password, hashed_password)
+
+async def get_password_hash(password):
+    return await run_in_threadpool(_get_password_hash, password)
+
+class VerifiedTokenCache:
+    """LRU of tokens whose signature has already been checked, mapped to their claims.
+
+    An entry is used until the token's own ``exp`` or ``ttl`` seconds after it was
+    verified, whichever comes first, so a hit never outlives the token.
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+
+    def get(self, token: str) -> Optional[dict]:
+        entry = self._entries.get(token)
+        if entry is None or entry[0] <= time.time():
+            self.misses += 1
+            return None
+        self._entries.move_to_end(token)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, token: str, claims: dict) -> None:
+        if self.max_entries <= 0:
+            return
+        expires_at = min(claims.get("exp", float("inf")), time.time() + self.ttl)
+        self._entries[token] = (expires_at, claims)
+        self._entries.move_to_end(token)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+token_cache = VerifiedTokenCache(TOKEN_CACHE_SIZE, TOKEN_CACHE_TTL_SECONDS)
+
+def verify_token(token: str) -> dict:
+    """Claims of a valid token; raises JWTError (ExpiredSignatureError when expired)"""
+    claims = token_cache.get(token)
+    if claims is None:
+        claims = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        token_cache.set(token, claims)
+    return claims
 
 def create_access_token(data: dict):
     to_encode = data.copy()
@@ -90,41 +168,56 @@ def create_access_token(data: dict):
 
 # Endpoints
 @app.post("/auth/register", status_code=status.HTTP_201_CREATED)
-def register(user_data: UserRegister, db: Session = Depends(get_db)):
-    existing = db.query(User).filter(User.email == user_data.email).first()
+async def register(user_data: UserRegister, db: AsyncSession = Depends(get_db)):
+    existing = await db.scalar(select(User.id).where(User.email == user_data.email))
     if existing:
         raise HTTPException(status_code=400, detail="Email already registered")
     
     user = User(
         email=user_data.email,
-        password_hash=get_password_hash(user_data.password),
+        password_hash=await get_password_hash(user_data.password),
         role=user_data.role,
         first_name=user_data.first_name,
         last_name=user_data.last_name
     )
     db.add(user)
-    db.commit()
+    await db.commit()
     return {"message": "User registered successfully"}
 
 @app.post("/auth/login", response_model=Token)
-def login(login_data: UserLogin, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == login_data.email).first()
-    if not user or not verify_password(login_data.password, user.password_hash):
+async def login(login_data: UserLogin, db: AsyncSession = Depends(get_db)):
+    user = await db.scalar(select(User).where(User.email == login_data.email))
+    if not user or not await verify_password(login_data.password, user.password_hash):
         raise HTTPException(status_code=401, detail="Invalid credentials")
     
     access_token = create_access_token(data={"sub": str(user.id), "role": user.role})
     return {"access_token": access_token, "token_type": "bearer"}
 
 @app.post("/auth/validate-token")
-def validate_token(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+async def validate_token(token: str = Depends(oauth2_scheme)):
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = verify_token(token)
         user_id = payload.get("sub")
         role = payload.get("role")
         return {"user_id": user_id, "role": role, "valid": True}
     except JWTError:
         raise HTTPException(status_code=401, detail="Invalid token")
 
+@app.post("/auth/validate-tokens", response_model=List[TokenValidation])
+async def validate_tokens(batch: TokenBatch):
+    """Validate many tokens in one call; results are in request order"""
+    results = []
+    for token in batch.tokens:
+        try:
+            payload = verify_token(token)
+        except ExpiredSignatureError:
+            results.append(TokenValidation(valid=False, error="expired"))
+        except JWTError:
+            results.append(TokenValidation(valid=False, error="invalid"))
+        else:
+            results.append(TokenValidation(valid=True, user_id=payload.get("sub"), role=payload.get("role")))
+    return results
+
 @app.get("/health")
-def health():
+async def health():
     return {"status": "healthy", "service": "auth"}
@@ -0,0 +1,209 @@
+from fastapi import FastAPI, HTTPException, Header
+from fastapi.middleware.cors import CORSMiddleware
+from typing import Dict, Hashable, List, Optional
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+import asyncio
+import time
+import os
+import httpx
+from shared.http_client import create_http_client
+from shared.tracing import TracingMiddleware, tracer
+
+# Configuration
+AUTH_SERVICE_URL = os.getenv("AUTH_SERVICE_URL", "http://auth-service:8001")
+APPOINTMENT_SERVICE_URL = os.getenv("APPOINTMENT_SERVICE_URL", "http://appointment-service:8002")
+PRESCRIPTION_SERVICE_URL = os.getenv("PRESCRIPTION_SERVICE_URL", "http://prescription-service:8003")
+AUTH_TIMEOUT_MS = float(os.getenv("AUTH_TIMEOUT_MS", "1000"))
+APPOINTMENT_TIMEOUT_MS = float(os.getenv("APPOINTMENT_TIMEOUT_MS", "1000"))
+PRESCRIPTION_TIMEOUT_MS = float(os.getenv("PRESCRIPTION_TIMEOUT_MS", "1000"))
+DASHBOARD_CACHE_TTL_SECONDS = float(os.getenv("DASHBOARD_CACHE_TTL_SECONDS", "2"))
+
+# Tracing
+tracer.configure_from_env("gateway-service")
+
+
+# Read cache
+class TTLCache:
+    """Small LRU cache whose entries expire after ``ttl`` seconds"""
+
+    def __init__(self, ttl: float, max_entries: int = 10000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+    def get(self, key: Hashable):
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def set(self, key: Hashable, value) -> None:
+        if self.ttl <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+identity_cache = TTLCache(DASHBOARD_CACHE_TTL_SECONDS)
+read_cache = TTLCache(DASHBOARD_CACHE_TTL_SECONDS)
+
+
+# FastAPI app
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.http = create_http_client()
+    yield
+    await app.state.http.aclose()
+
+app = FastAPI(title="API Gateway", version="1.0.0", lifespan=lifespan)
+
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+if tracer.enabled:
+    app.add_middleware(TracingMiddleware)
+
+
+# Auth validation
+async def authenticate(authorization: Optional[str], fresh: bool) -> dict:
+    """Validate the bearer token with the auth service once per request (or per cache TTL)"""
+    if not authorization or not authorization.startswith("Bearer "):
+        raise HTTPException(status_code=401, detail="Missing or invalid token")
+
+    token = authorization.split(" ")[1]
+    identity = None if fresh else identity_cache.get(token)
+    if identity is not None:
+        return identity
+
+    try:
+        with tracer.span("POST auth-service /auth/validate-token", kind="CLIENT") as span:
+            response = await asyncio.wait_for(
+                app.state.http.post(
+                    f"{AUTH_SERVICE_URL}/auth/validate-token",
+                    headers=tracer.inject({"Authorization": f"Bearer {token}"})
+                ),
+                AUTH_TIMEOUT_MS / 1000
+            )
+            if span is not None:
+                span.set_tag("http.status_code", response.status_code)
+    except (httpx.HTTPError, asyncio.TimeoutError):
+        raise HTTPException(status_code=503, detail="Auth service unavailable")
+    if response.status_code != 200:
+        raise HTTPException(status_code=401, detail="Invalid token")
+
+    identity = response.json()
+    identity_cache.set(token, identity)
+    return identity
+
+
+# Backend calls
+async def fetch_backend(name: str, url: str, authorization: str, identity: dict, timeout_ms: float, fresh: bool):
+    """GET a backend on behalf of an authenticated user, with a deadline and a short-lived cache"""
+    key = (identity["user_id"], name)
+    if not fresh:
+        cached = read_cache.get(key)
+        if cached is not None:
+            return cached
+
+    with tracer.span(f"GET {name}", kind="CLIENT") as span:
+        # The backends verify the caller's own token; auth-service answers repeats from its verified-token cache
+        headers = tracer.inject({"Authorization": authorization})
+        response = await asyncio.wait_for(app.state.http.get(url, headers=headers), timeout_ms / 1000)
+        if span is not None:
+            span.set_tag("http.status_code", response.status_code)
+    response.raise_for_status()
+    data = response.json()
+    read_cache.set(key, data)
+    return data
+
+
+def describe_failure(exc: BaseException, timeout_ms: float) -> str:
+    if isinstance(exc, asyncio.TimeoutError):
+        return f"timed out after {timeout_ms:.0f} ms"
+    if isinstance(exc, httpx.HTTPStatusError):
+        return f"returned {exc.response.status_code}"
+    return "unavailable"
+
+
+def parse_time(value: str) -> datetime:
+    """A backend timestamp as naive UTC, whatever offset or precision it was serialized with"""
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def merge_dashboard(appointments: Optional[List[dict]], prescriptions: Optional[List[dict]]) -> dict:
+    summary = {"upcoming_appointments": None, "next_appointment": None, "prescriptions": None}
+    if prescriptions is not None:
+        summary["prescriptions"] = len(prescriptions)
+    if appointments is not None:
+        by_appointment = {p["appointment_id"]: p for p in prescriptions or []}
+        appointments = sorted(appointments, key=lambda a: parse_time(a["appointment_time"]))
+        appointments = [
+            {**a, "prescription": by_appointment.get(a["id"]) if prescriptions is not None else None}
+            for a in appointments
+        ]
+        now = datetime.utcnow()
+        upcoming = [a for a in appointments if a["status"] == "booked" and parse_time(a["appointment_time"]) >= now]
+        summary["upcoming_appointments"] = len(upcoming)
+        summary["next_appointment"] = upcoming[0] if upcoming else None
+    return {"appointments": appointments, "prescriptions": prescriptions, "summary": summary}
+
+
+# Endpoints
+@app.get("/dashboard")
+async def dashboard(
+    authorization: str = Header(None),
+    cache_control: str = Header(None)
+):
+    """Everything the patient/doctor dashboard needs in one round trip.
+
+    Backends are called concurrently, each under its own deadline. A backend that
+    fails or times out is reported in ``errors`` and its section is ``null``;
+    the rest of the dashboard is still returned.
+    """
+    fresh = cache_control is not None and "no-cache" in cache_control
+    identity = await authenticate(authorization, fresh)
+
+    backends = {
+        "appointments": (f"{APPOINTMENT_SERVICE_URL}/appointments", APPOINTMENT_TIMEOUT_MS),
+        "prescriptions": (f"{PRESCRIPTION_SERVICE_URL}/prescriptions", PRESCRIPTION_TIMEOUT_MS),
+    }
+    results = await asyncio.gather(
+        *(
+            fetch_backend(name, url, authorization, identity, timeout_ms, fresh)
+            for name, (url, timeout_ms) in backends.items()
+        ),
+        return_exceptions=True
+    )
+
+    sections: Dict[str, Optional[list]] = {}
+    errors: Dict[str, str] = {}
+    for (name, (_, timeout_ms)), result in zip(backends.items(), results):
+        if isinstance(result, BaseException):
+            errors[name] = describe_failure(result, timeout_ms)
+            sections[name] = None
+        else:
+            sections[name] = result
+
+    return {
+        "user": {"user_id": identity["user_id"], "role": identity["role"]},
+        **merge_dashboard(sections["appointments"], sections["prescriptions"]),
+        "partial": bool(errors),
+        "errors": errors,
+    }
+
+@app.get("/health")
+async def health():
+    return {"status": "healthy", "service": "gateway"}
@@ -1,22 +1,45 @@
 from fastapi import FastAPI, Depends, HTTPException, status, Header
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy import create_engine, Column, String, JSON
+from sqlalchemy import Column, String, JSON, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.dialects.postgresql import UUID
 from pydantic import BaseModel
-from typing import List
+from typing import Dict, Iterable, List, Optional, Set
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+import asyncio
+import time
 import uuid
 import os
-import requests
+import httpx
+from shared.database import create_engine_from_env, session_dependency
+from shared.events import (
+    EventConsumer, OutboxRelay, consumer_offsets_table, create_event_bus_from_env, dead_letters_table,
+    outbox_table, record_event, worker_settings
+)
+from shared.http_client import create_http_client
+from shared.tracing import TracingMiddleware, tracer
 
 # Configuration
 DATABASE_URL = os.getenv("DATABASE_URL", "postgresql://user:password@db:5432/healthcare")
 AUTH_SERVICE_URL = os.getenv("AUTH_SERVICE_URL", "http://auth-service:8001")
+APPOINTMENT_SERVICE_URL = os.getenv("APPOINTMENT_SERVICE_URL", "http://appointment-service:8002")
+SERVICE_TOKEN = os.getenv("SERVICE_TOKEN")
+if not SERVICE_TOKEN:
+    raise RuntimeError("SERVICE_TOKEN must be set; it authenticates internal calls between services")
+APPOINTMENT_CACHE_TTL_SECONDS = float(os.getenv("APPOINTMENT_CACHE_TTL_SECONDS", "5"))
+APPOINTMENT_LOOKUP_WINDOW_MS = float(os.getenv("APPOINTMENT_LOOKUP_WINDOW_MS", "2"))
+PRESCRIBABLE_STATUSES = ("booked", "completed")
+
+# Tracing
+tracer.configure_from_env("prescription-service")
 
 # Database setup
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+engine = create_engine_from_env(DATABASE_URL)
+if tracer.enabled:
+    tracer.instrument_engine(engine.sync_engine)
+SessionLocal = async_sessionmaker(engine, expire_on_commit=False)
 Base = declarative_base()
 
 # Models
@@ -29,18 +52,48 @@ class Prescription(Base):
     notes = Column(String)
     medicines = Column(JSON)
 
-Base.metadata.create_all(bind=engine)
+class AppointmentView(Base):
+    """Local read model of appointment ownership, kept up to date from appointment events"""
+    __tablename__ = "prescription_appointment_views"
+    id = Column(UUID(as_uuid=True), primary_key=True)
+    patient_id = Column(UUID(as_uuid=True))
+    doctor_id = Column(UUID(as_uuid=True))
+    status = Column(String)
+
+prescription_outbox = outbox_table(Base.metadata, "prescription_outbox")
+consumer_offsets = consumer_offsets_table(Base.metadata)
+event_dead_letters = dead_letters_table(Base.metadata)
+
+# Events
+async def on_appointment_changed(db: AsyncSession, event: dict):
+    """Upsert the read model; events arrive in log order, so replays converge on the same row"""
+    payload = event["payload"]
+    view = await db.get(AppointmentView, uuid.UUID(payload["id"]))
+    if view is None:
+        view = AppointmentView(id=uuid.UUID(payload["id"]))
+        db.add(view)
+    view.patient_id = uuid.UUID(payload["patient_id"])
+    view.doctor_id = uuid.UUID(payload["doctor_id"])
+    view.status = payload["status"]
+
+event_bus = create_event_bus_from_env(DATABASE_URL)
+outbox_relay = OutboxRelay(prescription_outbox, SessionLocal, event_bus, **worker_settings())
+event_consumer = EventConsumer(
+    "prescription-service", event_bus, SessionLocal, consumer_offsets, event_dead_letters,
+    {"appointment.booked": on_appointment_changed, "appointment.completed": on_appointment_changed},
+    **worker_settings()
+)
 
 # Schemas
 class Medicine(BaseModel):
     name: str
     dosage: str
     duration: str
-    instructions: str = None
+    instructions: Optional[str] = None
 
 class PrescriptionCreate(BaseModel):
     appointment_id: str
-    notes: str = None
+    notes: Optional[str] = None
     medicines: List[Medicine]
 
 class PrescriptionResponse(BaseModel):
@@ -48,14 +101,28 @@ class PrescriptionResponse(BaseModel):
     appointment_id: str
     doctor_id: str
     patient_id: str
-    notes: str = None
+    notes: Optional[str] = None
     medicines: List[dict]
     
     class Config:
         from_attributes = True
 
 # FastAPI app
-app = FastAPI(title="Prescription Service", version="1.0.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    await event_bus.setup()
+    app.state.http = appointment_lookup.client = create_http_client()
+    outbox_relay.start()
+    event_consumer.start()
+    yield
+    await event_consumer.stop()
+    await outbox_relay.stop()
+    await app.state.http.aclose()
+    await engine.dispose()
+
+app = FastAPI(title="Prescription Service", version="1.0.0", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -65,61 +132,212 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if tracer.enabled:
+    app.add_middleware(TracingMiddleware)
+
 # Database dependency
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+get_db = session_dependency(SessionLocal)
 
 # Auth validation
-def validate_token(authorization: str = Header(None)):
+async def validate_token(authorization: str = Header(None)):
+    # Callers, the gateway included, send the user's own bearer token; identity is never taken from headers
     if not authorization or not authorization.startswith("Bearer "):
         raise HTTPException(status_code=401, detail="Missing or invalid token")
     
     token = authorization.split(" ")[1]
     try:
-        response = requests.post(
-            f"{AUTH_SERVICE_URL}/auth/validate-token",
-            headers={"Authorization": f"Bearer {token}"}
-        )
-        if response.status_code != 200:
-            raise HTTPException(status_code=401, detail="Invalid token")
-        return response.json()
-    except Exception:
+        with tracer.span("POST auth-service /auth/validate-token", kind="CLIENT") as span:
+            response = await app.state.http.post(
+                f"{AUTH_SERVICE_URL}/auth/validate-token",
+                headers=tracer.inject({"Authorization": f"Bearer {token}"})
+            )
+            if span is not None:
+                span.set_tag("http.status_code", response.status_code)
+    except httpx.HTTPError:
         raise HTTPException(status_code=401, detail="Auth service unavailable")
+    if response.status_code != 200:
+        raise HTTPException(status_code=401, detail="Invalid token")
+    return response.json()
+
+
+# Appointment lookup
+class AppointmentServiceUnavailable(Exception):
+    pass
+
+
+class AppointmentLookup:
+    """Resolves appointment ownership from the appointment service.
+
+    Results are cached for a short TTL. Concurrent lookups of the same appointment
+    share one pending future, and ids requested by concurrent requests within
+    ``window`` seconds go out together in a single ``POST /appointments/lookup``.
+    Everything runs on the event loop, so no locking is needed.
+    """
+
+    def __init__(self, base_url: str, ttl: float, window: float, max_batch: int = 500,
+                 max_entries: int = 10000, timeout: float = 5.0):
+        self.base_url = base_url
+        self.ttl = ttl
+        self.window = window
+        self.max_batch = max_batch
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self.client: Optional[httpx.AsyncClient] = None
+        self._cache: "OrderedDict[str, tuple]" = OrderedDict()
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._queued: List[str] = []
+        self._dispatches: Set[asyncio.Task] = set()
+
+    async def get(self, appointment_id: str) -> Optional[dict]:
+        return (await self.get_many([appointment_id])).get(appointment_id)
+
+    async def get_many(self, appointment_ids: Iterable[str]) -> Dict[str, dict]:
+        """Appointments by id; ids the appointment service does not know are left out"""
+        found: Dict[str, dict] = {}
+        waiting: Dict[str, asyncio.Future] = {}
+        now = time.monotonic()
+        loop = asyncio.get_running_loop()
+        for appointment_id in appointment_ids:
+            cached = self._cache.get(appointment_id)
+            if cached is not None and cached[0] > now:
+                found[appointment_id] = cached[1]
+                continue
+            future = self._pending.get(appointment_id)
+            if future is None:
+                future = self._pending[appointment_id] = loop.create_future()
+                if not self._queued:
+                    # The loop keeps only weak references to tasks; hold each until it is done,
+                    # including one still fetching after the next window has opened
+                    task = asyncio.create_task(self._dispatch_after_window())
+                    self._dispatches.add(task)
+                    task.add_done_callback(self._dispatches.discard)
+                self._queued.append(appointment_id)
+            waiting[appointment_id] = future
+
+        if waiting:
+            # Shielded so one caller timing out or disconnecting does not cancel the shared result
+            try:
+                await asyncio.wait_for(asyncio.shield(asyncio.gather(*waiting.values())), self.timeout * 2)
+            except asyncio.TimeoutError:
+                raise AppointmentServiceUnavailable("Timed out waiting for appointment lookup")
+            for appointment_id, future in waiting.items():
+                if future.result() is not None:
+                    found[appointment_id] = future.result()
+        return found
+
+    async def _dispatch_after_window(self) -> None:
+        await asyncio.sleep(self.window)
+        queued, self._queued = self._queued, []
+        await asyncio.gather(*(
+            self._fetch(queued[start:start + self.max_batch])
+            for start in range(0, len(queued), self.max_batch)
+        ))
+
+    async def _fetch(self, appointment_ids: List[str]) -> None:
+        try:
+            with tracer.span("POST appointment-service /appointments/lookup", kind="CLIENT") as span:
+                response = await self.client.post(
+                    f"{self.base_url}/appointments/lookup",
+                    json={"ids": appointment_ids},
+                    headers=tracer.inject({"X-Service-Token": SERVICE_TOKEN}),
+                    timeout=self.timeout
+                )
+                if span is not None:
+                    span.set_tag("batch.size", len(appointment_ids))
+                    span.set_tag("http.status_code", response.status_code)
+            response.raise_for_status()
+            appointments = {appointment["id"]: appointment for appointment in response.json()}
+        except Exception as exc:
+            error = AppointmentServiceUnavailable(str(exc))
+            for appointment_id in appointment_ids:
+                self._pending.pop(appointment_id).set_exception(error)
+            return
+
+        expires_at = time.monotonic() + self.ttl
+        for appointment_id in appointment_ids:
+            appointment = appointments.get(appointment_id)
+            # Misses are not cached: the appointment may be created a moment later
+            if appointment is not None:
+                self._cache[appointment_id] = (expires_at, appointment)
+                self._cache.move_to_end(appointment_id)
+            self._pending.pop(appointment_id).set_result(appointment)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+
+appointment_lookup = AppointmentLookup(
+    APPOINTMENT_SERVICE_URL,
+    ttl=APPOINTMENT_CACHE_TTL_SECONDS,
+    window=APPOINTMENT_LOOKUP_WINDOW_MS / 1000
+)
+
+
+async def resolve_appointment(db: AsyncSession, appointment_id: uuid.UUID) -> Optional[dict]:
+    """Local read model first; an appointment booked moments ago may not have arrived yet"""
+    view = await db.get(AppointmentView, appointment_id)
+    if view is not None:
+        return {
+            "id": str(view.id),
+            "patient_id": str(view.patient_id),
+            "doctor_id": str(view.doctor_id),
+            "status": view.status,
+        }
+    return await appointment_lookup.get(str(appointment_id))
 
 
 # Endpoints
 @app.post("/prescriptions", response_model=PrescriptionResponse, status_code=status.HTTP_201_CREATED)
-def create_prescription(
+async def create_prescription(
     prescription_data: PrescriptionCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     user_data: dict = Depends(validate_token)
 ):
     if user_data.get("role") != "doctor":
         raise HTTPException(status_code=403, detail="Only doctors can create prescriptions")
     
+    try:
+        appointment_id = uuid.UUID(prescription_data.appointment_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid appointment id")
+    
+    # Verify appointment exists and belongs to the doctor
+    try:
+        appointment = await resolve_appointment(db, appointment_id)
+    except AppointmentServiceUnavailable:
+        raise HTTPException(status_code=503, detail="Appointment service unavailable")
+    if appointment is None:
+        raise HTTPException(status_code=404, detail="Appointment not found")
+    if appointment["doctor_id"] != user_data["user_id"]:
+        raise HTTPException(status_code=403, detail="Not authorized to create prescription for this appointment")
+    if appointment["status"] not in PRESCRIBABLE_STATUSES:
+        raise HTTPException(status_code=400, detail=f"Cannot prescribe for a {appointment['status']} appointment")
+    
     # Check if prescription already exists
-    existing = db.query(Prescription).filter(
-        Prescription.appointment_id == uuid.UUID(prescription_data.appointment_id)
-    ).first()
+    existing = await db.scalar(select(Prescription.id).where(
+        Prescription.appointment_id == appointment_id
+    ))
     if existing:
         raise HTTPException(status_code=400, detail="Prescription already exists")
     
     medicines_dict = [med.dict() for med in prescription_data.medicines]
     
     prescription = Prescription(
-        appointment_id=uuid.UUID(prescription_data.appointment_id),
+        appointment_id=appointment_id,
         doctor_id=uuid.UUID(user_data["user_id"]),
-        patient_id=uuid.uuid4(),  # In real app, get from appointment
+        patient_id=uuid.UUID(appointment["patient_id"]),
         notes=prescription_data.notes,
         medicines=medicines_dict
     )
     db.add(prescription)
-    db.commit()
-    db.refresh(prescription)
+    await db.flush()
+    await record_event(db, prescription_outbox, "prescription.created", prescription.id, {
+        "id": str(prescription.id),
+        "appointment_id": str(prescription.appointment_id),
+        "doctor_id": str(prescription.doctor_id),
+        "patient_id": str(prescription.patient_id),
+    })
+    await db.commit()
+    outbox_relay.notify()
     
     return PrescriptionResponse(
         id=str(prescription.id),
@@ -131,18 +349,18 @@ def create_prescription(
     )
 
 @app.get("/prescriptions")
-def get_prescriptions(
-    db: Session = Depends(get_db),
+async def get_prescriptions(
+    db: AsyncSession = Depends(get_db),
     user_data: dict = Depends(validate_token)
 ):
     if user_data.get("role") == "patient":
-        prescriptions = db.query(Prescription).filter(
+        prescriptions = (await db.scalars(select(Prescription).where(
             Prescription.patient_id == uuid.UUID(user_data["user_id"])
-        ).all()
+        ))).all()
     elif user_data.get("role") == "doctor":
-        prescriptions = db.query(Prescription).filter(
+        prescriptions = (await db.scalars(select(Prescription).where(
             Prescription.doctor_id == uuid.UUID(user_data["user_id"])
-        ).all()
+        ))).all()
     else:
         prescriptions = []
     
@@ -158,5 +376,5 @@ def get_prescriptions(
     ]
 
 @app.get("/health")
-def health():
+async def health():
     return {"status": "healthy", "service": "prescription"}
@@ -0,0 +1 @@
+# Code shared by the microservices; copied into each service image
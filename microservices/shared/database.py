@@ -0,0 +1,48 @@
+"""Async SQLAlchemy engine and session factory shared by the services"""
+import os
+from typing import AsyncIterator
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+_ASYNC_DRIVERS = {
+    "postgresql://": "postgresql+asyncpg://",
+    "postgres://": "postgresql+asyncpg://",
+    "sqlite://": "sqlite+aiosqlite://",
+}
+
+
+def async_url(url: str) -> str:
+    """Switch a plain DATABASE_URL to its async driver (asyncpg / aiosqlite)"""
+    for prefix, replacement in _ASYNC_DRIVERS.items():
+        if url.startswith(prefix):
+            return replacement + url[len(prefix):]
+    return url
+
+
+def create_engine_from_env(url: str) -> AsyncEngine:
+    """Engine with an explicitly sized pool.
+
+    One service instance is one event loop, so the pool bounds how many queries
+    run concurrently; requests beyond ``DB_POOL_SIZE + DB_MAX_OVERFLOW`` wait up
+    to ``DB_POOL_TIMEOUT`` seconds for a connection instead of piling more load
+    onto Postgres. Keep (pool size + overflow) x instances x services below the
+    server's ``max_connections``.
+    """
+    url = async_url(url)
+    if url.startswith("sqlite"):
+        return create_async_engine(url)
+    return create_async_engine(
+        url,
+        pool_size=int(os.getenv("DB_POOL_SIZE", "15")),
+        max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "10")),
+        pool_timeout=float(os.getenv("DB_POOL_TIMEOUT", "5")),
+        pool_recycle=int(os.getenv("DB_POOL_RECYCLE", "1800")),
+        pool_pre_ping=os.getenv("DB_POOL_PRE_PING", "false").lower() == "true",
+    )
+
+
+def session_dependency(session_factory: async_sessionmaker):
+    async def get_db() -> AsyncIterator[AsyncSession]:
+        async with session_factory() as session:
+            yield session
+
+    return get_db
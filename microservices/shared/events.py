@@ -0,0 +1,360 @@
+"""Transactional outbox, event bus and offset-tracking consumers.
+
+A service records events in its outbox table inside the same transaction as the
+state change they describe (``record_event``). ``OutboxRelay`` publishes unsent
+outbox rows to the bus in batches; a crash between publishing and marking rows
+sent means a batch can be published twice, so the bus drops events whose id it
+has already seen. ``EventConsumer`` reads the bus from its last committed
+offset and commits the new offset in the same transaction as the handlers'
+writes, so each event takes effect exactly once per consumer. An event whose
+handler keeps failing is moved to a dead-letter table after ``EVENT_MAX_ATTEMPTS``
+tries instead of blocking the consumer.
+"""
+import os
+import uuid
+import asyncio
+import logging
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from sqlalchemy import (
+    BigInteger, Column, DateTime, Index, Integer, JSON, MetaData, String, Table, func, insert, select, update
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from shared.database import create_engine_from_env
+
+logger = logging.getLogger("events")
+
+# SQLite only auto-increments INTEGER PRIMARY KEY columns
+_Sequence = BigInteger().with_variant(Integer, "sqlite")
+
+# pg_advisory_xact_lock key held while appending to the event log
+EVENT_LOG_LOCK_ID = 0x6576656E74
+MAX_ATTEMPTS = int(os.getenv("EVENT_MAX_ATTEMPTS", "5"))
+
+Event = dict
+Handler = Callable[[AsyncSession, Event], Awaitable[None]]
+
+
+def outbox_table(metadata: MetaData, name: str) -> Table:
+    table = Table(
+        name,
+        metadata,
+        Column("seq", _Sequence, primary_key=True, autoincrement=True),
+        Column("event_id", String(36), nullable=False, unique=True),
+        Column("event_type", String, nullable=False),
+        Column("aggregate_id", String, nullable=False),
+        Column("payload", JSON, nullable=False),
+        Column("created_at", DateTime, nullable=False),
+        Column("published_at", DateTime),
+    )
+    # The relay only ever scans unpublished rows
+    Index(f"ix_{name}_unpublished", table.c.seq, postgresql_where=table.c.published_at.is_(None))
+    return table
+
+
+def consumer_offsets_table(metadata: MetaData) -> Table:
+    return Table(
+        "consumer_offsets",
+        metadata,
+        Column("consumer", String, primary_key=True),
+        Column("last_offset", BigInteger, nullable=False, default=0),
+        Column("updated_at", DateTime),
+    )
+
+
+def dead_letters_table(metadata: MetaData) -> Table:
+    """Events a consumer gave up on after ``MAX_ATTEMPTS`` failed handler runs"""
+    return Table(
+        "event_dead_letters",
+        metadata,
+        Column("consumer", String, primary_key=True),
+        Column("event_id", String(36), primary_key=True),
+        Column("event_type", String, nullable=False),
+        Column("aggregate_id", String, nullable=False),
+        Column("payload", JSON, nullable=False),
+        Column("error", String, nullable=False),
+        Column("attempts", Integer, nullable=False),
+        Column("failed_at", DateTime, nullable=False),
+    )
+
+
+async def record_event(session: AsyncSession, outbox: Table, event_type: str, aggregate_id, payload: dict) -> None:
+    """Add an event to the outbox as part of the session's current transaction"""
+    await session.execute(insert(outbox).values(
+        event_id=str(uuid.uuid4()),
+        event_type=event_type,
+        aggregate_id=str(aggregate_id),
+        payload=payload,
+        created_at=datetime.utcnow(),
+    ))
+
+
+def _insert_ignoring_duplicates(engine: AsyncEngine, table: Table, rows: List[dict]):
+    if engine.dialect.name == "postgresql":
+        return postgresql.insert(table).values(rows).on_conflict_do_nothing(index_elements=["event_id"])
+    if engine.dialect.name == "sqlite":
+        return sqlite.insert(table).values(rows).on_conflict_do_nothing(index_elements=["event_id"])
+    return insert(table).values(rows)
+
+
+class InMemoryEventBus:
+    """Bus for a single process (tests, running everything in one interpreter)"""
+
+    def __init__(self):
+        self._log: List[Event] = []
+        self._seen: set = set()
+
+    async def setup(self) -> None:
+        pass
+
+    async def publish(self, events: List[Event]) -> None:
+        for event in events:
+            if event["id"] not in self._seen:
+                self._seen.add(event["id"])
+                self._log.append(event)
+
+    async def read(self, after: int, limit: int) -> List[Tuple[int, Event]]:
+        return [(offset, event) for offset, event in enumerate(self._log[after:after + limit], start=after + 1)]
+
+
+class DatabaseEventBus:
+    """Append-only event log in a database table, standing in for a broker such as Kafka.
+
+    Offsets are the log's sequence numbers; every consumer reads the whole log in order.
+    Consumers read ``seq > offset``, so a sequence number must never become
+    visible after a higher one: appends are serialized (an advisory lock on
+    PostgreSQL, the database write lock on SQLite), so rows commit in seq order.
+    """
+
+    def __init__(self, engine: AsyncEngine):
+        self.engine = engine
+        self.metadata = MetaData()
+        self.log = Table(
+            "event_log",
+            self.metadata,
+            Column("seq", _Sequence, primary_key=True, autoincrement=True),
+            Column("event_id", String(36), nullable=False, unique=True),
+            Column("event_type", String, nullable=False),
+            Column("aggregate_id", String, nullable=False),
+            Column("payload", JSON, nullable=False),
+            Column("occurred_at", DateTime, nullable=False),
+        )
+
+    async def setup(self) -> None:
+        async with self.engine.begin() as conn:
+            await conn.run_sync(self.metadata.create_all)
+
+    async def publish(self, events: List[Event]) -> None:
+        if not events:
+            return
+        rows = [{
+            "event_id": event["id"],
+            "event_type": event["type"],
+            "aggregate_id": event["aggregate_id"],
+            "payload": event["payload"],
+            "occurred_at": event["occurred_at"],
+        } for event in events]
+        async with self.engine.begin() as conn:
+            if self.engine.dialect.name == "postgresql":
+                # Held until commit; seq values are drawn after it is taken
+                await conn.execute(select(func.pg_advisory_xact_lock(EVENT_LOG_LOCK_ID)))
+            await conn.execute(_insert_ignoring_duplicates(self.engine, self.log, rows))
+
+    async def read(self, after: int, limit: int) -> List[Tuple[int, Event]]:
+        async with self.engine.connect() as conn:
+            rows = (await conn.execute(
+                select(self.log).where(self.log.c.seq > after).order_by(self.log.c.seq).limit(limit)
+            )).all()
+        return [(row.seq, {
+            "id": row.event_id,
+            "type": row.event_type,
+            "aggregate_id": row.aggregate_id,
+            "payload": row.payload,
+            "occurred_at": row.occurred_at,
+        }) for row in rows]
+
+
+def create_event_bus_from_env(database_url: str):
+    """``EVENT_BUS=database`` (default, on ``EVENT_BUS_URL`` or the service database) or ``memory``"""
+    if os.getenv("EVENT_BUS", "database") == "memory":
+        return InMemoryEventBus()
+    return DatabaseEventBus(create_engine_from_env(os.getenv("EVENT_BUS_URL") or database_url))
+
+
+class _Worker:
+    """Background loop that runs ``step`` until it finds nothing to do, then waits"""
+
+    def __init__(self, poll_interval: float):
+        self.poll_interval = poll_interval
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def notify(self) -> None:
+        """Run the next pass now instead of at the next poll"""
+        self._wake.set()
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def step(self) -> bool:
+        raise NotImplementedError
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                if await self.step():
+                    continue
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("%s failed, retrying", type(self).__name__)
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+
+class OutboxRelay(_Worker):
+    """Publishes a service's outbox rows to the bus in order, one batch per transaction"""
+
+    def __init__(self, outbox: Table, session_factory: async_sessionmaker, bus,
+                 batch_size: int = 100, poll_interval: float = 0.5):
+        super().__init__(poll_interval)
+        self.outbox = outbox
+        self.session_factory = session_factory
+        self.bus = bus
+        self.batch_size = batch_size
+
+    async def step(self) -> bool:
+        """Publish one batch; True when the batch was full and more may be waiting"""
+        outbox = self.outbox
+        async with self.session_factory() as session, session.begin():
+            # SKIP LOCKED lets several instances relay side by side without sending a row twice
+            rows = (await session.execute(
+                select(outbox)
+                .where(outbox.c.published_at.is_(None))
+                .order_by(outbox.c.seq)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+            )).all()
+            if not rows:
+                return False
+            await self.bus.publish([{
+                "id": row.event_id,
+                "type": row.event_type,
+                "aggregate_id": row.aggregate_id,
+                "payload": row.payload,
+                "occurred_at": row.created_at,
+            } for row in rows])
+            await session.execute(
+                update(outbox)
+                .where(outbox.c.seq.in_([row.seq for row in rows]))
+                .values(published_at=datetime.utcnow())
+            )
+        return len(rows) == self.batch_size
+
+
+class EventConsumer(_Worker):
+    """Applies bus events to a service's own database, tracking its offset there.
+
+    The offset row is locked for the batch, so several instances of a service
+    share the work without applying an event twice. Each handler runs in a
+    savepoint: when one fails, the events before it are committed and the
+    failing event is retried on the next pass, up to ``max_attempts`` times,
+    after which it is recorded in ``dead_letters`` and skipped. Attempts are
+    counted per instance.
+    """
+
+    def __init__(self, name: str, bus, session_factory: async_sessionmaker, offsets: Table, dead_letters: Table,
+                 handlers: Dict[str, Handler], batch_size: int = 100, poll_interval: float = 0.5,
+                 max_attempts: int = MAX_ATTEMPTS):
+        super().__init__(poll_interval)
+        self.name = name
+        self.bus = bus
+        self.session_factory = session_factory
+        self.offsets = offsets
+        self.dead_letters = dead_letters
+        self.handlers = handlers
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.dead_lettered = 0
+        self.on_commit: List[Callable[[], None]] = []
+        self._attempts: Dict[str, int] = {}
+
+    async def step(self) -> bool:
+        """Apply one batch; True when the batch was full and more may be waiting"""
+        offsets = self.offsets
+        async with self.session_factory() as session, session.begin():
+            offset = await session.scalar(
+                select(offsets.c.last_offset).where(offsets.c.consumer == self.name).with_for_update()
+            )
+            if offset is None:
+                await session.execute(insert(offsets).values(consumer=self.name, last_offset=0))
+                offset = 0
+
+            batch = await self.bus.read(offset, self.batch_size)
+            if not batch:
+                return False
+            applied = 0
+            for _, event in batch:
+                handler = self.handlers.get(event["type"])
+                if handler is not None and not await self._apply(session, handler, event):
+                    break
+                applied += 1
+            if not applied:
+                return False
+
+            await session.execute(
+                update(offsets)
+                .where(offsets.c.consumer == self.name)
+                .values(last_offset=batch[applied - 1][0], updated_at=datetime.utcnow())
+            )
+        for callback in self.on_commit:
+            callback()
+        return applied == len(batch) == self.batch_size
+
+    async def _apply(self, session: AsyncSession, handler: Handler, event: Event) -> bool:
+        """Run one handler; False when the event failed and should be retried on a later pass"""
+        try:
+            async with session.begin_nested():
+                await handler(session, event)
+        except Exception as exc:
+            attempts = self._attempts.pop(event["id"], 0) + 1
+            if attempts < self.max_attempts:
+                self._attempts[event["id"]] = attempts
+                logger.warning("%s: event %s failed (attempt %d of %d)",
+                               self.name, event["id"], attempts, self.max_attempts, exc_info=True)
+                return False
+            logger.error("%s: event %s failed %d times, moved to event_dead_letters",
+                         self.name, event["id"], attempts, exc_info=True)
+            await session.execute(insert(self.dead_letters).values(
+                consumer=self.name,
+                event_id=event["id"],
+                event_type=event["type"],
+                aggregate_id=event["aggregate_id"],
+                payload=event["payload"],
+                error=repr(exc)[:1000],
+                attempts=attempts,
+                failed_at=datetime.utcnow(),
+            ))
+            self.dead_lettered += 1
+            return True
+        self._attempts.pop(event["id"], None)
+        return True
+
+
+def worker_settings() -> dict:
+    return {
+        "batch_size": int(os.getenv("EVENT_BATCH_SIZE", "100")),
+        "poll_interval": float(os.getenv("EVENT_POLL_INTERVAL_MS", "500")) / 1000,
+    }
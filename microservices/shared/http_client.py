@@ -0,0 +1,19 @@
+"""One pooled ``httpx.AsyncClient`` per service for calls to other services"""
+import os
+import httpx
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """Keep-alive connection pool sized for the instance's concurrency.
+
+    Reusing connections avoids a TCP handshake per inter-service call; the pool
+    limit caps how many calls one instance has in flight to its dependencies.
+    """
+    max_connections = int(os.getenv("HTTP_MAX_CONNECTIONS", "200"))
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=int(os.getenv("HTTP_MAX_KEEPALIVE", str(max_connections))),
+        ),
+        timeout=httpx.Timeout(float(os.getenv("HTTP_TIMEOUT", "5")), connect=2.0),
+    )
@@ -0,0 +1,311 @@
+"""Minimal distributed tracing: W3C trace context propagation and Zipkin v2 JSON export.
+
+This file is the source of truth. microservices/shared/tracing.py is a vendored
+copy, because the service images are built from microservices/ alone;
+tests/test_tracing.py fails when the copy differs. After changing this file:
+
+    cp app/core/tracing.py microservices/shared/tracing.py
+"""
+import os
+import re
+import json
+import time
+import queue
+import random
+import logging
+import threading
+import urllib.request
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger("tracing")
+
+_TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+
+class Span:
+    __slots__ = (
+        "tracer", "name", "kind", "trace_id", "span_id", "parent_id",
+        "sampled", "timestamp", "duration", "tags", "_start"
+    )
+
+    def __init__(self, tracer, name: str, kind: str, trace_id: str, parent_id: Optional[str], sampled: bool):
+        self.tracer = tracer
+        self.name = name
+        self.kind = kind
+        self.trace_id = trace_id
+        self.span_id = "%016x" % random.getrandbits(64)
+        self.parent_id = parent_id
+        self.sampled = sampled
+        self.timestamp = time.time()
+        self.duration = 0.0
+        self.tags: Dict[str, str] = {}
+        self._start = time.perf_counter()
+
+    def set_tag(self, key: str, value) -> None:
+        self.tags[key] = str(value)
+
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+    def finish(self) -> None:
+        self.duration = time.perf_counter() - self._start
+        if self.sampled:
+            self.tracer.exporter.export(self)
+
+    def to_zipkin(self, service_name: str) -> dict:
+        span = {
+            "traceId": self.trace_id,
+            "id": self.span_id,
+            "name": self.name,
+            "timestamp": int(self.timestamp * 1_000_000),
+            "duration": max(int(self.duration * 1_000_000), 1),
+            "localEndpoint": {"serviceName": service_name},
+            "tags": self.tags,
+        }
+        if self.parent_id:
+            span["parentId"] = self.parent_id
+        if self.kind != "INTERNAL":
+            span["kind"] = self.kind
+        return span
+
+
+current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+class SpanExporter:
+    """Batches finished spans on a background thread and writes Zipkin v2 JSON.
+
+    Spans go to a JSON-lines file (one batch array per line) and/or are POSTed to a
+    Zipkin-compatible collector (Zipkin, Jaeger, OpenTelemetry Collector).
+    """
+
+    def __init__(self, max_queue_size: int = 10000, batch_size: int = 200, flush_interval: float = 1.0):
+        self.service_name = "unknown"
+        self.export_path: Optional[str] = None
+        self.collector_url: Optional[str] = None
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            self.dropped += 1
+            return
+        if self._thread is None:
+            self._start()
+
+    def _start(self) -> None:
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+                self._thread.start()
+
+    def after_fork(self) -> None:
+        """Drop spans and the thread inherited from the parent; the next export starts a new one"""
+        self._queue = queue.Queue(maxsize=self._queue.maxsize)
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    def flush(self) -> None:
+        """Block until every queued span has been written"""
+        self._queue.join()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get(timeout=max(deadline - time.monotonic(), 0)))
+                except queue.Empty:
+                    break
+            try:
+                self._write([span.to_zipkin(self.service_name) for span in batch])
+            except Exception:
+                logger.exception("Failed to export %d spans", len(batch))
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _write(self, spans: List[dict]) -> None:
+        payload = json.dumps(spans)
+        if self.export_path:
+            with open(self.export_path, "a") as export_file:
+                export_file.write(payload + "\n")
+        if self.collector_url:
+            request = urllib.request.Request(
+                self.collector_url,
+                data=payload.encode(),
+                headers={"Content-Type": "application/json"},
+                method="POST",
+            )
+            urllib.request.urlopen(request, timeout=5).close()
+
+
+class Tracer:
+    def __init__(self):
+        self.service_name = "unknown"
+        self.enabled = False
+        self.sample_rate = 1.0
+        self.exporter = SpanExporter()
+
+    def configure(
+        self,
+        service_name: str,
+        enabled: bool = True,
+        export_path: Optional[str] = None,
+        collector_url: Optional[str] = None,
+        sample_rate: float = 1.0,
+    ) -> "Tracer":
+        self.service_name = service_name
+        self.enabled = enabled and bool(export_path or collector_url)
+        self.sample_rate = sample_rate
+        self.exporter.service_name = service_name
+        self.exporter.export_path = export_path
+        self.exporter.collector_url = collector_url
+        if export_path:
+            os.makedirs(os.path.dirname(os.path.abspath(export_path)), exist_ok=True)
+        return self
+
+    def configure_from_env(self, service_name: str) -> "Tracer":
+        return self.configure(
+            service_name,
+            enabled=os.getenv("TRACING_ENABLED", "true").lower() == "true",
+            export_path=os.getenv("TRACE_EXPORT_PATH") or None,
+            collector_url=os.getenv("TRACE_COLLECTOR_URL") or None,
+            sample_rate=float(os.getenv("TRACE_SAMPLE_RATE", "1.0")),
+        )
+
+    @staticmethod
+    def extract(traceparent: Optional[str]) -> Optional[Tuple[str, str, bool]]:
+        """Parse a W3C ``traceparent`` header into (trace_id, parent_span_id, sampled)"""
+        if not traceparent:
+            return None
+        match = _TRACEPARENT.match(traceparent.strip().lower())
+        if match is None or match.group(1) == "0" * 32:
+            return None
+        return match.group(1), match.group(2), bool(int(match.group(3), 16) & 1)
+
+    def start_span(
+        self,
+        name: str,
+        kind: str = "INTERNAL",
+        parent: Optional[Span] = None,
+        remote_parent: Optional[Tuple[str, str, bool]] = None,
+    ) -> Span:
+        if parent is not None:
+            return Span(self, name, kind, parent.trace_id, parent.span_id, parent.sampled)
+        if remote_parent is not None:
+            trace_id, parent_id, sampled = remote_parent
+            return Span(self, name, kind, trace_id, parent_id, sampled)
+        return Span(self, name, kind, "%032x" % random.getrandbits(128), None, random.random() < self.sample_rate)
+
+    @contextmanager
+    def span(self, name: str, kind: str = "INTERNAL", tags: Optional[dict] = None) -> Iterator[Optional[Span]]:
+        """Child span of the current one; a no-op outside a traced request"""
+        parent = current_span.get()
+        if not self.enabled or parent is None:
+            yield None
+            return
+        span = self.start_span(name, kind, parent=parent)
+        if tags:
+            for key, value in tags.items():
+                span.set_tag(key, value)
+        token = current_span.set(span)
+        try:
+            yield span
+        except Exception as exc:
+            span.set_tag("error", repr(exc))
+            raise
+        finally:
+            current_span.reset(token)
+            span.finish()
+
+    def inject(self, headers: Optional[dict] = None) -> dict:
+        """Add ``traceparent`` for the current span to outgoing request headers"""
+        headers = dict(headers or {})
+        span = current_span.get()
+        if span is not None:
+            headers["traceparent"] = span.traceparent()
+        return headers
+
+    def instrument_engine(self, engine) -> None:
+        """Record a CLIENT span for every SQL statement issued inside a traced request"""
+        from sqlalchemy import event
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            parent = current_span.get()
+            if context is None or parent is None or not parent.sampled:
+                return
+            span = self.start_span("SQL " + statement.split(None, 1)[0].upper(), "CLIENT", parent=parent)
+            span.set_tag("db.statement", statement[:1000])
+            context._trace_span = span
+
+        def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            span = getattr(context, "_trace_span", None)
+            if span is not None:
+                span.finish()
+
+        def handle_error(exception_context):
+            span = getattr(exception_context.execution_context, "_trace_span", None)
+            if span is not None:
+                span.set_tag("error", repr(exception_context.original_exception))
+                span.finish()
+
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", after_cursor_execute)
+        event.listen(engine, "handle_error", handle_error)
+
+
+tracer = Tracer()
+
+
+class TracingMiddleware:
+    """Pure ASGI middleware opening a SERVER span per request, continuing an incoming ``traceparent``"""
+
+    def __init__(self, app, instance: Tracer = tracer):
+        self.app = app
+        self.tracer = instance
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.tracer.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        traceparent = None
+        for name, value in scope["headers"]:
+            if name == b"traceparent":
+                traceparent = value.decode("latin-1")
+                break
+        span = self.tracer.start_span(
+            f"{scope['method']} {scope['path']}", "SERVER", remote_parent=self.tracer.extract(traceparent)
+        )
+        span.set_tag("http.method", scope["method"])
+        span.set_tag("http.path", scope["path"])
+        token = current_span.set(span)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                span.set_tag("http.status_code", message["status"])
+                message["headers"] = list(message.get("headers", [])) + [(b"x-trace-id", span.trace_id.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as exc:
+            span.set_tag("error", repr(exc))
+            raise
+        finally:
+            # Name the span after the route template once the router has matched
+            route = scope.get("route")
+            if route is not None and getattr(route, "path", None):
+                span.name = f"{scope['method']} {route.path}"
+            current_span.reset(token)
+            span.finish()
@@ -0,0 +1,87 @@
+import os
+import uuid
+from contextlib import contextmanager
+
+# Tests run against an in-memory SQLite database unless TEST_DATABASE_URL points
+# at a scratch database. Set before the app is imported: the engine is created
+# at import time.
+os.environ["DATABASE_URL"] = os.getenv("TEST_DATABASE_URL", "sqlite://")
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+os.environ.setdefault("PROFILING_ENABLED", "true")
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from app.core.cache import entity_cache
+from app.core.database import Base, SessionLocal, engine, get_db
+from app.main import app
+
+
+@pytest.fixture
+def db_session():
+    """Session shared by the test and its requests; every table is emptied afterwards.
+
+    Routes get this session through a ``get_db`` override, so the test can look at
+    what a request wrote without opening another session.
+    """
+    session = SessionLocal()
+
+    def override_get_db():
+        yield session
+
+    app.dependency_overrides[get_db] = override_get_db
+    try:
+        yield session
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        session.close()
+        # Not a rolled-back outer transaction: pysqlite commits when the outermost
+        # savepoint is released, and the audit thread writes on its own session
+        with engine.begin() as connection:
+            for table in reversed(Base.metadata.sorted_tables):
+                connection.execute(table.delete())
+        entity_cache.clear()
+
+
+@pytest.fixture
+def client(db_session):
+    """TestClient whose requests share ``db_session``"""
+    return TestClient(app)
+
+
+@pytest.fixture
+def register_and_login(client):
+    """Registers a user with a unique email and logs in; returns ``(user_id, headers)``"""
+    def register_and_login(role: str) -> tuple:
+        email = f"{role}-{uuid.uuid4().hex[:12]}@example.com"
+        response = client.post("/auth/register", json={
+            "email": email,
+            "password": "TestPass123",
+            "role": role,
+            "first_name": role.title(),
+            "last_name": "Test"
+        })
+        assert response.status_code == 201
+        token = client.post("/auth/login", json={"email": email, "password": "TestPass123"}).json()["access_token"]
+        return response.json()["id"], {"Authorization": f"Bearer {token}"}
+
+    return register_and_login
+
+
+@pytest.fixture
+def count_queries():
+    """Context manager that collects the SQL statements run inside it"""
+    @contextmanager
+    def count_queries():
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+    return count_queries
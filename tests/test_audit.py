@@ -0,0 +1,33 @@
+from datetime import datetime, timedelta
+from app.core.audit import AuditSink, audit_sink
+
+
+def test_audit_event_records_authenticated_user(client, register_and_login):
+    doctor_id, _ = register_and_login("doctor")
+    patient_id, patient_headers = register_and_login("patient")
+    _, admin_headers = register_and_login("admin")
+
+    response = client.post("/appointments/", headers=patient_headers, json={
+        "doctor_id": doctor_id,
+        "appointment_time": (datetime.utcnow() + timedelta(days=1)).isoformat()
+    })
+    assert response.status_code == 201
+    audit_sink.flush()
+
+    response = client.get(f"/admin/audit-events?user_id={patient_id}", headers=admin_headers)
+    assert response.status_code == 200
+    events = response.json()
+    assert len(events) == 1
+    assert events[0]["path"] == "/appointments/"
+    assert events[0]["method"] == "POST"
+    assert events[0]["status_code"] == 201
+
+
+def test_audit_sink_drops_when_full():
+    sink = AuditSink(max_queue_size=2)
+    event = {"method": "POST", "path": "/appointments/"}
+    assert sink.record(event)
+    assert sink.record(event)
+    assert not sink.record(event)
+    assert sink.stats()["dropped"] == 1
+    assert sink.stats()["queued"] == 2
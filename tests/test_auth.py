@@ -1,25 +1,33 @@
-import pytest
-from fastapi.testclient import TestClient
-from app.main import app
+from app.models.user import User
 
-client = TestClient(app)
+REGISTRATION = {
+    "email": "test@example.com",
+    "password": "TestPass123",
+    "role": "patient",
+    "first_name": "Test",
+    "last_name": "User"
+}
 
 
-def test_register_user_success():
+def test_register_user_success(client, db_session):
     """Test successful user registration"""
-    response = client.post("/auth/register", json={
-        "email": "test@example.com",
-        "password": "TestPass123",
-        "role": "patient",
-        "first_name": "Test",
-        "last_name": "User"
-    })
-    # Note: This will fail if user already exists or DB not set up
-    # In real tests, use a test database
-    assert response.status_code in [201, 400]
+    response = client.post("/auth/register", json=REGISTRATION)
+    assert response.status_code == 201
+    assert db_session.query(User).filter(User.email == "test@example.com").count() == 1
+
+
+def test_register_duplicate_email(client):
+    """Test registration with an email that is already taken"""
+    assert client.post("/auth/register", json=REGISTRATION).status_code == 201
+    assert client.post("/auth/register", json=REGISTRATION).status_code == 400
 
 
-def test_register_weak_password():
+def test_previous_test_was_rolled_back(db_session):
+    """Each test starts from an empty database"""
+    assert db_session.query(User).filter(User.email == "test@example.com").count() == 0
+
+
+def test_register_weak_password(client):
     """Test registration with weak password"""
     response = client.post("/auth/register", json={
         "email": "weak@example.com",
@@ -31,7 +39,15 @@ def test_register_weak_password():
     assert response.status_code == 400
 
 
-def test_login_invalid_credentials():
+def test_login_returns_token(client):
+    """Test login with the credentials used to register"""
+    client.post("/auth/register", json=REGISTRATION)
+    response = client.post("/auth/login", json={"email": "test@example.com", "password": "TestPass123"})
+    assert response.status_code == 200
+    assert response.json()["access_token"]
+
+
+def test_login_invalid_credentials(client):
     """Test login with invalid credentials"""
     response = client.post("/auth/login", json={
         "email": "nonexistent@example.com",
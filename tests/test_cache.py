@@ -0,0 +1,78 @@
+import json
+import uuid
+from datetime import datetime
+from app.core.cache import LRUCacheBackend, create_cache_backend, entity_cache
+from app.core.config import settings
+from app.models.user import User
+from app.repositories.user_repository import UserRepository
+from app.utils.constants import UserRole
+
+
+def test_user_lookup_is_cached_and_invalidated_on_update(client, register_and_login):
+    _, headers = register_and_login("patient")
+    assert client.get("/users/profile", headers=headers).status_code == 200
+
+    hits = entity_cache.hits
+    assert client.get("/users/profile", headers=headers).status_code == 200
+    assert entity_cache.hits > hits
+
+    invalidations = entity_cache.invalidations
+    response = client.put("/users/profile", headers=headers, json={"first_name": "Renamed"})
+    assert response.status_code == 200
+    assert entity_cache.invalidations > invalidations
+    assert client.get("/users/profile", headers=headers).json()["first_name"] == "Renamed"
+
+
+def test_cache_stats_endpoint(client, register_and_login):
+    _, headers = register_and_login("admin")
+    response = client.get("/admin/cache/stats", headers=headers)
+    assert response.status_code == 200
+    assert {"hits", "misses", "hit_rate", "entries"} <= response.json().keys()
+
+
+def test_lru_backend_evicts_and_expires():
+    backend = LRUCacheBackend(max_entries=2, ttl=60)
+    backend.set("a", b"1")
+    backend.set("b", b"2")
+    backend.get("a")
+    backend.set("c", b"3")
+    assert backend.get("b") is None
+    assert backend.get("a") == b"1"
+
+    expired = LRUCacheBackend(max_entries=2, ttl=0)
+    expired.set("a", b"1")
+    assert expired.get("a") is None
+
+
+def test_cached_values_are_json_and_round_trip(client, register_and_login):
+    user_id, headers = register_and_login("patient")
+    assert client.get("/users/profile", headers=headers).status_code == 200
+    raw = entity_cache.backend.get(entity_cache.key(User, "id", uuid.UUID(user_id)))
+    assert json.loads(raw)["id"] == user_id
+
+    snapshot = entity_cache._decode(User, raw)
+    assert snapshot["id"] == uuid.UUID(user_id)
+    assert snapshot["role"] is UserRole.PATIENT
+    assert isinstance(snapshot["created_at"], datetime)
+
+
+def test_password_hash_is_never_cached(client, db_session, register_and_login):
+    user_id, headers = register_and_login("patient")
+    assert client.get("/users/profile", headers=headers).status_code == 200
+    key = entity_cache.key(User, "id", uuid.UUID(user_id))
+    assert "password_hash" not in json.loads(entity_cache.backend.get(key))
+
+    # A user rebuilt from the cache loads the hash from the database when asked
+    db_session.expunge_all()
+    hits = entity_cache.hits
+    user = UserRepository(db_session).get_by_id(uuid.UUID(user_id))
+    assert entity_cache.hits > hits
+    assert user.password_hash.startswith("$2")
+
+
+def test_memory_backend_is_disabled_with_several_workers(monkeypatch):
+    monkeypatch.setattr(settings, "CACHE_BACKEND", "memory")
+    monkeypatch.setattr(settings, "WEB_CONCURRENCY", 4)
+    assert create_cache_backend() is None
+    monkeypatch.setattr(settings, "WEB_CONCURRENCY", 1)
+    assert isinstance(create_cache_backend(), LRUCacheBackend)
@@ -0,0 +1,68 @@
+import gzip
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from app.core.compression import CompressionPolicy, parse_accept_encoding
+from app.middleware.compression_middleware import CompressionMiddleware
+
+policy = CompressionPolicy(minimum_size=500, gzip_level=6, brotli_quality=4, route_levels="")
+policy.set_level("GET /uncompressed", 0)
+
+demo = FastAPI()
+demo.add_middleware(CompressionMiddleware, policy=policy)
+ROWS = [{"name": "Amoxicillin", "dosage": "500mg", "duration": "7 days"}] * 50
+
+
+@demo.get("/large")
+def large():
+    return ROWS
+
+
+@demo.get("/small")
+def small():
+    return {"status": "ok"}
+
+
+@demo.get("/uncompressed")
+def uncompressed():
+    return ROWS
+
+
+@demo.get("/export")
+def export():
+    def rows():
+        for index in range(200):
+            yield f"{index},Amoxicillin,500mg,7 days\n".encode()
+    return StreamingResponse(rows(), media_type="text/csv")
+
+
+client = TestClient(demo)
+GZIP_ONLY = {"Accept-Encoding": "gzip"}
+
+
+def test_large_response_is_gzipped_and_small_is_not():
+    response = client.get("/large", headers=GZIP_ONLY)
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) < len(response.content)
+    assert response.json() == ROWS
+
+    assert "content-encoding" not in client.get("/small", headers=GZIP_ONLY).headers
+    assert "content-encoding" not in client.get("/large", headers={"Accept-Encoding": "identity"}).headers
+    assert "content-encoding" not in client.get("/uncompressed", headers=GZIP_ONLY).headers
+
+
+def test_streaming_response_is_compressed_incrementally():
+    with client.stream("GET", "/export", headers=GZIP_ONLY) as response:
+        raw = b"".join(response.iter_raw())
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    lines = gzip.decompress(raw).decode().splitlines()
+    assert len(lines) == 200
+    assert lines[-1] == "199,Amoxicillin,500mg,7 days"
+
+
+def test_accept_encoding_qvalues():
+    assert parse_accept_encoding("gzip;q=0.5, br, *;q=0") == {"gzip": 0.5, "br": 1.0, "*": 0.0}
+    assert policy.choose("gzip;q=0", "GET /large") is None
+    assert policy.choose("*", "GET /large") is not None
@@ -0,0 +1,53 @@
+from datetime import datetime, timedelta
+
+
+def book_appointments(client, register_and_login, headers: dict, count: int) -> None:
+    for offset in range(count):
+        doctor_id, _ = register_and_login("doctor")
+        response = client.post("/appointments/", headers=headers, json={
+            "doctor_id": doctor_id,
+            "appointment_time": (datetime.utcnow() + timedelta(days=offset + 1)).isoformat()
+        })
+        assert response.status_code == 201
+
+
+def test_appointments_without_expand_omit_relationships(client, register_and_login):
+    _, headers = register_and_login("patient")
+    book_appointments(client, register_and_login, headers, 1)
+
+    response = client.get("/appointments/", headers=headers)
+    assert response.status_code == 200
+    assert "doctor" not in response.json()[0]
+    assert "patient" not in response.json()[0]
+
+
+def test_appointments_expand_embeds_users(client, register_and_login):
+    patient_id, headers = register_and_login("patient")
+    book_appointments(client, register_and_login, headers, 2)
+
+    response = client.get("/appointments/?expand=doctor,patient", headers=headers)
+    assert response.status_code == 200
+    for appointment in response.json():
+        assert appointment["patient"]["id"] == patient_id
+        assert appointment["doctor"]["id"] == appointment["doctor_id"]
+        assert appointment["doctor"]["first_name"] == "Doctor"
+
+
+def test_appointments_expand_query_count_is_constant(client, register_and_login, count_queries):
+    _, small_headers = register_and_login("patient")
+    book_appointments(client, register_and_login, small_headers, 1)
+    _, large_headers = register_and_login("patient")
+    book_appointments(client, register_and_login, large_headers, 5)
+
+    with count_queries() as small:
+        assert len(client.get("/appointments/?expand=doctor,patient", headers=small_headers).json()) == 1
+    with count_queries() as large:
+        assert len(client.get("/appointments/?expand=doctor,patient", headers=large_headers).json()) == 5
+
+    assert len(large) == len(small)
+
+
+def test_expand_rejects_unknown_relationship(client, register_and_login):
+    _, headers = register_and_login("patient")
+    response = client.get("/appointments/?expand=password_hash", headers=headers)
+    assert response.status_code == 400
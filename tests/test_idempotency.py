@@ -0,0 +1,76 @@
+import uuid
+import pytest
+from datetime import datetime, timedelta
+from app.core.database import SessionLocal
+from fastapi import HTTPException
+from app.core.idempotency import IdempotencyPurger
+from app.models.appointment import Appointment
+from app.models.idempotency_key import IdempotencyKey
+from app.schemas.appointment_schema import AppointmentCreate, AppointmentResponse
+from app.services.appointment_service import AppointmentService
+from app.services.idempotency_service import IdempotencyService
+
+
+def test_retry_with_same_key_returns_first_booking(client, register_and_login):
+    doctor_id, _ = register_and_login("doctor")
+    _, headers = register_and_login("patient")
+    body = {"doctor_id": doctor_id, "appointment_time": (datetime.utcnow() + timedelta(days=1)).isoformat()}
+    headers = {**headers, "Idempotency-Key": str(uuid.uuid4())}
+
+    first = client.post("/appointments/", headers=headers, json=body)
+    retry = client.post("/appointments/", headers=headers, json=body)
+    assert first.status_code == retry.status_code == 201
+    assert retry.headers["idempotent-replayed"] == "true"
+    assert retry.json() == first.json()
+    assert len(client.get("/appointments/", headers=headers).json()) == 1
+
+    body["notes"] = "changed"
+    assert client.post("/appointments/", headers=headers, json=body).status_code == 422
+
+
+def test_failed_request_does_not_keep_its_key(client, register_and_login):
+    _, headers = register_and_login("doctor")
+    headers = {**headers, "Idempotency-Key": str(uuid.uuid4())}
+    body = {"appointment_id": str(uuid.uuid4()), "medicines": [{"name": "A", "dosage": "1mg", "duration": "1 day"}]}
+
+    assert client.post("/prescriptions/", headers=headers, json=body).status_code == 404
+    retry = client.post("/prescriptions/", headers=headers, json=body)
+    assert retry.status_code == 404
+    assert "idempotent-replayed" not in retry.headers
+
+
+
+def test_key_stays_claimed_when_create_committed_before_failing(client, db_session, register_and_login):
+    doctor_id, _ = register_and_login("doctor")
+    patient_id, _ = register_and_login("patient")
+    patient_id = uuid.UUID(patient_id)
+    body = AppointmentCreate(doctor_id=doctor_id, appointment_time=datetime.utcnow() + timedelta(days=1))
+    service = IdempotencyService(db_session, wait_seconds=0)
+
+    def book():
+        return AppointmentService(db_session).create_appointment(patient_id, body)
+
+    def book_then_fail():
+        book()
+        raise RuntimeError("response could not be stored")
+
+    with pytest.raises(RuntimeError):
+        service.run("key", patient_id, "POST /appointments/", body, AppointmentResponse, 201, book_then_fail)
+    with pytest.raises(HTTPException) as retry:
+        service.run("key", patient_id, "POST /appointments/", body, AppointmentResponse, 201, book)
+    assert retry.value.status_code == 409
+    assert db_session.query(Appointment).count() == 1
+
+def test_purger_deletes_expired_keys_in_batches(db_session):
+    now = datetime.utcnow()
+    user_id = uuid.uuid4()
+    for index, expires_at in enumerate([now - timedelta(hours=1)] * 5 + [now + timedelta(hours=1)]):
+        db_session.add(IdempotencyKey(
+            user_id=user_id, key=f"key-{index}", request_hash="x", created_at=now, expires_at=expires_at
+        ))
+    db_session.commit()
+
+    purger = IdempotencyPurger(interval=60, batch_size=2, session_factory=SessionLocal)
+    assert purger.purge(now) == 5
+    remaining = db_session.query(IdempotencyKey).all()
+    assert [record.key for record in remaining] == ["key-5"]
@@ -0,0 +1,31 @@
+import time
+import uuid
+from app.core.security import create_access_token
+from app.models.user import User
+from app.utils.constants import UserRole
+from app.utils.ids import uuid7
+
+
+def test_uuid7_is_version_7_and_time_ordered():
+    before = time.time_ns() // 1_000_000
+    ids = [uuid7() for _ in range(10000)]
+    assert all(value.version == 7 and value.variant == uuid.RFC_4122 for value in ids)
+    assert ids == sorted(ids)
+    assert len(set(ids)) == len(ids)
+    # Stored as hex on SQLite: the text order matches too
+    assert [value.hex for value in ids] == sorted(value.hex for value in ids)
+    assert ids[0].int >> 80 >= before
+
+
+def test_rows_with_uuid4_ids_still_work(client, db_session):
+    legacy_id = uuid.uuid4()
+    db_session.add(User(
+        id=legacy_id, email="legacy@example.com", password_hash="x", role=UserRole.PATIENT,
+        first_name="Legacy", last_name="User"
+    ))
+    db_session.commit()
+    token = create_access_token({"sub": str(legacy_id), "role": "patient"})
+
+    response = client.get("/users/profile", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200
+    assert response.json()["id"] == str(legacy_id)
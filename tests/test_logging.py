@@ -0,0 +1,47 @@
+import json
+import logging
+import queue
+import sys
+from app.core.logging_config import JsonFormatter, NonBlockingQueueHandler, SamplingFilter, parse_sample_rates
+
+
+def make_record(level: int = logging.INFO) -> logging.LogRecord:
+    return logging.LogRecord("app.test", level, __file__, 1, "Request: %s %s", ("GET", "/health"), None)
+
+
+def test_json_formatter_renders_message_and_extras():
+    record = make_record()
+    record.user_id = "abc"
+    payload = json.loads(JsonFormatter().format(record))
+    assert payload["message"] == "Request: GET /health"
+    assert payload["level"] == "INFO"
+    assert payload["logger"] == "app.test"
+    assert payload["user_id"] == "abc"
+
+
+def test_sampling_filter_keeps_warnings():
+    sampler = SamplingFilter(0.0)
+    assert not sampler.filter(make_record(logging.INFO))
+    assert sampler.filter(make_record(logging.WARNING))
+
+
+def test_parse_sample_rates():
+    assert parse_sample_rates("app.middleware.logging_middleware=0.1, httpx=2") == {
+        "app.middleware.logging_middleware": 0.1,
+        "httpx": 1.0,
+    }
+
+
+def test_queued_record_keeps_values_from_logging_time():
+    handler = NonBlockingQueueHandler(queue.Queue())
+    state = {"status": "booked"}
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        record = logging.LogRecord("app.test", logging.ERROR, __file__, 1, "Appointment %s", (state,), sys.exc_info())
+    handler.handle(record)
+    state["status"] = "cancelled"
+
+    payload = json.loads(JsonFormatter().format(handler.queue.get_nowait()))
+    assert payload["message"] == "Appointment {'status': 'booked'}"
+    assert "ValueError: boom" in payload["exc_info"]
@@ -0,0 +1,31 @@
+import re
+from app.core.metrics import Histogram
+
+
+def metric_value(text: str, name: str, labels: str) -> float:
+    match = re.search(rf"^{re.escape(name)}\{{{re.escape(labels)}\}} (\S+)$", text, re.MULTILINE)
+    assert match, f"{name}{{{labels}}} not found"
+    return float(match.group(1))
+
+
+def test_metrics_records_route_latency_and_db_queries(client):
+    assert client.get("/health").status_code == 200
+    assert client.get("/doctors/").status_code == 200
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    text = response.text
+
+    assert metric_value(text, "http_request_duration_seconds_count", 'method="GET",route="/health",status="200"') >= 1
+    assert metric_value(text, "db_queries_per_request_sum", 'method="GET",route="/health",status="200"') == 0
+    assert metric_value(text, "db_queries_per_request_sum", 'method="GET",route="/doctors/",status="200"') >= 1
+    assert 'http_requests_in_flight{method="GET"} 0' in text
+
+
+def test_histogram_buckets_are_upper_bounds():
+    histogram = Histogram((0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value)
+    assert histogram.counts == [2, 1, 1]
+    assert histogram.count == 4
@@ -0,0 +1,17 @@
+from app.main import app
+from app.middleware.audit_middleware import AuditMiddleware
+
+
+def test_process_time_header(client):
+    response = client.get("/health")
+    assert response.status_code == 200
+    assert float(response.headers["X-Process-Time"]) >= 0
+
+
+def test_audit_path_matching():
+    middleware = AuditMiddleware(app)
+    assert middleware.sensitive_path_pattern.match("/appointments/")
+    assert middleware.sensitive_path_pattern.match("/admin/analytics")
+    assert middleware.sensitive_path_pattern.match("/users/profile")
+    assert not middleware.sensitive_path_pattern.match("/auth/login")
+    assert not middleware.sensitive_path_pattern.match("/appointmentsx")
@@ -0,0 +1,52 @@
+from datetime import datetime
+from pathlib import Path
+from uuid import uuid4
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.database import Base
+from app.models.user import User
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def alembic_config(monkeypatch, url: str) -> Config:
+    # No ini file: alembic.ini would reconfigure the app's logging
+    config = Config()
+    config.set_main_option("script_location", str(ROOT / "alembic"))
+    monkeypatch.setattr(settings, "DATABASE_URL", url)
+    return config
+
+
+def test_upgrade_adds_version_to_existing_rows(tmp_path, monkeypatch):
+    url = f"sqlite:///{tmp_path / 'migrate.db'}"
+    config = alembic_config(monkeypatch, url)
+    command.upgrade(config, "0001")
+    engine = create_engine(url)
+    with engine.begin() as connection:
+        connection.execute(text(
+            "INSERT INTO users (id, created_at, email, password_hash, role) "
+            "VALUES (:id, :created_at, 'before@example.com', 'x', 'PATIENT')"
+        ), {"id": uuid4().hex, "created_at": datetime.utcnow()})
+
+    command.upgrade(config, "head")
+    with Session(engine) as db:
+        user = db.query(User).one()
+        assert user.version == 1
+        user.first_name = "After"
+        db.commit()
+        assert user.version == 2
+    engine.dispose()
+
+
+def test_migrations_match_the_models(tmp_path, monkeypatch):
+    url = f"sqlite:///{tmp_path / 'migrate.db'}"
+    command.upgrade(alembic_config(monkeypatch, url), "head")
+    engine = create_engine(url)
+    with engine.connect() as connection:
+        assert compare_metadata(MigrationContext.configure(connection), Base.metadata) == []
+    engine.dispose()
@@ -0,0 +1,49 @@
+import uuid
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy.orm.exc import StaleDataError
+from app.core.database import SessionLocal
+from app.models.appointment import Appointment
+
+
+def book_appointment(client, register_and_login) -> tuple:
+    doctor_id, _ = register_and_login("doctor")
+    _, headers = register_and_login("patient")
+    response = client.post("/appointments/", headers=headers, json={
+        "doctor_id": doctor_id,
+        "appointment_time": (datetime.utcnow() + timedelta(days=1)).isoformat()
+    })
+    return response.json(), headers
+
+
+def test_put_with_stale_if_match_returns_409(client, register_and_login):
+    appointment, headers = book_appointment(client, register_and_login)
+    url = f"/appointments/{appointment['id']}"
+    assert client.get(url, headers=headers).headers["etag"] == '"1"'
+
+    response = client.put(url, headers={**headers, "If-Match": '"1"'}, json={"notes": "first"})
+    assert response.status_code == 200
+    assert response.json()["version"] == 2
+    assert response.headers["etag"] == '"2"'
+
+    response = client.put(url, headers={**headers, "If-Match": '"1"'}, json={"notes": "second"})
+    assert response.status_code == 409
+    assert client.put(url, headers=headers, json={"notes": "second", "version": 1}).status_code == 409
+    assert client.get(url, headers=headers).json()["notes"] == "first"
+
+
+def test_concurrent_writers_conflict_instead_of_overwriting(client, register_and_login):
+    appointment, _ = book_appointment(client, register_and_login)
+    first, second = SessionLocal(), SessionLocal()
+    try:
+        mine = first.get(Appointment, uuid.UUID(appointment["id"]))
+        theirs = second.get(Appointment, uuid.UUID(appointment["id"]))
+        mine.notes = "mine"
+        first.commit()
+
+        theirs.notes = "theirs"
+        with pytest.raises(StaleDataError):
+            second.commit()
+    finally:
+        first.close()
+        second.close()
@@ -0,0 +1,18 @@
+from datetime import datetime, timedelta
+
+MEDICINES = [{"name": "Amoxicillin", "dosage": "500mg", "duration": "7 days"}]
+
+
+def test_cannot_prescribe_for_cancelled_appointment(client, register_and_login):
+    doctor_id, doctor_headers = register_and_login("doctor")
+    _, patient_headers = register_and_login("patient")
+    appointment = client.post("/appointments/", headers=patient_headers, json={
+        "doctor_id": doctor_id,
+        "appointment_time": (datetime.utcnow() + timedelta(days=1)).isoformat()
+    }).json()
+    assert client.delete(f"/appointments/{appointment['id']}", headers=patient_headers).status_code == 200
+
+    response = client.post("/prescriptions/", headers=doctor_headers, json={
+        "appointment_id": appointment["id"], "medicines": MEDICINES
+    })
+    assert response.status_code == 400
@@ -0,0 +1,63 @@
+import threading
+import time
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.core.profiling import ProfileStore
+from app.middleware.profiling_middleware import ProfilingMiddleware
+
+
+def test_admin_can_profile_a_request(client, register_and_login):
+    _, headers = register_and_login("admin")
+    response = client.get("/doctors/", headers={**headers, "X-Profile": "1"})
+    assert response.status_code == 200
+    profile_id = response.headers["X-Profile-Id"]
+
+    response = client.get(f"/admin/profiles/{profile_id}", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["path"] == "/doctors/"
+    assert response.json()["trigger"] == "requested"
+    assert any(p["id"] == profile_id for p in client.get("/admin/profiles", headers=headers).json())
+
+
+def test_profile_flag_ignored_for_non_admin(client, register_and_login):
+    _, headers = register_and_login("patient")
+    response = client.get("/doctors/?profile=1", headers=headers)
+    assert response.status_code == 200
+    assert "X-Profile-Id" not in response.headers
+
+
+def test_profile_flag_must_be_the_exact_parameter(client, register_and_login):
+    _, headers = register_and_login("admin")
+    for query in ("xprofile=1", "foo=profile=1", "profile=10"):
+        response = client.get(f"/doctors/?{query}", headers=headers)
+        assert "X-Profile-Id" not in response.headers
+    assert "X-Profile-Id" in client.get("/doctors/?limit=5&profile=1", headers=headers).headers
+
+
+def test_profile_excludes_other_threads():
+    def profiled_work():
+        deadline = time.perf_counter() + 0.2
+        while time.perf_counter() < deadline:
+            pass
+        return {"ok": True}
+
+    def unrelated_work(stop):
+        while not stop.is_set():
+            pass
+
+    probe = FastAPI()
+    probe.add_api_route("/work", profiled_work)
+    store = ProfileStore()
+    stop = threading.Event()
+    busy = threading.Thread(target=unrelated_work, args=(stop,), daemon=True)
+    busy.start()
+    try:
+        profiled = TestClient(ProfilingMiddleware(probe, store=store, sample_every_n=1, interval_ms=2))
+        assert profiled.get("/work").status_code == 200
+    finally:
+        stop.set()
+        busy.join()
+
+    folded = "\n".join(store.list()[0]["folded"])
+    assert "profiled_work" in folded
+    assert "unrelated_work" not in folded
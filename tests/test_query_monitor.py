@@ -0,0 +1,28 @@
+import pytest
+from app.core.query_monitor import QueryBudgetExceeded, QueryMonitor, RequestQueryLog, normalize_sql, query_monitor
+
+
+def test_normalize_sql_strips_literals_and_parameters():
+    assert normalize_sql(
+        "SELECT users.id FROM users WHERE users.id = %(id_1)s AND role = 'doctor' LIMIT 10"
+    ) == "SELECT users.id FROM users WHERE users.id = ? AND role = ? LIMIT ?"
+    assert normalize_sql("SELECT * FROM users WHERE id IN (?, ?,\n ?)") == "SELECT * FROM users WHERE id IN (?)"
+
+
+def test_repeated_statement_is_flagged():
+    monitor = QueryMonitor(repeat_threshold=3)
+    request_log = RequestQueryLog({"method": "GET", "path": "/appointments/"})
+    for user_id in range(5):
+        request_log.add(f"SELECT * FROM users WHERE users.id = {user_id}")
+
+    problems = monitor.finish_request(request_log)
+    assert len(problems) == 1
+    assert "N+1" in problems[0] and "5 times" in problems[0]
+
+
+def test_strict_mode_fails_request_over_budget(client, monkeypatch):
+    monkeypatch.setattr(query_monitor, "strict", True)
+    monkeypatch.setitem(query_monitor.budgets, "GET /doctors/", 0)
+
+    with pytest.raises(QueryBudgetExceeded):
+        client.get("/doctors/")
@@ -0,0 +1,79 @@
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import text
+from app.core.database import engine
+from app.core.reminders import ReminderScheduler
+from app.models.user import User
+from app.schemas.appointment_schema import AppointmentCreate, AppointmentUpdate
+from app.services.appointment_service import AppointmentService
+from app.utils.constants import UserRole
+
+LEAD = timedelta(hours=24)
+
+
+class CollectingSink:
+    def __init__(self):
+        self.sent = []
+
+    def send(self, reminders):
+        self.sent.extend(reminders)
+
+
+def make_scheduler():
+    sink = CollectingSink()
+    return ReminderScheduler(sink=sink, lead=LEAD, scan_interval=30, horizon=300, catchup=3600), sink
+
+
+def book(db_session, appointment_time):
+    patient = User(email=f"p{appointment_time.timestamp()}@example.com", password_hash="x", role=UserRole.PATIENT)
+    doctor = User(email=f"d{appointment_time.timestamp()}@example.com", password_hash="x", role=UserRole.DOCTOR)
+    db_session.add_all([patient, doctor])
+    db_session.commit()
+    return AppointmentService(db_session).create_appointment(
+        patient.id, AppointmentCreate(doctor_id=doctor.id, appointment_time=appointment_time)
+    )
+
+
+def test_reminder_is_sent_once_at_lead_time(db_session):
+    now = datetime.utcnow().replace(microsecond=0)
+    appointment = book(db_session, now + LEAD + timedelta(seconds=60))
+    scheduler, sink = make_scheduler()
+
+    scheduler.run_pending(now)
+    assert sink.sent == [] and scheduler.stats()["pending"] == 1
+    scheduler.run_pending(now + timedelta(seconds=61))
+    assert [reminder.appointment_id for reminder in sink.sent] == [appointment.id]
+
+    # A second instance finds the same appointment but does not send it again
+    other, other_sink = make_scheduler()
+    other.run_pending(now + timedelta(seconds=62))
+    assert other_sink.sent == [] and other.dropped == 1
+
+
+def test_cancelled_and_rescheduled_appointments(db_session):
+    now = datetime.utcnow().replace(microsecond=0)
+    cancelled = book(db_session, now + LEAD + timedelta(seconds=60))
+    moved = book(db_session, now + LEAD + timedelta(seconds=90))
+    scheduler, sink = make_scheduler()
+    scheduler.run_pending(now)
+
+    service = AppointmentService(db_session)
+    service.cancel_appointment(cancelled.id, cancelled.patient_id)
+    # Moved earlier, into the part of the timeline the scheduler has already scanned
+    new_time = now + LEAD + timedelta(seconds=45)
+    service.update_appointment(moved.id, moved.patient_id, AppointmentUpdate(appointment_time=new_time))
+
+    scheduler.run_pending(now + timedelta(seconds=31))
+    scheduler.run_pending(now + timedelta(seconds=120))
+    assert [(reminder.appointment_id, reminder.appointment_time) for reminder in sink.sent] == [(moved.id, new_time)]
+
+
+def test_window_scan_uses_status_time_index(db_session):
+    if engine.dialect.name != "sqlite":
+        pytest.skip("checks SQLite's query plan")
+    with engine.connect() as connection:
+        plan = connection.execute(text(
+            "EXPLAIN QUERY PLAN SELECT id, appointment_time FROM appointments "
+            "WHERE status = 'BOOKED' AND appointment_time >= '2030-01-01' AND appointment_time < '2030-01-02'"
+        )).all()
+    assert "ix_appointments_status_appointment_time" in " ".join(str(row) for row in plan)
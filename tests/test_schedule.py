@@ -0,0 +1,86 @@
+from datetime import datetime, time, timedelta
+from app.models.appointment import Appointment
+from app.models.user import User
+from app.utils.constants import AppointmentStatus
+
+START = datetime.utcnow().date() + timedelta(days=1)
+
+
+def login_doctor(client):
+    client.post("/auth/register", json={
+        "email": "schedule-doctor@example.com",
+        "password": "TestPass123",
+        "role": "doctor",
+        "first_name": "Sched",
+        "last_name": "Doctor"
+    })
+    token = client.post("/auth/login", json={
+        "email": "schedule-doctor@example.com", "password": "TestPass123"
+    }).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def add_appointments(db_session, *slots):
+    """slots: (day offset from START, hour, status)"""
+    doctor = db_session.query(User).filter(User.email == "schedule-doctor@example.com").one()
+    patient = User(email="schedule-patient@example.com", password_hash="x", role="patient",
+                   first_name="Pat", last_name="Ient")
+    db_session.add(patient)
+    db_session.flush()
+    for offset, hour, status in slots:
+        db_session.add(Appointment(
+            patient_id=patient.id,
+            doctor_id=doctor.id,
+            appointment_time=datetime.combine(START + timedelta(days=offset), time(hour)),
+            status=status
+        ))
+    db_session.commit()
+
+
+def schedule_url(days=3, status=None):
+    url = f"/doctors/me/schedule?from={START}&to={START + timedelta(days=days - 1)}"
+    return f"{url}&status={status}" if status else url
+
+
+def test_schedule_buckets_appointments_by_day(client, db_session):
+    headers = login_doctor(client)
+    add_appointments(
+        db_session,
+        (0, 9, AppointmentStatus.BOOKED),
+        (0, 11, AppointmentStatus.CANCELLED),
+        (2, 10, AppointmentStatus.COMPLETED),
+        (5, 10, AppointmentStatus.BOOKED),
+    )
+
+    response = client.get(schedule_url(), headers=headers)
+    assert response.status_code == 200
+    days = response.json()["days"]
+    assert [day["day"] for day in days] == [str(START + timedelta(days=offset)) for offset in range(3)]
+    assert (days[0]["total"], days[0]["booked"], days[0]["cancelled"]) == (2, 1, 1)
+    assert days[0]["appointments"][0]["patient_last_name"] == "Ient"
+    assert days[1] == {"day": str(START + timedelta(days=1)), "total": 0, "booked": 0,
+                       "completed": 0, "cancelled": 0, "appointments": []}
+    assert days[2]["completed"] == 1
+
+    booked = client.get(schedule_url(status="booked"), headers=headers).json()["days"]
+    assert [len(day["appointments"]) for day in booked] == [1, 0, 0]
+
+
+def test_schedule_is_one_query_and_supports_etags(client, db_session, count_queries):
+    headers = login_doctor(client)
+    add_appointments(db_session, *[(offset, hour, AppointmentStatus.BOOKED) for offset in range(3) for hour in (9, 10)])
+
+    with count_queries() as statements:
+        response = client.get(schedule_url(), headers=headers)
+    # Besides the current user lookup, a single statement reads appointments
+    assert len([statement for statement in statements if "appointments" in statement]) == 1
+
+    cached = client.get(schedule_url(), headers={**headers, "If-None-Match": response.headers["ETag"]})
+    assert cached.status_code == 304
+    assert cached.content == b""
+
+
+def test_schedule_rejects_invalid_ranges(client):
+    headers = login_doctor(client)
+    assert client.get(schedule_url(days=0), headers=headers).status_code == 400
+    assert client.get(schedule_url(days=43), headers=headers).status_code == 400
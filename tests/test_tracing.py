@@ -0,0 +1,59 @@
+import json
+from pathlib import Path
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.core.tracing import Tracer, TracingMiddleware
+
+
+def traced_app(tmp_path):
+    instance = Tracer().configure("test-service", export_path=str(tmp_path / "spans.jsonl"))
+    app = FastAPI()
+    app.add_middleware(TracingMiddleware, instance=instance)
+
+    @app.get("/items/{item_id}")
+    def get_item(item_id: int):
+        with instance.span("lookup", tags={"item_id": item_id}):
+            return {"traceparent": instance.inject()["traceparent"]}
+
+    return instance, TestClient(app)
+
+
+def read_spans(instance, tmp_path):
+    instance.exporter.flush()
+    with open(tmp_path / "spans.jsonl") as span_file:
+        return [span for line in span_file for span in json.loads(line)]
+
+
+def test_incoming_traceparent_is_continued(tmp_path):
+    instance, client = traced_app(tmp_path)
+    trace_id = "4bf92f3577b34da6a3ce929d0e0e4736"
+    response = client.get("/items/7", headers={"traceparent": f"00-{trace_id}-00f067aa0ba902b7-01"})
+    assert response.headers["x-trace-id"] == trace_id
+    assert response.json()["traceparent"].startswith(f"00-{trace_id}-")
+
+    spans = {span["name"]: span for span in read_spans(instance, tmp_path)}
+    server = spans["GET /items/{item_id}"]
+    assert server["kind"] == "SERVER"
+    assert server["parentId"] == "00f067aa0ba902b7"
+    assert spans["lookup"]["parentId"] == server["id"]
+    assert spans["lookup"]["tags"]["item_id"] == "7"
+
+
+def test_unsampled_and_invalid_traceparent(tmp_path):
+    instance, client = traced_app(tmp_path)
+    assert Tracer.extract("garbage") is None
+    assert Tracer.extract("00-" + "0" * 32 + "-00f067aa0ba902b7-01") is None
+
+    response = client.get("/items/1", headers={"traceparent": "not-a-traceparent"})
+    assert len(response.headers["x-trace-id"]) == 32
+
+    client.get("/items/2", headers={"traceparent": "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-00"})
+    trace_ids = {span["traceId"] for span in read_spans(instance, tmp_path)}
+    assert trace_ids == {response.headers["x-trace-id"]}
+
+
+def test_microservices_copy_matches():
+    root = Path(__file__).resolve().parent.parent
+    source = (root / "app" / "core" / "tracing.py").read_bytes()
+    vendored = (root / "microservices" / "shared" / "tracing.py").read_bytes()
+    assert vendored == source, "run: cp app/core/tracing.py microservices/shared/tracing.py"
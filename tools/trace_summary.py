@@ -0,0 +1,124 @@
+"""Summarize exported traces and show the critical path of each request.
+
+Reads the Zipkin v2 JSON-lines files written by ``TRACE_EXPORT_PATH`` (one file
+per service, or a directory of them), stitches spans from every service into
+traces and prints the span tree with the critical path marked, plus how much of
+the critical path each service and operation accounts for.
+
+    python tools/trace_summary.py traces/ --slowest 3
+    python tools/trace_summary.py traces/ --trace-id 4bf92f3577b34da6a3ce929d0e0e4736
+"""
+import argparse
+import json
+import os
+import sys
+from collections import defaultdict
+
+
+def load_spans(paths):
+    spans = []
+    for path in paths:
+        files = [os.path.join(path, name) for name in sorted(os.listdir(path))] if os.path.isdir(path) else [path]
+        for file_path in files:
+            with open(file_path) as handle:
+                for line in handle:
+                    if line.strip():
+                        spans.extend(json.loads(line))
+    return spans
+
+
+def end_of(span):
+    return span["timestamp"] + span["duration"]
+
+
+def critical_path(span, children):
+    """Walk back from the end of ``span``: the child finishing last blocks it, and so on.
+
+    Returns (span, self_time_us) pairs; self time is the part of the span's duration
+    not covered by a child on the critical path.
+    """
+    path = []
+    cursor = end_of(span)
+    blocking = []
+    for child in sorted(children.get(span["id"], []), key=end_of, reverse=True):
+        if end_of(child) <= cursor:
+            blocking.append(child)
+            cursor = child["timestamp"]
+    covered = sum(min(end_of(child), end_of(span)) - child["timestamp"] for child in blocking)
+    path.append((span, max(span["duration"] - covered, 0)))
+    for child in reversed(blocking):
+        path.extend(critical_path(child, children))
+    return path
+
+
+def print_tree(span, children, on_path, depth=0):
+    marker = "*" if span["id"] in on_path else " "
+    service = span.get("localEndpoint", {}).get("serviceName", "?")
+    print(f"  {marker} {span['duration'] / 1000:>9.2f} ms  {'  ' * depth}{service}: {span['name']}")
+    for child in sorted(children.get(span["id"], []), key=lambda item: item["timestamp"]):
+        print_tree(child, children, on_path, depth + 1)
+
+
+def summarize_trace(trace_id, spans):
+    by_id = {span["id"]: span for span in spans}
+    children = defaultdict(list)
+    roots = []
+    for span in spans:
+        parent_id = span.get("parentId")
+        if parent_id in by_id:
+            children[parent_id].append(span)
+        else:
+            roots.append(span)
+    root = max(roots, key=lambda span: span["duration"])
+    path = critical_path(root, children)
+    services = {span.get("localEndpoint", {}).get("serviceName", "?") for span in spans}
+
+    print(f"Trace {trace_id}: {root['duration'] / 1000:.2f} ms, {len(spans)} spans, services: {', '.join(sorted(services))}")
+    print_tree(root, children, {span["id"] for span, _ in path})
+
+    by_service = defaultdict(int)
+    by_operation = defaultdict(int)
+    for span, self_time in path:
+        service = span.get("localEndpoint", {}).get("serviceName", "?")
+        by_service[service] += self_time
+        by_operation[f"{service}: {span['name']}"] += self_time
+    print("  critical path by service:")
+    for service, self_time in sorted(by_service.items(), key=lambda item: -item[1]):
+        print(f"    {self_time / 1000:>9.2f} ms  {100 * self_time / root['duration']:5.1f}%  {service}")
+    print("  critical path by operation:")
+    for operation, self_time in sorted(by_operation.items(), key=lambda item: -item[1])[:10]:
+        print(f"    {self_time / 1000:>9.2f} ms  {100 * self_time / root['duration']:5.1f}%  {operation}")
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("paths", nargs="+", help="Span files or directories of span files")
+    parser.add_argument("--trace-id", help="Only show this trace")
+    parser.add_argument("--slowest", type=int, default=5, help="Show the N slowest traces")
+    args = parser.parse_args()
+
+    traces = defaultdict(list)
+    for span in load_spans(args.paths):
+        traces[span["traceId"]].append(span)
+    if not traces:
+        print("No spans found", file=sys.stderr)
+        return 1
+
+    if args.trace_id:
+        if args.trace_id not in traces:
+            print(f"Trace {args.trace_id} not found", file=sys.stderr)
+            return 1
+        selected = [args.trace_id]
+    else:
+        def trace_duration(trace_id):
+            return max(span["duration"] for span in traces[trace_id])
+        selected = sorted(traces, key=trace_duration, reverse=True)[:args.slowest]
+
+    for trace_id in selected:
+        summarize_trace(trace_id, traces[trace_id])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())